@@ -0,0 +1,133 @@
+"""Sound effects, loaded and played on a background thread.
+
+`SoundPool` owns one worker thread. `load_async` queues loading every
+effect in EFFECTS, each as a few preloaded voices: separate Sound
+instances of the same file. `play` only queues a request, so the UI thread
+never waits on the audio backend. The worker plays the voice whose last
+start is oldest, so rapid plays overlap instead of restarting one
+another; when all voices are busy, the oldest one is cut off and reused.
+
+Kivy's audio providers are imported by the worker, not at startup.
+"""
+import logging
+import os
+import threading
+from queue import Queue
+
+import tracing
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+# Effect name -> candidate files, first existing one wins
+EFFECTS = {
+    "card_flip": ['sounds/card_flip.wav', 'sounds/flip.wav', 'card_flip.wav'],
+}
+DEFAULT_VOICES = 3
+
+
+class SoundEffect:
+    """Preloaded voices of one effect, played round-robin"""
+    def __init__(self, name, path, voices):
+        self.name = name
+        self.path = path
+        self.voices = voices
+        self._next = 0
+
+    def play(self, volume=1.0):
+        voice = self.voices[self._next]
+        self._next = (self._next + 1) % len(self.voices)
+        if voice.state == 'play':
+            # Every voice is busy: cut off the one that started first
+            voice.stop()
+        voice.volume = volume
+        voice.play()
+
+    def unload(self):
+        for voice in self.voices:
+            voice.unload()
+
+
+class SoundPool:
+    """Loads EFFECTS in the background and plays them without blocking the caller"""
+    def __init__(self, effects=EFFECTS, voices=DEFAULT_VOICES):
+        self.effects = effects
+        self.voice_count = voices
+        self.loaded = {}
+        self._queue = Queue()
+        self._thread = None
+        self._load_queued = False
+
+    def _submit(self, job, *args):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="SoundPool", daemon=True)
+            self._thread.start()
+        self._queue.put((job, args))
+
+    def load_async(self):
+        """Queue loading every effect; plays queued meanwhile wait for it"""
+        if not self._load_queued:
+            self._load_queued = True
+            for name in self.effects:
+                self._submit(self._load, name)
+
+    def play(self, name, volume=1.0):
+        """Queue a play; effects that are missing or not loaded yet are skipped"""
+        if self._load_queued:
+            self._submit(self._play, name, volume)
+
+    def stop(self):
+        """Unload everything and end the worker"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._load_queued = False
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                job, args = item
+                try:
+                    job(*args)
+                except Exception as e:
+                    Logger.warning(f"SoundPool: {job.__name__}{args} failed: {e}")
+            for effect in self.loaded.values():
+                effect.unload()
+            self.loaded = {}
+        finally:
+            _detach_thread()
+
+    def _load(self, name):
+        path = next((path for path in self.effects[name] if os.path.exists(path)), None)
+        if path is None:
+            Logger.info(f"SoundPool: No file for sound effect {name}")
+            return
+        from kivy.core.audio import SoundLoader
+        with tracing.span("sound.load", "sound", effect=name, path=path):
+            voices = [SoundLoader.load(path) for _ in range(self.voice_count)]
+        voices = [voice for voice in voices if voice is not None]
+        if not voices:
+            Logger.warning(f"SoundPool: Cannot load {path}")
+            return
+        self.loaded[name] = SoundEffect(name, path, voices)
+
+    def _play(self, name, volume):
+        effect = self.loaded.get(name)
+        if effect is not None:
+            with tracing.span("sound.play", "sound", effect=name):
+                effect.play(volume)
+
+
+def _detach_thread():
+    # On Android the audio provider calls into Java, which attaches this
+    # thread to the JVM; it has to be detached before the thread ends.
+    try:
+        from jnius import detach
+    except ImportError:
+        return
+    detach()
@@ -0,0 +1,66 @@
+"""Compare card reveal latency for atlas-backed and per-file loading.
+
+A "reveal" is resolving a card through the asset manifest and producing its
+GL texture, exactly what assigning ``TarotCardImage.source`` does. Cold runs
+start from empty Kivy image caches, warm runs repeat the same cards.
+
+Usage:
+    python tools/build_atlas.py
+    python benchmarks/bench_atlas.py --height 448 --rounds 5
+"""
+import argparse
+import random
+import statistics
+
+from headless import setup_headless, timed
+
+
+def reveal_latencies(manifest, cards):
+    from kivy.core.image import Image as CoreImage
+    return [timed(lambda: CoreImage(manifest.get_path(card)).texture) for card in cards]
+
+
+def clear_image_caches():
+    from kivy.cache import Cache
+    for category in ('kv.image', 'kv.texture', 'kv.atlas'):
+        Cache.remove(category)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--height", type=int, default=448, help="atlas card height to benchmark")
+    parser.add_argument("--cards", type=int, default=10, help="cards revealed per round (10 = Celtic Cross)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    setup_headless()
+    from card_assets import CardAssetManifest, atlas_file_for
+    from main import tarot_cards
+
+    atlas_file = atlas_file_for(args.height)
+    manifests = {
+        "file": CardAssetManifest.build(tarot_cards),
+        "atlas": CardAssetManifest.build(tarot_cards, atlas_file=atlas_file),
+    }
+    if not manifests["atlas"].get_path(tarot_cards[0]).startswith("atlas://"):
+        raise SystemExit(f"{atlas_file} not found, run tools/build_atlas.py first")
+
+    rng = random.Random(args.seed)
+    spreads = [rng.sample(tarot_cards, args.cards) for _ in range(args.rounds)]
+
+    print(f"{'mode':<6} {'cold mean':>10} {'cold first':>11} {'warm mean':>10}   (ms per reveal)")
+    for mode, manifest in manifests.items():
+        cold, first, warm = [], [], []
+        for cards in spreads:
+            clear_image_caches()
+            latencies = reveal_latencies(manifest, cards)
+            first.append(latencies[0])
+            cold.extend(latencies)
+            warm.extend(reveal_latencies(manifest, cards))
+        print(f"{mode:<6} {statistics.mean(cold):>10.2f} {statistics.mean(first):>11.2f} "
+              f"{statistics.mean(warm):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Process time of the command-line reading tool, against a budget.
+
+Runs ``tarot_cli.py draw`` in fresh interpreters and reports the median
+wall time of the whole process, with and without meanings, plus the
+throughput of a large draw. It also checks that no Kivy module is
+imported. Exits non-zero when the median single draw takes more than
+``--budget-ms`` longer than starting a bare interpreter, or Kivy was
+imported, like bench_startup.py.
+
+Usage:
+    python benchmarks/bench_cli.py --runs 10 --budget-ms 50
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from headless import ROOT
+
+CLI = os.path.join(ROOT, "tarot_cli.py")
+CASES = {
+    "draw": ["draw", "--seed", "1"],
+    "draw --meanings": ["draw", "--seed", "1", "--meanings"],
+}
+
+
+def run(command):
+    started = time.perf_counter()
+    subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - started) * 1000.0
+
+
+def run_cli(args):
+    return run([sys.executable, CLI] + args)
+
+
+def kivy_modules(args):
+    """Kivy modules imported by one run, from ``python -X importtime``"""
+    result = subprocess.run([sys.executable, "-X", "importtime", CLI] + args, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    return sorted({line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()
+                   if line.rsplit("|", 1)[-1].strip().startswith("kivy")})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--count", type=int, default=100_000, help="readings in the throughput run")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="maximum median time of a single draw over a bare interpreter")
+    args = parser.parse_args(argv)
+
+    # Interpreter startup alone, the baseline of the budget
+    run([sys.executable, "-c", "pass"])
+    python_ms = statistics.median(run([sys.executable, "-c", "pass"]) for _ in range(args.runs))
+    print(f"{'case':<18} {'median ms':>10} {'min ms':>8}")
+    print(f"{'python -c pass':<18} {python_ms:>10.1f}")
+    medians = {}
+    for name, cli_args in CASES.items():
+        run_cli(cli_args)
+        samples = [run_cli(cli_args) for _ in range(args.runs)]
+        medians[name] = statistics.median(samples)
+        print(f"{name:<18} {medians[name]:>10.1f} {min(samples):>8.1f}")
+
+    ms = run_cli(["draw", "--spread", "Celtic Cross", "--count", str(args.count)])
+    print(f"\n{args.count} Celtic Cross readings: {ms:.0f} ms, {args.count / ms * 1000:.0f} readings/s")
+
+    failed = False
+    overhead = medians["draw"] - python_ms
+    if overhead > args.budget_ms:
+        print(f"FAIL: a draw takes {overhead:.1f} ms over the interpreter, budget {args.budget_ms:.0f} ms")
+        failed = True
+    imported = sorted({name for cli_args in CASES.values() for name in kivy_modules(cli_args)})
+    if imported:
+        print(f"FAIL: Kivy imported: {', '.join(imported)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"OK: a draw takes {overhead:.1f} ms over the interpreter, budget {args.budget_ms:.0f} ms, no Kivy imports")
+
+
+if __name__ == "__main__":
+    main()
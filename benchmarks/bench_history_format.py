@@ -0,0 +1,65 @@
+"""Size and parse time of the history file, legacy names vs card codes.
+
+"legacy" is the old layout: full card and orientation names, written with
+indent=2. "codes" is the current one: one integer per card, written
+without whitespace. Parse time is json.loads of the whole file; decode
+time is expanding one 30-row page back to names for display.
+
+Usage:
+    python benchmarks/bench_history_format.py --readings 50 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_codec import compact_reading, expand_reading  # noqa: E402
+from history import COMPACT_JSON  # noqa: E402
+from tarot_engine import SPREADS, DrawEngine  # noqa: E402
+
+
+def legacy_history(count, seed=1):
+    engine = DrawEngine(seed)
+    spreads = list(SPREADS)
+    start = datetime(2024, 1, 1)
+    readings = []
+    for i in range(count):
+        spread = spreads[i % len(spreads)]
+        cards, orientations = engine.draw_spread(spread)
+        readings.append({"date": (start + timedelta(hours=i)).isoformat(timespec="microseconds"),
+                         "spread": spread, "cards": cards, "orientations": orientations, "notes": ""})
+    return {"readings": readings, "journal": []}
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readings", type=int, nargs="+", default=[50, 10000])
+    args = parser.parse_args(argv)
+
+    print(f"{'readings':>8} {'format':>7} {'bytes':>10} {'parse ms':>9} {'page decode ms':>15}")
+    for count in args.readings:
+        legacy = legacy_history(count)
+        compact = {"readings": [compact_reading(r) for r in legacy["readings"]], "journal": []}
+        for name, history, kwargs in (("legacy", legacy, {"indent": 2}), ("codes", compact, COMPACT_JSON)):
+            text = json.dumps(history, **kwargs)
+            parse_ms = best_of(lambda: json.loads(text))
+            page = history["readings"][:30]
+            decode_ms = best_of(lambda: [expand_reading(r) for r in page])
+            print(f"{count:>8} {name:>7} {len(text.encode()):>10} {parse_ms:>9.3f} {decode_ms:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Headless build and scroll benchmark for the Tarot Journal screen.
+
+For each journal size, a synthetic SQLite-backed journal is generated
+(the JSON stores cap the journal at 100 entries). The benchmark times
+show_journal up to the first laid-out frame, then scrolls from top to
+bottom in fixed steps and records the time of every frame, including
+pages fetched on the way.
+
+Usage:
+    python benchmarks/bench_journal.py --sizes 100 1000 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from headless import idle, make_app, percentiles, setup_headless, timed
+
+
+def synthetic_journal(path, size):
+    from history import ReadingHistoryManager
+    manager = ReadingHistoryManager("sqlite", path)
+    start = time.time() - size * 3600
+    for i in range(size):
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(start + i * 3600))
+        manager.store.add("journal", {"date": stamp, "text": f"Entry {i}: " + "reflection " * (i % 40)})
+    manager.save_history()
+    return manager
+
+
+def find_list(app):
+    from history_views import PagedRecycleView
+    return next(w for w in app.main_layout.walk() if isinstance(w, PagedRecycleView))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--steps", type=int, default=200, help="scroll steps from top to bottom")
+    args = parser.parse_args(argv)
+
+    setup_headless()
+    app = make_app()
+
+    print(f"{'entries':>8} {'build ms':>9} {'frame mean':>11} {'frame p95':>10} {'frame max':>10} {'rows loaded':>12}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            app.history_manager = synthetic_journal(os.path.join(directory, "tarot_history.json"), size)
+            build_ms = timed(lambda: (app.show_journal(), idle(1)))
+            journal = find_list(app)
+
+            frames = []
+            for step in range(1, args.steps + 1):
+                journal.scroll_y = max(0.0, 1.0 - step / args.steps)
+                frames.append(timed(idle))
+            app.history_manager.close()
+
+        print(f"{size:>8} {build_ms:>9.2f} {statistics.mean(frames):>11.2f} "
+              f"{percentiles(frames)['p95']:>10.2f} {max(frames):>10.2f} {len(journal.data):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Main-thread cost of saving history and settings, before and after write-behind.
+
+"sync" performs the write on the calling thread, as every add_reading,
+add_journal_entry and settings toggle used to. "write-behind" hands it to
+a WriteBehindWorker. Times are measured on the calling thread only; the
+number of physical settings writes shows how bursts are coalesced.
+
+Usage:
+    python benchmarks/bench_persistence.py --adds 200 --toggles 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import ReadingHistoryManager, atomic_write_json  # noqa: E402
+from persistence import WriteBehindWorker  # noqa: E402
+
+
+def time_calls(fn, count):
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def bench_history(storage, adds, worker):
+    with tempfile.TemporaryDirectory() as directory:
+        manager = ReadingHistoryManager(storage, os.path.join(directory, "tarot_history.json"), worker)
+        samples = time_calls(lambda i: manager.add_reading(
+            "Celtic Cross", ["The Fool"] * 10, ["Upright"] * 10), adds)
+        if worker is not None:
+            worker.stop()
+        manager.close()
+    return samples
+
+
+def bench_settings(toggles, worker):
+    writes = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "settings.json")
+
+        def write(settings):
+            writes.append(settings)
+            atomic_write_json(path, settings)
+
+        def toggle(i):
+            settings = {"sound_enabled": i % 2 == 0, "animation_enabled": True}
+            if worker is None:
+                write(settings)
+            else:
+                worker.mark_dirty("settings", lambda: write(settings))
+
+        samples = time_calls(toggle, toggles)
+        if worker is not None:
+            worker.stop()
+    return samples, len(writes)
+
+
+def report(label, samples, extra=""):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+    print(f"{label:<28} {statistics.mean(samples):>9.3f} {statistics.median(samples):>9.3f} {p95:>9.3f}  {extra}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--adds", type=int, default=200, help="readings added per storage backend")
+    parser.add_argument("--toggles", type=int, default=50, help="settings toggles in one burst")
+    parser.add_argument("--window", type=float, default=0.5, help="write-behind coalescing window (s)")
+    args = parser.parse_args(argv)
+
+    print(f"{'main-thread ms per save':<28} {'mean':>9} {'median':>9} {'p95':>9}")
+    for storage in ("json", "log", "sqlite"):
+        report(f"{storage} sync", bench_history(storage, args.adds, None))
+        report(f"{storage} write-behind", bench_history(storage, args.adds, WriteBehindWorker(args.window)))
+
+    samples, writes = bench_settings(args.toggles, None)
+    report("settings sync", samples, f"{writes} writes")
+    samples, writes = bench_settings(args.toggles, WriteBehindWorker(args.window))
+    report("settings write-behind", samples, f"{writes} writes")
+
+
+if __name__ == "__main__":
+    main()
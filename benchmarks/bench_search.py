@@ -0,0 +1,94 @@
+"""Search latency over a large history, indexed vs a linear scan.
+
+Fills an SQLite-backed history (the uncapped storage) with N journal
+entries and N/10 readings, then times, per query: the first search after
+opening (index load included), warm searches through the inverted index,
+and the linear scan over every entry that the index replaces.
+
+Usage:
+    python benchmarks/bench_search.py --entries 10000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import ReadingHistoryManager  # noqa: E402
+from search_index import entry_text, tokenize  # noqa: E402
+from tarot_engine import SPREADS, DrawEngine  # noqa: E402
+
+WORDS = ("insight clarity path change heart fear hope journey work love family moon dream "
+         "patience doubt balance courage trust shadow light question answer river morning").split()
+QUERIES = ["love", "tower", "celtic cross", "hope jour", "death reversed", "river morning trust", "zzz"]
+
+
+def fill(manager, entries, seed=1):
+    rng = random.Random(seed)
+    engine = DrawEngine(seed)
+    spreads = list(SPREADS)
+    for i in range(entries):
+        manager.add_journal_entry(" ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60))))
+        if i % 10 == 0:
+            spread = spreads[i % len(spreads)]
+            manager.add_reading(spread, *engine.draw_spread(spread))
+    manager.save_history()
+
+
+def linear_search(manager, query):
+    terms = tokenize(query)
+    matches = []
+    for kind in ("readings", "journal"):
+        for entry in manager.store.entries(kind):
+            words = tokenize(entry_text(kind, entry))
+            if all(any(word.startswith(term) for word in words) for term in terms):
+                matches.append(entry)
+    return matches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000, help="journal entries")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        history_file = os.path.join(directory, "tarot_history.json")
+        manager = ReadingHistoryManager("sqlite", history_file)
+        start = time.perf_counter()
+        fill(manager, args.entries)
+        print(f"filled {args.entries} journal entries in {time.perf_counter() - start:.1f}s")
+        manager.search("warm up")
+        manager.close()
+
+        manager = ReadingHistoryManager("sqlite", history_file)
+        start = time.perf_counter()
+        manager.search(QUERIES[0], limit=30)
+        print(f"first search (loads the index): {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"index {os.path.getsize(manager.search_file) / 1024:.0f} KiB")
+
+        print(f"{'query':<22} {'matches':>8} {'index ms':>9} {'page ms':>8} {'scan ms':>8}")
+        for query in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                # A new query each time, so the cached result list is not reused
+                manager.search_index._last_query = None
+                start = time.perf_counter()
+                manager.search(query, limit=30)
+                samples.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            manager.search(query, offset=30, limit=30)
+            page_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            matches = linear_search(manager, query)
+            scan_ms = (time.perf_counter() - start) * 1000
+            print(f"{query:<22} {len(matches):>8} {statistics.median(samples):>9.3f} {page_ms:>8.3f} {scan_ms:>8.1f}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
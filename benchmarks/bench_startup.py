@@ -0,0 +1,112 @@
+"""Startup time to the main menu's first frame, against a budget.
+
+Each run starts a fresh interpreter that imports main.py headless,
+constructs PictureTarotApp, builds the main menu and draws one frame,
+timing each phase. After the frame it also checks that none of the
+modules deferred to secondary screens (see profile_imports.py) has been
+imported.
+
+The median total over all runs is compared with ``--budget-ms``; the
+script exits non-zero when it is over budget or when a deferred module
+was imported eagerly, so it can gate CI like check_canvas.py. Budgets are
+machine-dependent: set one from a few runs on the CI machine.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PHASES = ["import", "init", "build", "first_frame"]
+
+
+def child(storage_dir):
+    """One cold start in this process; prints the timings as JSON"""
+    start = time.perf_counter()
+    from headless import setup_headless
+    setup_headless()
+    import main
+    timings = {"import": time.perf_counter() - start}
+
+    from kivy.base import EventLoop
+    from kivy.core.window import Window
+    from profile_imports import DEFERRED_MODULES
+
+    mark = time.perf_counter()
+    app = main.PictureTarotApp(storage_dir=storage_dir)
+    timings["init"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    Window.add_widget(app.build())
+    EventLoop.ensure_window()
+    timings["build"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    EventLoop.idle()
+    timings["first_frame"] = time.perf_counter() - mark
+
+    result = {phase: seconds * 1000.0 for phase, seconds in timings.items()}
+    result["total"] = (time.perf_counter() - start) * 1000.0
+    result["eager_modules"] = [name for name in DEFERRED_MODULES if name in sys.modules]
+    app.on_stop()
+    print(json.dumps(result))
+
+
+def run_once(storage_dir):
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", storage_dir],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = (time.perf_counter() - started) * 1000.0
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="maximum median time from interpreter start to the first frame")
+    parser.add_argument("--json", help="write the per-run timings as JSON")
+    parser.add_argument("--child", metavar="STORAGE_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child)
+        return
+
+    # Runs share a scratch storage directory; the first one builds the card
+    # manifest and history summary there
+    with tempfile.TemporaryDirectory() as storage_dir:
+        run_once(storage_dir)
+        runs = [run_once(storage_dir) for _ in range(args.runs)]
+
+    print(f"{'phase':<12} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for phase in PHASES + ["total", "process"]:
+        samples = [run[phase] for run in runs]
+        print(f"{phase:<12} {statistics.median(samples):>10.1f} {min(samples):>8.1f} {max(samples):>8.1f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(runs, f, indent=2)
+
+    failed = False
+    total = statistics.median(run["total"] for run in runs)
+    if total > args.budget_ms:
+        print(f"FAIL: median startup {total:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    eager = sorted({name for run in runs for name in run["eager_modules"]})
+    if eager:
+        print(f"FAIL: imported before the first frame: {', '.join(eager)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"OK: median startup {total:.1f} ms, budget {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
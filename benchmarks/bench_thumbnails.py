@@ -0,0 +1,82 @@
+"""Cost of showing card thumbnails instead of the full deck images.
+
+Measures, per card, producing a GL texture from the full deck image and
+from its cached thumbnail (both from empty Kivy image caches), and the
+one-off cost of making a thumbnail: in all, and the part of it spent on
+the main thread drawing into the Fbo. Thumbnails are made in a temporary
+directory, so the app's cache is left alone.
+
+Usage:
+    python benchmarks/bench_thumbnails.py --height 192 --cards 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from headless import idle, setup_headless, timed
+
+
+def texture_latencies(paths):
+    from kivy.cache import Cache
+    from kivy.core.image import Image as CoreImage
+    latencies = []
+    for path in paths:
+        for category in ('kv.image', 'kv.texture'):
+            Cache.remove(category)
+        latencies.append(timed(lambda: CoreImage(path).texture))
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--height", type=int, help="thumbnail height in pixels (default: 64dp on this screen)")
+    parser.add_argument("--cards", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    setup_headless()
+    # Creating the window creates the GL context the textures need
+    from kivy.core.window import Window  # noqa: F401
+    from card_assets import CardAssetManifest
+    from tarot_engine import tarot_cards
+    import thumbnails
+    from thumbnails import ThumbnailCache
+
+    render_ms = []
+    render = thumbnails.render_thumbnail
+
+    def timed_render(*args):
+        started = time.perf_counter()
+        pixels = render(*args)
+        render_ms.append((time.perf_counter() - started) * 1000.0)
+        return pixels
+    thumbnails.render_thumbnail = timed_render
+
+    cards = tarot_cards[:args.cards]
+    manifest = CardAssetManifest.build(cards)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ThumbnailCache(manifest.base_path, args.height, directory=directory)
+        made = {}
+        started = time.perf_counter()
+        for card in cards:
+            cache.request(card, made.__setitem__)
+        while len(made) < len(cards):
+            time.sleep(0.001)
+            idle()
+        make_ms = (time.perf_counter() - started) * 1000.0 / len(cards)
+        disk_kb = sum(os.path.getsize(path) for path in made.values()) / len(cards) / 1024
+
+        full = texture_latencies([manifest.get_path(card) for card in cards])
+        small = texture_latencies([made[card] for card in cards])
+
+    print(f"{len(cards)} cards, thumbnails {cache.height} px tall, {disk_kb:.1f} KB each on disk")
+    print(f"{'image':<10} {'mean ms':>8} {'max ms':>8}")
+    for name, latencies in (("full", full), ("thumbnail", small)):
+        print(f"{name:<10} {statistics.mean(latencies):>8.2f} {max(latencies):>8.2f}")
+    print(f"making a thumbnail (once): {make_ms:.1f} ms per card, "
+          f"main thread {statistics.median(render_ms):.2f} ms median, {max(render_ms):.2f} ms max")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Headless screen build-time benchmark suite.
+
+Runs PictureTarotApp in an offscreen window and times, per synthetic
+history size:
+
+- build: a fresh app's build(), which shows the main menu
+- show_main_menu, show_spreads_menu, show_history, show_journal
+- start_reading for every entry in SPREADS
+
+Each operation is timed up to the end of the next frame, so layout and
+drawing are included. Screens are measured "cold" (the cached widget tree
+is dropped first) and "warm" (re-entry into the cached screen). Results
+are written as JSON with percentiles; pass --compare with an earlier
+result file to see the change in p50 per operation.
+
+Usage:
+    python benchmarks/bench_ui.py --sizes 0 100 1000 --repeat 20 --output ui.json
+    python benchmarks/bench_ui.py --compare ui.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from headless import ROOT, idle, percentiles, scratch_dir, setup_headless
+
+WINDOW_SIZE = (480, 854)
+
+
+def synthetic_history(directory, size):
+    """SQLite-backed history with `size` readings and journal entries"""
+    from history import ReadingHistoryManager
+    from main import SPREADS, tarot_cards
+
+    manager = ReadingHistoryManager("sqlite", os.path.join(directory, "tarot_history.json"))
+    spreads = list(SPREADS.items())
+    start = time.time() - size * 3600
+    for i in range(size):
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(start + i * 3600))
+        name, info = spreads[i % len(spreads)]
+        cards = [tarot_cards[(i + j) % len(tarot_cards)] for j in range(info["cards"])]
+        manager.store.add("readings", {"date": stamp, "spread": name, "cards": cards,
+                                       "orientations": ["Upright"] * len(cards)})
+        manager.store.add("journal", {"date": stamp, "text": f"Entry {i}: " + "reflection " * (i % 40)})
+    manager.save_history()
+    return manager
+
+
+def summarize(name, size, mode, samples):
+    result = {
+        "name": name,
+        "history": size,
+        "mode": mode,
+        "samples": len(samples),
+        "mean_ms": statistics.mean(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+    }
+    for key, value in percentiles(samples).items():
+        result[f"{key}_ms"] = value
+    return result
+
+
+def time_frame(fn):
+    start = time.perf_counter()
+    fn()
+    idle(1)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def bench_build(manager, repeat):
+    from kivy.core.window import Window
+    from main import PictureTarotApp
+
+    samples = []
+    storage_dir = scratch_dir()
+    for _ in range(repeat):
+        app = PictureTarotApp(storage_dir=storage_dir)
+        app.history_manager = manager
+
+        def build():
+            Window.add_widget(app.build())
+        samples.append(time_frame(build))
+        Window.remove_widget(app.main_layout)
+    return samples
+
+
+def bench_screens(app, repeat):
+    """Samples per (operation, mode) for every screen entry point"""
+    from kivy.uix.widget import Widget
+    from main import SPREADS
+
+    operations = [
+        ("show_main_menu", "main_menu", app.show_main_menu),
+        ("show_spreads_menu", "spreads", app.show_spreads_menu),
+        ("show_history", "history", app.show_history),
+        ("show_journal", "journal", app.show_journal),
+    ]
+    for spread_name, info in SPREADS.items():
+        operations.append((f"start_reading[{spread_name}]", "reading",
+                           lambda n=info["cards"], s=spread_name: app.start_reading(n, s)))
+
+    samples = {}
+    for name, screen, operation in operations:
+        for mode in ("cold", "warm"):
+            runs = samples.setdefault((name, mode), [])
+            for _ in range(repeat):
+                # Leave the screen so every run is a real navigation
+                app.show_screen("blank", Widget)
+                if mode == "cold":
+                    app.screens.pop(screen, None)
+                runs.append(time_frame(operation))
+                app.release_reading_textures()
+    return samples
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def gl_renderer():
+    try:
+        from kivy.graphics.opengl import GL_RENDERER, glGetString
+        return glGetString(GL_RENDERER).decode()
+    except Exception:
+        return None
+
+
+def compare(previous_file, results):
+    with open(previous_file, 'r') as f:
+        previous = {(r["name"], r["history"], r["mode"]): r for r in json.load(f)["results"]}
+    print(f"{'operation':<40} {'history':>7} {'mode':>5} {'p50 before':>11} {'p50 now':>9} {'change':>8}")
+    for result in results:
+        old = previous.get((result["name"], result["history"], result["mode"]))
+        if old is None:
+            continue
+        change = (result["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0.0
+        print(f"{result['name']:<40} {result['history']:>7} {result['mode']:>5} "
+              f"{old['p50_ms']:>11.2f} {result['p50_ms']:>9.2f} {change:>+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 100, 1000],
+                        help="synthetic history sizes (readings and journal entries each)")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per operation")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON results to compare p50 against")
+    args = parser.parse_args(argv)
+
+    setup_headless(*WINDOW_SIZE)
+    import kivy
+    from kivy.core.window import Window
+    from kivy.uix.popup import Popup
+    from main import PictureTarotApp
+    # Keep meaning popups from stacking up on the window
+    Popup.open = lambda self, *a, **kw: None
+
+    app = PictureTarotApp(storage_dir=scratch_dir())
+    Window.add_widget(app.build())
+    idle(2)
+
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            app.history_manager = synthetic_history(directory, size)
+            results.append(summarize("build", size, "cold", bench_build(app.history_manager, args.repeat)))
+            for (name, mode), samples in bench_screens(app, args.repeat).items():
+                results.append(summarize(name, size, mode, samples))
+            app.show_main_menu()
+            app.history_manager.close()
+    app.persistence.stop()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "kivy": kivy.__version__,
+            "platform": platform.platform(),
+            "window": list(WINDOW_SIZE),
+            "gl_renderer": gl_renderer(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
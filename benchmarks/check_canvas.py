@@ -0,0 +1,101 @@
+"""Regression check: canvas instruction counts stay flat across navigation.
+
+Tours every screen twice to warm the screen cache against a temporary history that
+already fills the history screen, then repeats the tour of menu round
+trips (including full readings) and counts the graphics instructions on
+every widget of every cached screen and on the root. Any growth means
+some widget keeps adding instructions instead of updating the ones it
+has; the script then exits non-zero.
+
+Usage:
+    python benchmarks/check_canvas.py --rounds 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from headless import idle, make_app, setup_headless
+
+
+def count_instructions(group):
+    """Number of instructions in a canvas or instruction group, recursively"""
+    total = 0
+    for instruction in group.children:
+        total += 1
+        if hasattr(instruction, 'children'):
+            total += count_instructions(instruction)
+    return total
+
+
+def canvas_size(widget):
+    # canvas.before/after live inside canvas.children once they exist; do not
+    # touch the properties themselves, they create the groups on first access.
+    return sum(count_instructions(child.canvas) for child in widget.walk(restrict=True))
+
+
+def total_instructions(app):
+    # The visible tree plus the cached screens that are not attached to it
+    total = canvas_size(app.main_layout)
+    for screen in app.screens.values():
+        if screen.parent is None:
+            total += canvas_size(screen)
+    return total
+
+
+def tour(app):
+    from tarot_engine import SPREADS
+    app.show_spreads_menu(); idle()
+    app.show_main_menu(); idle()
+    # A full reading of every spread, so each real layout is exercised
+    for spread_name, spread in SPREADS.items():
+        app.start_reading(spread["cards"], spread_name); idle()
+        for _ in range(spread["cards"]):
+            app.reveal_card_with_meaning(app.current_card_widget); idle()
+            app.reveal_card_with_meaning(app.current_card_widget); idle()
+    app.show_history(); idle()
+    app.show_main_menu(); idle()
+    app.show_journal(); idle()
+    app.show_main_menu(); idle()
+    app.show_settings(); idle()
+    app.show_main_menu(); idle()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    setup_headless()
+    from history import ReadingHistoryManager
+    from kivy.uix.popup import Popup
+    # Swallow the meaning popups so they do not pile up on the window
+    Popup.open = lambda self, *a, **kw: None
+
+    app = make_app()
+    with tempfile.TemporaryDirectory() as directory:
+        app.history_manager = ReadingHistoryManager("log", os.path.join(directory, "tarot_history.json"))
+        for _ in range(20):
+            app.history_manager.add_reading("Past-Present-Future", ["The Fool"] * 3, ["Upright"] * 3)
+            app.history_manager.add_journal_entry("Warm-up entry")
+
+        tour(app)
+        tour(app)
+        baseline = total_instructions(app)
+        counts = []
+        for _ in range(args.rounds):
+            tour(app)
+            counts.append(total_instructions(app))
+        app.history_manager.close()
+    app.persistence.stop()
+
+    print(f"baseline {baseline} instructions; after {args.rounds} rounds: min {min(counts)}, max {max(counts)}")
+    if max(counts) > baseline:
+        print("FAIL: canvas instruction count grew across navigation")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Regression check: card textures stay within budget and are unloaded after readings.
+
+Runs several Celtic Cross readings, revealing every card, with the deck
+loaded from loose image files and from its atlas. The atlas is chosen as
+the app chooses it, among those that fit the budget. After every reveal
+it records the texture cache's resident bytes, which may never exceed the
+budget. After every completed reading it checks four things. Only the
+pinned card back may still be cached. No texture bytes may stay resident
+beyond the pinned back's own texture. Kivy's image, texture and atlas
+caches may no longer hold any of the reading's faces. And the cache's
+footprint must match what it accounts. Exits non-zero on any violation.
+
+Usage:
+    python benchmarks/check_textures.py --rounds 5 --budget-mb 8 --atlas-budget-mb 64
+"""
+import argparse
+import os
+import sys
+import time
+
+from headless import idle, make_app, setup_headless
+
+
+def wait_for_prefetch(app, sources, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not all(source in app.texture_cache for source in sources):
+        time.sleep(0.01)
+        idle()
+
+
+def kivy_cached_faces(sources):
+    from kivy.cache import Cache
+    cached = set()
+    for category in ('kv.image', 'kv.texture'):
+        for key in Cache._objects.get(category, {}):
+            source = key.rsplit('|', 2)[0]
+            if source in sources:
+                cached.add(source)
+    return cached
+
+
+def kivy_cached_atlas(atlas_file):
+    from kivy.cache import Cache
+    return Cache.get('kv.atlas', os.path.splitext(atlas_file)[0]) is not None
+
+
+def run(app, mode, rounds, budget):
+    from card_assets import CardAssetManifest, find_atlas_file
+    from tarot_engine import tarot_cards
+    from texture_cache import TextureCache, TexturePrefetcher
+
+    atlas_file = find_atlas_file(550, budget) if mode == "atlas" else None
+    if mode == "atlas" and atlas_file is None:
+        print(f"atlas: no deck atlas fits {budget / 2**20:.0f} MB, skipped")
+        return []
+    app.card_assets = CardAssetManifest.build(tarot_cards, atlas_file=atlas_file)
+    app.texture_cache = TextureCache(budget)
+    app.texture_prefetcher = TexturePrefetcher(app.texture_cache)
+
+    failures = []
+    peak = 0
+    for _ in range(rounds):
+        app.start_reading(10, "Celtic Cross"); idle()
+        faces = {app.get_card_image_path(card) for card in app.current_cards}
+        wait_for_prefetch(app, faces)
+        for _ in app.current_cards:
+            app.reveal_card_with_meaning(app.current_card_widget); idle()
+            peak = max(peak, app.texture_cache.resident_bytes)
+            if app.card_index < len(app.current_cards) - 1:
+                app.reveal_card_with_meaning(app.current_card_widget); idle()
+        app.complete_reading(); idle()
+
+        footprint = app.texture_cache.footprint()
+        left = set(footprint["cards"]) - set(footprint["pinned"])
+        if left:
+            failures.append(f"{mode}: still cached after the reading: {sorted(left)}")
+        if footprint["resident_bytes"] != sum(texture["bytes"] for texture in footprint["textures"]):
+            failures.append(f"{mode}: resident bytes do not match the textures held")
+        # A pinned sub-texture would keep its whole atlas resident
+        pinned_bytes = sum(footprint["cards"][source] for source in footprint["pinned"])
+        if footprint["resident_bytes"] > pinned_bytes:
+            failures.append(f"{mode}: {footprint['resident_bytes'] - pinned_bytes} bytes still resident "
+                            f"beyond the pinned cards")
+        if mode == "files":
+            retained = kivy_cached_faces(faces - set(footprint["pinned"]))
+            if retained:
+                failures.append(f"{mode}: Kivy still caches {sorted(retained)}")
+        elif kivy_cached_atlas(atlas_file):
+            failures.append(f"{mode}: Kivy still caches {atlas_file}")
+        app.show_main_menu(); idle()
+
+    footprint = app.texture_cache.footprint()
+    print(f"{mode}: peak {peak / 2**20:.1f} MB of a {budget / 2**20:.0f} MB budget, "
+          f"{footprint['resident_bytes'] / 2**20:.1f} MB resident after the last reading "
+          f"({len(footprint['pinned'])} pinned)")
+    if peak > budget:
+        failures.append(f"{mode}: peak {peak} bytes is over the {budget} byte budget")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-mb", type=float, default=8, help="texture budget of the files run")
+    parser.add_argument("--atlas-budget-mb", type=float, default=64,
+                        help="texture budget of the atlas run; all the atlas's pages must fit")
+    args = parser.parse_args(argv)
+
+    setup_headless()
+    from kivy.uix.popup import Popup
+    # Swallow the meaning popups so they do not pile up on the window
+    Popup.open = lambda self, *a, **kw: None
+
+    app = make_app()
+    failures = (run(app, "files", args.rounds, int(args.budget_mb * 2**20))
+                + run(app, "atlas", args.rounds, int(args.atlas_budget_mb * 2**20)))
+    app.on_stop()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Shared setup for running the app headless.
+
+Importing this module before Kivy selects SDL2's offscreen video driver, so
+the benchmarks run on a Linux box without a display or GPU (Mesa's llvmpipe
+provides the GL context). Call ``setup_headless()`` before importing
+``main``.
+
+Apps are given a scratch storage directory, so runs never read or write
+the history, settings or caches in the working tree.
+"""
+import atexit
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_headless(width=480, height=854):
+    """Configure Kivy for an offscreen window of the given size"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ.setdefault("KIVY_NO_FILELOG", "1")
+    os.environ.setdefault("KIVY_NO_CONFIG", "1")
+
+    from kivy.config import Config
+    Config.set('graphics', 'width', str(width))
+    Config.set('graphics', 'height', str(height))
+    # Do not let the Clock sleep to cap the frame rate; frame times are measured
+    Config.set('graphics', 'maxfps', '0')
+
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    # The app resolves images relative to the working directory
+    os.chdir(ROOT)
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn once and return the elapsed time in milliseconds"""
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def idle(frames=1):
+    """Run `frames` iterations of the Kivy event loop (clock, layout, draw)"""
+    from kivy.base import EventLoop
+    for _ in range(frames):
+        EventLoop.idle()
+
+
+def scratch_dir():
+    """A temporary directory removed when the process exits"""
+    directory = tempfile.TemporaryDirectory(prefix="tarot-bench-")
+    atexit.register(directory.cleanup)
+    return directory.name
+
+
+def make_app(storage_dir=None):
+    """Build PictureTarotApp on a fresh storage directory and attach its root to the offscreen window"""
+    from kivy.base import EventLoop
+    from kivy.core.window import Window
+    from main import PictureTarotApp
+
+    app = PictureTarotApp(storage_dir=storage_dir or scratch_dir())
+    Window.add_widget(app.build())
+    EventLoop.ensure_window()
+    idle(2)
+    return app
+
+
+def percentiles(samples, points=(50, 90, 95, 99)):
+    """Nearest-rank percentiles of a list of samples"""
+    ordered = sorted(samples)
+    result = {}
+    for point in points:
+        rank = max(1, -(-point * len(ordered) // 100))
+        result[f"p{point}"] = ordered[rank - 1]
+    return result
@@ -0,0 +1,155 @@
+"""Load test of tarot_server.py: requests per second and latency percentiles.
+
+Opens ``--connections`` keep-alive connections to the service and sends
+requests on all of them at once for ``--duration`` seconds, cycling
+through a mix of endpoints (draws, meanings, history pages, searches and
+journal writes). Reports the throughput and the p50/p90/p99/max latency
+per endpoint and overall, and the count of error responses.
+
+Without ``--url`` the server is started in a subprocess on a free port
+with a fresh history in a temporary directory, and stopped afterwards.
+
+Usage:
+    python benchmarks/load_test.py --connections 1000 --duration 10
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --connections 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+
+from headless import ROOT
+
+SERVER = os.path.join(ROOT, "tarot_server.py")
+# (name, method, path, body); picked round-robin, weighted by repetition
+MIX = [
+    ("draw", "GET", "/draw?spread=Celtic+Cross", None),
+    ("draw", "GET", "/draw?spread=Past-Present-Future&meanings=1", None),
+    ("meaning", "GET", f"/meaning?card={quote('The Tower')}&orientation=Reversed", None),
+    ("meaning", "GET", f"/meaning?card={quote('Ace of Cups')}&language=es", None),
+    ("history", "GET", "/history?kind=readings&limit=20", None),
+    ("history", "GET", "/history?kind=journal&offset=20&limit=20", None),
+    ("search", "GET", "/history?kind=journal&q=hope", None),
+    ("draw+save", "POST", "/draw?spread=Daily+Guidance", b""),
+    ("journal", "POST", "/journal", json.dumps({"text": "Load test entry: hope, patience and a quiet morning"}).encode()),
+    ("draw", "GET", "/draw?spread=Chakra+Balance", None),
+]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def worker(host, port, offset, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            name, method, path, body = MIX[i % len(MIX)]
+            i += 1
+            request = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if body is not None:
+                request += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            started = time.perf_counter()
+            writer.write(request.encode("latin-1") + b"\r\n" + (body or b""))
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = next(int(line.split(b":", 1)[1]) for line in head.split(b"\r\n")
+                          if line.lower().startswith(b"content-length:"))
+            await reader.readexactly(length)
+            latencies.setdefault(name, []).append(time.perf_counter() - started)
+            if status >= 400:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, connections, duration):
+    latencies, errors = {}, {}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    results = await asyncio.gather(*(worker(host, port, i, deadline, latencies, errors) for i in range(connections)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    failures = [r for r in results if isinstance(r, Exception)]
+    return latencies, errors, failures, elapsed
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"Server did not start on {host}:{port}")
+
+
+def report(latencies, errors, failures, elapsed, connections):
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"{total} requests over {connections} connections in {elapsed:.1f}s: {total / elapsed:.0f} requests/s")
+    print(f"{'endpoint':<10} {'requests':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows = sorted(latencies.items()) + [("all", [s for samples in latencies.values() for s in samples])]
+    for name, samples in rows:
+        if samples:
+            print(f"{name:<10} {len(samples):>9} {statistics.median(samples) * 1000:>8.1f} "
+                  f"{percentile(samples, 0.90) * 1000:>8.1f} {percentile(samples, 0.99) * 1000:>8.1f} "
+                  f"{max(samples) * 1000:>8.1f}")
+    if errors:
+        print("error responses: " + ", ".join(f"{status}: {count}" for status, count in sorted(errors.items())))
+    if failures:
+        print(f"{len(failures)} connections failed, e.g. {failures[0]!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="server to test (default: start one)")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--storage", default="sqlite", help="history backend of the started server")
+    args = parser.parse_args(argv)
+
+    # Every connection needs a descriptor here, and one more in the server
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, max(soft, args.connections * 2 + 256))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    server = None
+    with tempfile.TemporaryDirectory() as directory:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            host, port = "127.0.0.1", free_port()
+            server = subprocess.Popen([sys.executable, SERVER, "--host", host, "--port", str(port),
+                                       "--storage", args.storage,
+                                       "--history-file", os.path.join(directory, "tarot_history.json")],
+                                      stderr=subprocess.DEVNULL)
+            wait_for_port(host, port)
+        try:
+            latencies, errors, failures, elapsed = asyncio.run(run_load(host, port, args.connections, args.duration))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        report(latencies, errors, failures, elapsed, args.connections)
+
+
+if __name__ == "__main__":
+    main()
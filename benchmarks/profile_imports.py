@@ -0,0 +1,74 @@
+"""Import-time profile of the app, from ``python -X importtime``.
+
+Imports main.py headless in a fresh interpreter and reports the slowest
+modules by cumulative and by self time, the total for the app's own
+modules, and which of the modules deferred to secondary screens were
+imported anyway.
+
+Usage:
+    python benchmarks/profile_imports.py --top 25
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from headless import ROOT
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+APP_MODULES = {os.path.splitext(name)[0] for name in os.listdir(ROOT) if name.endswith(".py")}
+# Used by secondary screens only; main.py imports them where they are needed.
+# (kivy.animation is not among them: kivy.uix.behaviors imports it anyway.)
+DEFERRED_MODULES = [
+    "kivy.uix.popup", "kivy.uix.textinput", "kivy.uix.switch", "kivy.uix.slider", "kivy.uix.scrollview",
+    "kivy.uix.recycleview", "kivy.core.audio", "card_meanings", "history_views", "thumbnails", "sqlite3",
+    "numpy",
+]
+
+
+def profile(module="main"):
+    """(module, self us, cumulative us, depth) for every import, in order"""
+    code = ("import sys; sys.path.insert(0, 'benchmarks'); "
+            "from headless import setup_headless; setup_headless(); "
+            f"import {module}")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rows = profile()
+    main_row = next(row for row in rows if row[0] == "main")
+    print(f"import main: {main_row[2] / 1000:.1f} ms cumulative, {len(rows)} modules imported")
+
+    print(f"\nslowest by cumulative time\n{'ms':>8}  module")
+    for name, _, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>8.1f}  {'  ' * depth}{name}")
+
+    print(f"\nslowest by self time\n{'ms':>8}  module")
+    for name, self_us, _, _ in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"{self_us / 1000:>8.1f}  {name}")
+
+    app_rows = [row for row in rows if row[0] in APP_MODULES]
+    print(f"\napp modules: {sum(row[1] for row in app_rows) / 1000:.1f} ms self time")
+    for name, self_us, cumulative_us, _ in app_rows:
+        print(f"{cumulative_us / 1000:>8.1f}  {name}")
+
+    imported = {row[0] for row in rows}
+    eager = [name for name in DEFERRED_MODULES if name in imported]
+    print(f"\ndeferred modules imported at startup: {', '.join(eager) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
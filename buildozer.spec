@@ -5,7 +5,9 @@ package.domain = org.example
 version = 1.0
 requirements = hostpython3, libffi, openssl, sdl2_image, sdl2_mixer, sdl2_ttf, sqlite3, python3, sdl2, setuptools, six, pyjnius, android, kivy, urllib3, idna, certifi, chardet, requests
 source.dir = .
-source.include_exts = py,png,kv,atlas
+source.include_exts = py,png,kv,atlas,dat,idx
+source.exclude_dirs = tools, benchmarks, bin, thumbnails
+source.exclude_patterns = tarot_simulation.py, tarot_cli.py, tarot_server.py, tarot_bulk.py
 fullscreen = 0
 icon.filename = images/AppIcons/playstore.png
 orientation = portrait
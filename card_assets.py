@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import re
+import struct
+
+import tracing
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+IMAGE_BASE_PATHS = ['images/rider-waite-tarot/', 'images/', '']
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg']
+BASE_PATH_PROBES = ['CardBacks.png', 'CardBacks.jpg', 'The_Fool.png']
+CARD_BACK = "CardBacks"
+MANIFEST_FILE = "card_manifest.json"
+MANIFEST_VERSION = 3
+ATLAS_DIR = 'images/atlas/'
+ATLAS_PATTERN = re.compile(r'^deck-(\d+)\.atlas$')
+
+
+def find_image_base_path():
+    """Determine the correct base path for images"""
+    for path in IMAGE_BASE_PATHS:
+        for test_file in BASE_PATH_PROBES:
+            if os.path.exists(f"{path}{test_file}"):
+                return path
+    return 'images/'
+
+
+def atlas_file_for(height):
+    """Atlas file holding the deck packed at the given card height"""
+    return f"{ATLAS_DIR}deck-{height}.atlas"
+
+
+def atlas_bytes(atlas_file):
+    """Decoded RGBA size of all of an atlas's pages, from their PNG headers; None if unreadable"""
+    directory = os.path.dirname(atlas_file)
+    total = 0
+    try:
+        with open(atlas_file, 'r') as f:
+            pages = list(json.load(f))
+        for page in pages:
+            with open(os.path.join(directory, page), 'rb') as f:
+                header = f.read(24)
+            # PNG signature, then the IHDR chunk: width and height first
+            if header[:8] != b'\x89PNG\r\n\x1a\n':
+                return None
+            width, height = struct.unpack('>II', header[16:24])
+            total += width * height * 4
+    except (OSError, ValueError, struct.error):
+        return None
+    return total
+
+
+def find_atlas_file(target_height, max_bytes=None):
+    """Pick the smallest packed deck at least `target_height` tall, else the largest one.
+
+    With `max_bytes`, atlases whose pages would take more texture memory
+    are skipped; if none fits, cards are loaded from their own files.
+    """
+    try:
+        heights = sorted(int(m.group(1)) for m in map(ATLAS_PATTERN.match, os.listdir(ATLAS_DIR)) if m)
+    except OSError:
+        return None
+    if max_bytes is not None:
+        heights = [height for height in heights if (atlas_bytes(atlas_file_for(height)) or 0) <= max_bytes]
+    if not heights:
+        return None
+    for height in heights:
+        if height >= target_height:
+            return atlas_file_for(height)
+    return atlas_file_for(heights[-1])
+
+
+def _fingerprint(path):
+    """Size/mtime fingerprint of a file or directory, or None if it is missing"""
+    try:
+        st = os.stat(path or '.')
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _load_atlas_ids(atlas_file):
+    """All image ids packed into an atlas file"""
+    try:
+        with open(atlas_file, 'r') as f:
+            pages = json.load(f)
+    except (OSError, ValueError) as e:
+        Logger.warning(f"CardAssets: Ignoring unreadable atlas {atlas_file}: {e}")
+        return set()
+    return {uid for page in pages.values() for uid in page}
+
+
+class CardAssetManifest:
+    """Maps every card name (plus the card back) to its resolved image path.
+
+    The manifest is resolved once, cached to disk and afterwards every lookup
+    is a plain dict hit. When a packed deck atlas is available the faces'
+    paths are ``atlas://`` URIs, so revealing a card is a sub-texture lookup.
+    """
+    def __init__(self, base_path, paths, fingerprint=None):
+        self.base_path = base_path
+        self.paths = paths
+        self.fingerprint = fingerprint
+        self.card_back_path = paths.get(CARD_BACK)
+
+    def get_path(self, card_name):
+        """Resolved path for a card, falling back to the card back"""
+        return self.paths.get(card_name, self.card_back_path)
+
+    @classmethod
+    def build(cls, card_names, base_path=None, atlas_file=None):
+        """Resolve every card image with a single directory listing"""
+        if base_path is None:
+            base_path = find_image_base_path()
+        try:
+            available = set(os.listdir(base_path or '.'))
+        except OSError:
+            available = set()
+
+        paths = {}
+        for name in [CARD_BACK] + list(card_names):
+            formatted_name = name.replace(" ", "_")
+            for ext in IMAGE_EXTENSIONS:
+                if f"{formatted_name}{ext}" in available:
+                    paths[name] = f"{base_path}{formatted_name}{ext}"
+                    break
+
+        if atlas_file:
+            atlas_ids = _load_atlas_ids(atlas_file)
+            atlas_uri = f"atlas://{os.path.splitext(atlas_file)[0]}"
+            # The card back stays a file of its own: it is pinned in the texture
+            # cache, and as a sub-texture it would keep every atlas page resident.
+            for name in card_names:
+                uid = name.replace(" ", "_")
+                if uid in atlas_ids:
+                    paths[name] = f"{atlas_uri}/{uid}"
+
+        missing = [name for name in card_names if name not in paths]
+        if missing:
+            Logger.warning(f"CardAssets: {len(missing)} cards have no image, using card back")
+        return cls(base_path, paths, cls._fingerprint_for(base_path, atlas_file))
+
+    @staticmethod
+    def _fingerprint_for(base_path, atlas_file):
+        return {
+            "base_path": base_path,
+            "images": _fingerprint(base_path),
+            "atlas_file": atlas_file,
+            "atlas": _fingerprint(atlas_file) if atlas_file else None
+        }
+
+    @classmethod
+    @tracing.traced("card_assets.load_or_build", "assets")
+    def load_or_build(cls, card_names, atlas_height=None, manifest_file=MANIFEST_FILE, max_atlas_bytes=None):
+        """Load the cached manifest if its fingerprint still matches, else rebuild it
+
+        With `atlas_height` set, cards resolve to the best matching packed
+        deck from ``images/atlas/`` that fits in `max_atlas_bytes`, when
+        one exists.
+        """
+        card_names = list(card_names)
+        atlas_file = find_atlas_file(atlas_height, max_atlas_bytes) if atlas_height else None
+        try:
+            with open(manifest_file, 'r') as f:
+                cached = json.load(f)
+            fingerprint = cached.get("fingerprint") or {}
+            if (cached.get("version") == MANIFEST_VERSION
+                    and cached.get("cards") == card_names
+                    and fingerprint.get("images") is not None
+                    and fingerprint == cls._fingerprint_for(fingerprint.get("base_path"), atlas_file)):
+                return cls(cached["base_path"], cached["paths"], fingerprint)
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        Logger.info("CardAssets: Building card asset manifest")
+        manifest = cls.build(card_names, atlas_file=atlas_file)
+        manifest.save(card_names, manifest_file)
+        return manifest
+
+    def save(self, card_names, manifest_file=MANIFEST_FILE):
+        try:
+            with open(manifest_file, 'w') as f:
+                json.dump({
+                    "version": MANIFEST_VERSION,
+                    "cards": list(card_names),
+                    "base_path": self.base_path,
+                    "fingerprint": self.fingerprint,
+                    "paths": self.paths
+                }, f)
+        except OSError as e:
+            Logger.error(f"Failed to save card manifest: {e}")
@@ -0,0 +1,150 @@
+"""Compact integer encoding of cards, stored readings and share codes.
+
+A card is identified by its index in `tarot_cards` (0-77). Together with
+its orientation it forms a card code, ``card_id * 2 + reversed`` (0-155),
+which fits in one byte.
+
+Stored readings keep their date, spread and notes but replace the card and
+orientation name lists with their card codes as one hex string, two digits
+per card: a single JSON string parses several times faster than a list.
+Entries written before this format ("cards"/"orientations" lists) are
+still understood, and are converted by `compact_reading` when a store
+loads them.
+
+Share codes pack a whole reading (spread, cards in order and orientations)
+into one mixed-radix integer written in base 62, followed by a check
+character: 14 characters for a Celtic Cross, e.g. ``47sKPRGcemTnrp``.
+"""
+from tarot_engine import ORIENTATIONS, SPREADS, tarot_cards
+
+CARD_IDS = {name: i for i, name in enumerate(tarot_cards)}
+
+# Share codes refer to spreads by their position here: only ever append.
+SHARE_SPREADS = list(SPREADS)
+SHARE_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def encode_card(card_name, orientation):
+    """Card code of a card and its orientation"""
+    return CARD_IDS[card_name] * 2 + ORIENTATIONS.index(orientation)
+
+
+def decode_card(code):
+    """Card name and orientation of a card code"""
+    return tarot_cards[code >> 1], ORIENTATIONS[code & 1]
+
+
+def encode_cards(cards, orientations):
+    return [encode_card(card, orientation) for card, orientation in zip(cards, orientations)]
+
+
+def decode_cards(codes):
+    """Card names and orientations of a sequence of card codes (or bytes)"""
+    return [tarot_cards[code >> 1] for code in codes], [ORIENTATIONS[code & 1] for code in codes]
+
+
+def compact_reading(reading):
+    """Stored form of a reading.
+
+    Legacy entries with name lists are converted; ones naming cards outside
+    the deck cannot be encoded and are returned unchanged.
+    """
+    if "codes" in reading:
+        return reading
+    try:
+        codes = encode_cards(reading["cards"], reading["orientations"])
+    except (KeyError, ValueError):
+        return reading
+    compact = {"date": reading["date"], "spread": reading["spread"], "codes": bytes(codes).hex()}
+    if reading.get("notes"):
+        compact["notes"] = reading["notes"]
+    return compact
+
+
+def expand_reading(entry):
+    """Display form of a stored reading, with card and orientation names"""
+    if "codes" not in entry:
+        return entry
+    cards, orientations = decode_cards(bytes.fromhex(entry["codes"]))
+    return {
+        "date": entry["date"],
+        "spread": entry["spread"],
+        "cards": cards,
+        "orientations": orientations,
+        "notes": entry.get("notes", "")
+    }
+
+
+def _check_char(body):
+    # Position-weighted sum, so single typos and most swaps are caught
+    total = sum((i + 1) * SHARE_ALPHABET.index(c) for i, c in enumerate(body))
+    return SHARE_ALPHABET[total % len(SHARE_ALPHABET)]
+
+
+def share_code(spread_name, cards, orientations):
+    """Short base-62 code for a reading; spreads outside SPREADS share as custom"""
+    deck_size = len(tarot_cards)
+    if spread_name in SHARE_SPREADS:
+        digits = [(SHARE_SPREADS.index(spread_name), len(SHARE_SPREADS) + 1)]
+    else:
+        digits = [(len(SHARE_SPREADS), len(SHARE_SPREADS) + 1), (len(cards) - 1, deck_size)]
+
+    # Each card as its rank among the cards not drawn yet: 78 * 77 * ...
+    remaining = list(range(deck_size))
+    for card in cards:
+        card_id = CARD_IDS[card]
+        digits.append((remaining.index(card_id), len(remaining)))
+        remaining.remove(card_id)
+    digits.extend((ORIENTATIONS.index(orientation), 2) for orientation in orientations)
+
+    # The first digit ends up least significant, so decoding reads it first
+    value = 0
+    for digit, radix in reversed(digits):
+        value = value * radix + digit
+    body = ""
+    while True:
+        value, remainder = divmod(value, len(SHARE_ALPHABET))
+        body = SHARE_ALPHABET[remainder] + body
+        if not value:
+            break
+    return body + _check_char(body)
+
+
+def parse_share_code(code):
+    """(spread name or None for a custom spread, cards, orientations) of a share code.
+
+    Raises ValueError for codes that are malformed or fail the check.
+    """
+    code = code.strip()
+    if len(code) < 2 or any(c not in SHARE_ALPHABET for c in code):
+        raise ValueError(f"Not a share code: {code!r}")
+    body, check = code[:-1], code[-1]
+    if _check_char(body) != check:
+        raise ValueError(f"Share code {code!r} is mistyped")
+
+    value = 0
+    for c in body:
+        value = value * len(SHARE_ALPHABET) + SHARE_ALPHABET.index(c)
+
+    deck_size = len(tarot_cards)
+    value, slot = divmod(value, len(SHARE_SPREADS) + 1)
+    if slot < len(SHARE_SPREADS):
+        spread_name = SHARE_SPREADS[slot]
+        num_cards = SPREADS[spread_name]["cards"]
+    else:
+        spread_name = None
+        value, num_cards = divmod(value, deck_size)
+        num_cards += 1
+
+    remaining = list(range(deck_size))
+    cards = []
+    for _ in range(num_cards):
+        value, rank = divmod(value, len(remaining))
+        cards.append(tarot_cards[remaining.pop(rank)])
+    orientations = []
+    for _ in range(num_cards):
+        value, bit = divmod(value, 2)
+        orientations.append(ORIENTATIONS[bit])
+    if value:
+        raise ValueError(f"Share code {code!r} is too long")
+    return spread_name, cards, orientations
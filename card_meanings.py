@@ -0,0 +1,238 @@
+"""Card meanings for all 78 cards, in several languages, loaded on demand.
+
+The sources are one JSON file per language in ``data/meanings/``, mapping
+each card to its "upright" and "reversed" keywords and a long-form
+"description". Languages other than English may leave fields out; they
+fall back to the English text, and the index records each language's
+coverage so incomplete ones can be caught (tools/build_meanings.py).
+
+`build_index` compiles the sources into two files:
+
+- ``data/meanings.dat``: one UTF-8 JSON record per card and language,
+  concatenated, with the English fallbacks already merged in.
+- ``data/meanings.idx``: a small JSON index giving the (offset, length) of
+  every record in the data file, the share of fields each language
+  translates, plus a fingerprint of the sources.
+
+Only the index is parsed at import. The data file is memory-mapped the
+first time a record is needed and each lookup decodes just that record,
+so startup never parses the full corpus.
+"""
+import json
+import locale
+import logging
+import mmap
+import os
+from collections.abc import Mapping
+
+from tarot_engine import tarot_cards
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+MEANINGS_DIR = "data/meanings/"
+DATA_FILE = "data/meanings.dat"
+INDEX_FILE = "data/meanings.idx"
+INDEX_VERSION = 2
+DEFAULT_LANGUAGE = "en"
+FIELDS = ("upright", "reversed", "description")
+
+
+def _fingerprint(path):
+    """Size/mtime fingerprint of a file, or None if it is missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def source_files(source_dir=MEANINGS_DIR):
+    """{language code: path} of the JSON sources in a directory"""
+    try:
+        names = sorted(os.listdir(source_dir))
+    except OSError:
+        return {}
+    return {os.path.splitext(name)[0]: os.path.join(source_dir, name) for name in names if name.endswith(".json")}
+
+
+def sources_fingerprint(source_dir=MEANINGS_DIR):
+    return {language: _fingerprint(path) for language, path in source_files(source_dir).items()}
+
+
+def default_language(available=None):
+    """Language of the system locale if there are meanings for it, else English"""
+    try:
+        code = locale.getlocale()[0] or os.environ.get("LANG", "")
+    except ValueError:
+        code = os.environ.get("LANG", "")
+    code = code.split("_")[0].split(".")[0].lower()
+    if available is not None and code not in available:
+        return DEFAULT_LANGUAGE
+    return code or DEFAULT_LANGUAGE
+
+
+def build_index(source_dir=MEANINGS_DIR, card_names=tarot_cards):
+    """Compile the JSON sources into (index, data bytes)"""
+    sources = {}
+    for language, path in source_files(source_dir).items():
+        with open(path, 'r', encoding='utf-8') as f:
+            sources[language] = json.load(f)
+    if DEFAULT_LANGUAGE not in sources:
+        raise ValueError(f"No {DEFAULT_LANGUAGE} meanings in {source_dir}")
+
+    fallback = sources[DEFAULT_LANGUAGE]["cards"]
+    missing = [name for name in card_names if name not in fallback]
+    if missing:
+        Logger.warning(f"CardMeanings: {len(missing)} cards have no {DEFAULT_LANGUAGE} meaning")
+
+    data = bytearray()
+    records = {}
+    coverage = {}
+    for language, source in sources.items():
+        cards = source.get("cards", {})
+        records[language] = {}
+        own_fields = 0
+        for name in card_names:
+            if name not in fallback and name not in cards:
+                continue
+            base = fallback.get(name, {})
+            own = cards.get(name, {})
+            record = {field: own.get(field) or base.get(field, "") for field in FIELDS}
+            own_fields += sum(1 for field in FIELDS if own.get(field))
+            body = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            records[language][name] = [len(data), len(body)]
+            data += body
+        coverage[language] = own_fields / (len(card_names) * len(FIELDS))
+
+    index = {
+        "version": INDEX_VERSION,
+        "fingerprint": sources_fingerprint(source_dir),
+        "languages": {language: source.get("name", language) for language, source in sources.items()},
+        "coverage": coverage,
+        "records": records
+    }
+    return index, bytes(data)
+
+
+def write_index(index, data, data_file=DATA_FILE, index_file=INDEX_FILE):
+    """Write the data file, then the index that points into it"""
+    for path, payload, mode in ((data_file, data, 'wb'), (index_file, json.dumps(index, ensure_ascii=False), 'w')):
+        tmp = f"{path}.tmp"
+        kwargs = {} if 'b' in mode else {"encoding": "utf-8"}
+        with open(tmp, mode, **kwargs) as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+
+class MeaningsDatabase(Mapping):
+    """Read-only view of the compiled meanings.
+
+    As a mapping it is keyed by card name and yields the record of the
+    current `language`, so ``CARD_MEANINGS.get(card, {}).get("upright")``
+    keeps working. Each lookup is a dict hit into the index followed by
+    decoding one record of a few hundred bytes; decoded records are kept.
+    """
+    def __init__(self, index, data_file=DATA_FILE, data=None):
+        self.index = index
+        self.data_file = data_file
+        self.languages = index["languages"]
+        # Share of a language's fields that are not English fallbacks
+        self.coverage = index.get("coverage", {})
+        self._records = index["records"]
+        self.language = DEFAULT_LANGUAGE
+        self._data = data
+        self._file = None
+        self._decoded = {}
+
+    @classmethod
+    def load_or_build(cls, source_dir=MEANINGS_DIR, data_file=DATA_FILE, index_file=INDEX_FILE):
+        """Load the index if it matches the sources, else rebuild both files
+
+        Without sources (a build that ships only the compiled files) the
+        index is used as it is.
+        """
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            fingerprint = sources_fingerprint(source_dir)
+            if (index.get("version") == INDEX_VERSION
+                    and os.path.exists(data_file)
+                    and (not fingerprint or index.get("fingerprint") == fingerprint)):
+                return cls(index, data_file)
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        Logger.info("CardMeanings: Building card meanings index")
+        try:
+            index, data = build_index(source_dir)
+        except (OSError, ValueError) as e:
+            Logger.error(f"CardMeanings: Cannot build meanings index: {e}")
+            return cls({"languages": {}, "coverage": {}, "records": {}}, data_file, b"")
+        try:
+            write_index(index, data, data_file, index_file)
+        except OSError as e:
+            # Read-only install: serve this run from memory
+            Logger.warning(f"CardMeanings: Cannot save meanings index: {e}")
+            return cls(index, data_file, data)
+        return cls(index, data_file)
+
+    def _buffer(self):
+        if self._data is None:
+            self._file = open(self.data_file, 'rb')
+            try:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # mmap is unavailable or the file is empty
+                self._data = self._file.read()
+        return self._data
+
+    def record(self, card_name, language=None):
+        """{"upright", "reversed", "description"} of a card, or None"""
+        language = language or self.language
+        key = (language, card_name)
+        record = self._decoded.get(key)
+        if record is None:
+            entry = self._records.get(language, {}).get(card_name)
+            if entry is None:
+                if language != DEFAULT_LANGUAGE:
+                    return self.record(card_name, DEFAULT_LANGUAGE)
+                return None
+            offset, length = entry
+            record = json.loads(bytes(self._buffer()[offset:offset + length]).decode('utf-8'))
+            self._decoded[key] = record
+        return record
+
+    def meaning(self, card_name, orientation, language=None):
+        """Keywords of a card in an orientation ("Upright"/"Reversed"), or None"""
+        record = self.record(card_name, language)
+        return record.get(orientation.lower()) if record else None
+
+    def __getitem__(self, card_name):
+        record = self.record(card_name)
+        if record is None:
+            raise KeyError(card_name)
+        return record
+
+    def __iter__(self):
+        return iter(self._records.get(DEFAULT_LANGUAGE, {}))
+
+    def __len__(self):
+        return len(self._records.get(DEFAULT_LANGUAGE, {}))
+
+    def close(self):
+        """Unmap the data file; it is mapped again on the next lookup"""
+        if self._file is None:
+            return
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+        self._data = self._file = None
+
+
+# Card meanings database. Its files are found next to this module rather
+# than in the working directory, so command-line tools can run from anywhere.
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+CARD_MEANINGS = MeaningsDatabase.load_or_build(os.path.join(_ROOT, MEANINGS_DIR), os.path.join(_ROOT, DATA_FILE),
+                                               os.path.join(_ROOT, INDEX_FILE))
@@ -0,0 +1,745 @@
+import json
+import logging
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+from urllib.parse import quote
+
+import tracing
+from card_codec import compact_reading, decode_cards, expand_reading
+from search_index import SearchIndex
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+HISTORY_FILE = "tarot_history.json"
+MAX_ENTRIES = {"readings": 50, "journal": 100}
+# History files are read by the app, not people: no indentation or spaces
+COMPACT_JSON = {"separators": (",", ":")}
+
+
+def empty_history():
+    return {"readings": [], "journal": []}
+
+
+def add_entry(history, kind, entry):
+    """Insert an entry most recent first, keeping only the newest MAX_ENTRIES"""
+    entries = history[kind]
+    entries.insert(0, entry)
+    del entries[MAX_ENTRIES[kind]:]
+
+
+def compact_history(history):
+    """Convert legacy readings to the card-code form in place; returns how many changed"""
+    readings = history["readings"]
+    converted = 0
+    for i, reading in enumerate(readings):
+        if "codes" not in reading:
+            readings[i] = compact_reading(reading)
+            converted += readings[i] is not reading
+    return converted
+
+
+def atomic_write_json(path, data, **kwargs):
+    """Write JSON to a temp file and rename it over `path`"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_json(path, read_only=False):
+    """Load a JSON file, moving it aside instead of silently dropping it when corrupt.
+
+    Read-only callers must not touch the file, so for them a corrupt file
+    raises ValueError instead.
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        if read_only:
+            raise ValueError(f"{path} is unreadable ({e})") from e
+        Logger.error(f"History: {path} is unreadable ({e}), keeping it as {path}.corrupt")
+        try:
+            os.replace(path, f"{path}.corrupt")
+        except OSError:
+            pass
+        return None
+
+
+def _last_log_seq(path):
+    """Seq of the last complete record of an append log (reading only its tail), or None"""
+    try:
+        with open(path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            window = 4096
+            while True:
+                f.seek(max(0, size - window))
+                tail = f.read()
+                lines = tail[:tail.rfind(b'\n') + 1].splitlines()
+                if window < size:
+                    # The first line of the window may start mid-record
+                    lines = lines[1:]
+                for line in reversed(lines):
+                    try:
+                        return json.loads(line)["seq"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                if window >= size:
+                    return None
+                window *= 4
+    except FileNotFoundError:
+        return None
+
+
+class MemoryHistoryStore:
+    """Base for stores that keep the whole (capped) history in memory"""
+    max_entries = MAX_ENTRIES
+
+    def __init__(self, history_file=HISTORY_FILE, read_only=False):
+        self.history_file = history_file
+        # Read-only stores never write their files, not even to repair them
+        self.read_only = read_only
+        self.history = empty_history()
+        # Entries are added on the UI thread and flushed from a background writer
+        self._lock = threading.RLock()
+
+    def add(self, kind, entry):
+        with self._lock:
+            add_entry(self.history, kind, entry)
+            self._append(kind, entry)
+
+    def _append(self, kind, entry):
+        pass
+
+    def entries(self, kind, offset=0, limit=None):
+        """Entries of one kind, most recent first"""
+        end = None if limit is None else offset + limit
+        with self._lock:
+            page = self.history[kind][offset:end]
+        if kind == "readings":
+            return [expand_reading(reading) for reading in page]
+        return page
+
+    def count(self, kind):
+        return len(self.history[kind])
+
+    def has_reading_on(self, day, spread):
+        return any(r["date"].startswith(day) and r["spread"] == spread for r in self.history["readings"])
+
+    def close(self):
+        pass
+
+
+class JsonHistoryStore(MemoryHistoryStore):
+    """Legacy storage: the whole history is rewritten to one JSON file on every save.
+
+    Its state marker is the file's size and mtime.
+    """
+    def __init__(self, history_file=HISTORY_FILE, read_only=False):
+        super().__init__(history_file, read_only)
+        self._dirty = False
+
+    def _append(self, kind, entry):
+        self._dirty = True
+
+    def state(self):
+        """Marker of the entries added so far; None while some are not written yet"""
+        with self._lock:
+            return None if self._dirty else self.stored_state()
+
+    def stored_state(self):
+        """Marker of the history on disk, without reading it"""
+        try:
+            st = os.stat(self.history_file)
+        except FileNotFoundError:
+            return [0, 0]
+        return [st.st_size, st.st_mtime_ns]
+
+    def load(self):
+        history = _read_json(self.history_file, self.read_only) or {}
+        self.history = {"readings": history.get("readings", []), "journal": history.get("journal", [])}
+        # Written back in the new format by the next flush
+        compact_history(self.history)
+
+    def flush(self):
+        with self._lock:
+            snapshot = {"readings": list(self.history["readings"]), "journal": list(self.history["journal"])}
+            dirty, self._dirty = self._dirty, False
+        try:
+            atomic_write_json(self.history_file, snapshot, **COMPACT_JSON)
+        except OSError:
+            with self._lock:
+                self._dirty = self._dirty or dirty
+            raise
+
+
+class AppendLogHistoryStore(MemoryHistoryStore):
+    """Snapshot file plus an append-only JSON-lines log of newer entries.
+
+    Each new reading or journal entry is appended to the log as one line, so
+    a save costs O(1) I/O whatever the history size. Every `compact_every`
+    entries the log is rotated and folded into a fresh snapshot on a
+    background thread. The snapshot uses the legacy ``tarot_history.json``
+    layout (plus a ``log_seq`` marker), so existing history files are picked
+    up as the initial snapshot.
+
+    Its state marker is the seq of the newest record.
+    """
+    # The snapshot is written with log_seq as its last key
+    SNAPSHOT_SEQ = re.compile(rb'"log_seq":\s*(\d+)\s*}\s*$')
+
+    def __init__(self, history_file=HISTORY_FILE, compact_every=200, read_only=False):
+        super().__init__(history_file, read_only)
+        self.snapshot_file = history_file
+        self.log_file = f"{os.path.splitext(history_file)[0]}.log"
+        self.compact_every = compact_every
+        self._seq = 0
+        self._pending = []
+        self._log_entries = 0
+        self._compaction = None
+        self._convert = False
+
+    def _rotated_logs(self):
+        """Rotated logs awaiting compaction, oldest first"""
+        directory = os.path.dirname(self.log_file) or '.'
+        prefix = f"{os.path.basename(self.log_file)}."
+        rotated = []
+        for filename in os.listdir(directory):
+            suffix = filename[len(prefix):]
+            if filename.startswith(prefix) and suffix.isdigit():
+                rotated.append((int(suffix), os.path.join(directory, filename)))
+        return [path for _, path in sorted(rotated)]
+
+    def _replay(self, path, history, snapshot_seq):
+        """Apply the log records newer than the snapshot, dropping a torn last line"""
+        with open(path, 'rb' if self.read_only else 'rb+') as f:
+            data = f.read()
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                Logger.warning(f"History: Dropping incomplete record at the end of {path}")
+                if not self.read_only:
+                    f.truncate(complete)
+        replayed = 0
+        for line in data[:complete].splitlines():
+            try:
+                record = json.loads(line)
+                seq, kind, entry = record["seq"], record["kind"], record["entry"]
+            except (ValueError, KeyError, TypeError):
+                Logger.warning(f"History: Skipping corrupt record in {path}")
+                continue
+            self._seq = max(self._seq, seq)
+            if seq > snapshot_seq:
+                add_entry(history, kind, entry)
+            replayed += 1
+        return replayed
+
+    def load(self):
+        snapshot = _read_json(self.snapshot_file, self.read_only) or {}
+        history = {"readings": snapshot.get("readings", []), "journal": snapshot.get("journal", [])}
+        snapshot_seq = self._seq = snapshot.get("log_seq", 0)
+        for path in self._rotated_logs():
+            self._replay(path, history, snapshot_seq)
+        if os.path.exists(self.log_file):
+            self._log_entries = self._replay(self.log_file, history, snapshot_seq)
+        self.history = history
+        # A snapshot with legacy readings is rewritten by the next flush
+        self._convert = compact_history(history) > 0
+
+    def state(self):
+        """Marker of the entries added so far"""
+        return self._seq
+
+    def stored_state(self):
+        """Marker of the history on disk, from the tails of the logs and snapshot"""
+        for path in [self.log_file] + self._rotated_logs()[::-1]:
+            seq = _last_log_seq(path)
+            if seq is not None:
+                return seq
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                f.seek(max(0, f.seek(0, os.SEEK_END) - 64))
+                match = self.SNAPSHOT_SEQ.search(f.read())
+        except FileNotFoundError:
+            return 0
+        return int(match.group(1)) if match else 0
+
+    def _append(self, kind, entry):
+        self._seq += 1
+        self._pending.append({"seq": self._seq, "kind": kind, "entry": entry})
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            try:
+                with open(self.log_file, 'a') as f:
+                    f.write("".join(json.dumps(record, **COMPACT_JSON) + "\n" for record in pending))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+            self._log_entries += len(pending)
+        if self._log_entries >= self.compact_every or self._convert:
+            self.compact()
+
+    def compact(self):
+        """Rotate the log and fold it into a new snapshot in the background"""
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        if os.path.exists(self.log_file):
+            os.replace(self.log_file, f"{self.log_file}.{self._seq}")
+        self._log_entries = 0
+        self._convert = False
+        with self._lock:
+            snapshot = {
+                "readings": list(self.history["readings"]),
+                "journal": list(self.history["journal"]),
+                "log_seq": self._seq
+            }
+        self._compaction = threading.Thread(target=self._write_snapshot, args=(snapshot,),
+                                            name="HistoryCompaction", daemon=True)
+        self._compaction.start()
+
+    def _write_snapshot(self, snapshot):
+        try:
+            atomic_write_json(self.snapshot_file, snapshot, **COMPACT_JSON)
+            for path in self._rotated_logs():
+                if int(path.rsplit('.', 1)[1]) <= snapshot["log_seq"]:
+                    os.remove(path)
+        except Exception as e:
+            Logger.error(f"History: Compaction failed, keeping the log: {e}")
+
+
+class SqliteHistoryStore:
+    """SQLite storage: readings and journal entries in indexed tables, without caps.
+
+    The database runs in WAL mode and is read page by page, so neither
+    startup nor any screen depends on how large the history has grown. On
+    first open the legacy ``tarot_history.json`` (and its append log, if
+    any) is imported.
+
+    Cards are stored as a BLOB of one-byte card codes. Schema versions are
+    tracked in ``PRAGMA user_version``; version 1 databases, which kept card
+    and orientation names as JSON text, are converted on open.
+
+    Its state marker is the number of readings and journal entries.
+    """
+    SCHEMA_VERSION = 2
+    max_entries = None
+    READINGS_TABLE = """
+        CREATE TABLE IF NOT EXISTS readings (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            spread TEXT NOT NULL,
+            codes BLOB NOT NULL,
+            notes TEXT NOT NULL DEFAULT ''
+        );
+    """
+    SCHEMA = READINGS_TABLE + """
+        CREATE INDEX IF NOT EXISTS readings_date ON readings (date);
+        CREATE INDEX IF NOT EXISTS readings_spread_date ON readings (spread, date);
+        CREATE TABLE IF NOT EXISTS journal (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS journal_date ON journal (date);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, history_file=HISTORY_FILE, read_only=False):
+        self.history_file = history_file
+        self.db_file = f"{os.path.splitext(history_file)[0]}.db"
+        self.read_only = read_only
+        self._conn = None
+        self._pending = []
+        # The connection is shared with background writers
+        self._lock = threading.RLock()
+
+    def load(self):
+        import sqlite3
+        if self.read_only:
+            self._load_read_only(sqlite3)
+            return
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 2 and "cards" in self._columns("readings"):
+            self._migrate_card_names()
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        imported = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if not imported and os.path.exists(self.history_file):
+            self.import_legacy_json(self.history_file)
+
+    def _load_read_only(self, sqlite3):
+        """Open an existing database as it is: nothing is created, migrated or imported"""
+        if not os.path.exists(self.db_file):
+            raise FileNotFoundError(f"No history database {self.db_file}")
+        self._conn = self._connect_read_only(sqlite3)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            raise ValueError(f"{self.db_file} has an older schema; open it in the app once to convert it")
+
+    def _connect_read_only(self, sqlite3):
+        uri = f"file:{quote(os.path.abspath(self.db_file))}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    def state(self):
+        """Marker of the entries added so far"""
+        with self._lock:
+            return [self.count("readings"), self.count("journal")]
+
+    def stored_state(self):
+        """Marker of the history on disk, read without opening the store"""
+        if not os.path.exists(self.db_file):
+            return [0, 0]
+        import sqlite3
+        try:
+            conn = self._connect_read_only(sqlite3)
+        except sqlite3.Error:
+            return None
+        try:
+            return [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("readings", "journal")]
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+
+    def _columns(self, table):
+        return [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+
+    def _migrate_card_names(self):
+        """Rebuild a version 1 readings table with card codes instead of names"""
+        rows = self._conn.execute("SELECT id, date, spread, cards, orientations, notes FROM readings").fetchall()
+        converted = []
+        for row_id, date_str, spread, cards, orientations, notes in rows:
+            reading = compact_reading({"date": date_str, "spread": spread, "cards": json.loads(cards),
+                                       "orientations": json.loads(orientations)})
+            if "codes" not in reading:
+                Logger.warning(f"History: Dropping reading {row_id} with cards outside the deck")
+                continue
+            converted.append((row_id, date_str, spread, bytes.fromhex(reading["codes"]), notes))
+        with self._conn:
+            # DDL joins the transaction only inside an explicit BEGIN
+            self._conn.execute("BEGIN")
+            self._conn.execute("ALTER TABLE readings RENAME TO readings_v1")
+            self._conn.execute(self.READINGS_TABLE)
+            self._conn.executemany("INSERT INTO readings (id, date, spread, codes, notes) VALUES (?, ?, ?, ?, ?)",
+                                   converted)
+            self._conn.execute("DROP TABLE readings_v1")
+        # Return the old table's pages to the filesystem
+        self._conn.execute("VACUUM")
+        Logger.info(f"History: Converted {len(converted)} readings in {self.db_file} to card codes")
+
+    def import_legacy_json(self, path):
+        """Import readings and journal entries from a legacy JSON history file"""
+        legacy = AppendLogHistoryStore(path)
+        legacy.load()
+        with self._lock, self._conn:
+            # Oldest first, so row ids follow the dates
+            self._insert("readings", reversed(legacy.history["readings"]))
+            self._insert("journal", reversed(legacy.history["journal"]))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)", (path,))
+        Logger.info(f"History: Imported {len(legacy.history['readings'])} readings and "
+                    f"{len(legacy.history['journal'])} journal entries from {path}")
+
+    def _insert(self, kind, entries):
+        if kind == "readings":
+            rows = []
+            for reading in map(compact_reading, entries):
+                if "codes" not in reading:
+                    Logger.warning(f"History: Skipping reading from {reading['date']} with cards outside the deck")
+                    continue
+                rows.append((reading["date"], reading["spread"], bytes.fromhex(reading["codes"]), reading.get("notes", "")))
+            self._conn.executemany("INSERT INTO readings (date, spread, codes, notes) VALUES (?, ?, ?, ?)", rows)
+        else:
+            self._conn.executemany("INSERT INTO journal (date, text) VALUES (?, ?)",
+                                   [(e["date"], e["text"]) for e in entries])
+
+    def add(self, kind, entry):
+        with self._lock:
+            self._pending.append((kind, entry))
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            with self._conn:
+                for kind in ("readings", "journal"):
+                    self._insert(kind, [entry for k, entry in self._pending if k == kind])
+            self._pending = []
+
+    def _pending_entries(self, kind):
+        """Entries added but not yet flushed, most recent first"""
+        return [entry for k, entry in reversed(self._pending) if k == kind]
+
+    def entries(self, kind, offset=0, limit=None):
+        """Entries of one kind, most recent first, including unflushed ones"""
+        if kind == "readings":
+            query = "SELECT date, spread, codes, notes FROM readings"
+        else:
+            query = "SELECT date, text FROM journal"
+        query += " ORDER BY date DESC, id DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            pending = self._pending_entries(kind)
+            page = pending[offset:None if limit is None else offset + limit]
+            db_limit = -1 if limit is None else limit - len(page)
+            rows = []
+            if db_limit:
+                rows = self._conn.execute(query, (db_limit, max(0, offset - len(pending)))).fetchall()
+        if kind == "readings":
+            readings = [expand_reading(reading) for reading in page]
+            for date_str, spread, codes, notes in rows:
+                cards, orientations = decode_cards(codes)
+                readings.append({"date": date_str, "spread": spread, "cards": cards,
+                                 "orientations": orientations, "notes": notes})
+            return readings
+        return page + [{"date": date_str, "text": text} for date_str, text in rows]
+
+    def count(self, kind):
+        table = "readings" if kind == "readings" else "journal"
+        with self._lock:
+            stored = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            return stored + len(self._pending_entries(kind))
+
+    def has_reading_on(self, day, spread):
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        with self._lock:
+            if any(r["date"].startswith(day) and r["spread"] == spread
+                   for r in self._pending_entries("readings")):
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM readings WHERE spread = ? AND date >= ? AND date < ? LIMIT 1",
+                (spread, day, next_day)).fetchone()
+        return row is not None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+STORAGE_BACKENDS = {
+    "json": JsonHistoryStore,
+    "log": AppendLogHistoryStore,
+    "sqlite": SqliteHistoryStore,
+}
+
+
+class HistorySummary:
+    """Small sidecar index of the history, maintained incrementally.
+
+    It holds what the main menu needs (last date per spread, counts and the
+    most recent readings), so startup never parses the full history. It also
+    keeps the store's state marker from when it was saved: a summary whose
+    marker no longer matches the store (a crash between the two saves, or a
+    history file replaced behind the app's back) is rebuilt.
+    """
+    VERSION = 3
+    RECENT = 10
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.last_dates = data.get("last_dates", {})
+        self.spread_counts = data.get("spread_counts", {})
+        self.reading_count = data.get("reading_count", 0)
+        self.journal_count = data.get("journal_count", 0)
+        self.recent = data.get("recent", [])
+        self.store_state = data.get("store_state")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        data = _read_json(path)
+        if not data or data.get("version") != cls.VERSION:
+            return None
+        return cls(data)
+
+    @classmethod
+    def from_store(cls, store):
+        """Rebuild the summary from whatever the store still holds"""
+        summary = cls()
+        summary.journal_count = store.count("journal")
+        # Oldest first, so the newest readings end up in `recent`
+        for reading in reversed(store.entries("readings")):
+            summary.record("readings", reading)
+        summary.store_state = store.state()
+        return summary
+
+    def record(self, kind, entry):
+        with self._lock:
+            if kind == "journal":
+                self.journal_count += 1
+                return
+            spread = entry["spread"]
+            self.reading_count += 1
+            self.spread_counts[spread] = self.spread_counts.get(spread, 0) + 1
+            self.last_dates[spread] = max(self.last_dates.get(spread, ""), entry["date"][:10])
+            self.recent.insert(0, entry)
+            del self.recent[self.RECENT:]
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "version": self.VERSION,
+                "last_dates": dict(self.last_dates),
+                "spread_counts": dict(self.spread_counts),
+                "reading_count": self.reading_count,
+                "journal_count": self.journal_count,
+                "recent": list(self.recent),
+                "store_state": self.store_state
+            }
+
+    def save(self, path, data=None):
+        atomic_write_json(path, data or self.to_dict(), **COMPACT_JSON)
+
+
+class ReadingHistoryManager:
+    """Manages reading history and journal entries
+
+    Only the summary sidecar is read at construction; the full history is
+    loaded on first access (opening History or Journal, or the first save)
+    and the search index on the first search.
+    With a `persistence` worker, saves are handed to it and written off the
+    calling thread; otherwise every add writes synchronously.
+    """
+    def __init__(self, storage="log", history_file=HISTORY_FILE, persistence=None):
+        self.history_file = history_file
+        self.summary_file = f"{os.path.splitext(history_file)[0]}_summary.json"
+        self.search_file = f"{os.path.splitext(history_file)[0]}_search.json"
+        self.persistence = persistence
+        self._store = STORAGE_BACKENDS[storage](history_file)
+        self._loaded = False
+        self._deferred = []
+        self._load_lock = threading.RLock()
+        self.summary = HistorySummary.load(self.summary_file)
+        if self.summary is not None and self.summary.store_state != self._store.stored_state():
+            Logger.info("History: History summary does not match the stored history")
+            self.summary = None
+        if self.summary is None:
+            Logger.info("History: Rebuilding history summary")
+            self.summary = HistorySummary.from_store(self.store)
+            self.summary.save(self.summary_file)
+        self.search_index = SearchIndex(self.search_file, self._all_entries, self._store.max_entries)
+
+    def _all_entries(self, kind):
+        """Every stored entry of a kind, oldest first, as the search index expects"""
+        return reversed(self.store.entries(kind))
+
+    @property
+    def store(self):
+        """The storage backend, loading the full history on first use"""
+        with self._load_lock:
+            if not self._loaded:
+                self.load_history()
+                self._loaded = True
+                for kind, entry in self._deferred:
+                    self._store.add(kind, entry)
+                self._deferred = []
+        return self._store
+
+    @property
+    def history(self):
+        """The full history dict, with readings decoded for display"""
+        store = self.store
+        return {"readings": store.entries("readings"), "journal": store.entries("journal")}
+
+    @tracing.traced("history.load", "history")
+    def load_history(self):
+        try:
+            self._store.load()
+        except Exception as e:
+            Logger.error(f"Failed to load history: {e}")
+
+    @tracing.traced("history.save", "history")
+    def save_history(self):
+        try:
+            store = self.store
+            store.flush()
+            # Entries are recorded in the summary and the store under the same
+            # lock, so the marker describes exactly the summarized entries
+            with self._load_lock:
+                self.summary.store_state = store.state()
+                summary = self.summary.to_dict()
+            self.summary.save(self.summary_file, summary)
+            self.search_index.flush()
+        except Exception as e:
+            Logger.error(f"Failed to save history: {e}")
+
+    def _add(self, kind, entry):
+        self.search_index.add(kind, entry)
+        with self._load_lock:
+            self.summary.record(kind, entry)
+            if self._loaded:
+                self._store.add(kind, entry)
+            else:
+                self._deferred.append((kind, entry))
+        if self.persistence is not None:
+            self.persistence.mark_dirty("history", self.save_history)
+        else:
+            self.save_history()
+
+    def add_reading(self, spread_name, cards, orientations, notes=""):
+        self._add("readings", compact_reading({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "spread": spread_name,
+            "cards": cards,
+            "orientations": orientations,
+            "notes": notes
+        }))
+
+    def add_journal_entry(self, entry_text):
+        self._add("journal", {
+            "date": datetime.now().isoformat(),
+            "text": entry_text
+        })
+
+    def get_readings(self, offset=0, limit=None):
+        """A page of readings, most recent first"""
+        with tracing.span("history.page", "history", kind="readings", offset=offset):
+            return self.store.entries("readings", offset, limit)
+
+    def get_journal(self, offset=0, limit=None):
+        """A page of journal entries, most recent first"""
+        with tracing.span("history.page", "history", kind="journal", offset=offset):
+            return self.store.entries("journal", offset, limit)
+
+    def search(self, query, kind=None, offset=0, limit=None):
+        """A page of the entries matching `query` (all words, as prefixes), most recent first"""
+        with tracing.span("history.search", "history", query=query, kind=kind, offset=offset):
+            return self.search_index.search(query, kind, offset, limit)
+
+    def count_readings(self):
+        return self.store.count("readings")
+
+    def count_journal(self):
+        return self.store.count("journal")
+
+    def has_reading_on(self, day, spread):
+        """Whether a reading of `spread` was made on the ISO date `day`"""
+        last_date = self.summary.last_dates.get(spread, "")
+        if day >= last_date:
+            # Answered from the summary alone, which covers the menu's "today" check
+            return day == last_date
+        return self.store.has_reading_on(day, spread)
+
+    def close(self):
+        if self._loaded or self._deferred:
+            self.save_history()
+            self._store.close()
@@ -0,0 +1,160 @@
+"""Virtualized list views of the History and Journal screens.
+
+Kept out of main.py so the RecycleView machinery is imported only when one
+of these screens is first opened, not before the main menu's first frame.
+"""
+from datetime import datetime
+
+from kivy.app import App
+from kivy.graphics import Color, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+from thumbnails import CardThumbnail
+
+# Thumbnails per history row; larger spreads show their first cards
+ROW_THUMBNAILS = 5
+
+
+class PagedRecycleView(RecycleView):
+    """Virtualized list that pulls its data page by page as the user scrolls.
+
+    `fetch_page(offset, limit)` returns the next rows; only the rows on
+    screen are ever turned into widgets.
+    """
+    def __init__(self, fetch_page, viewclass, row_height, spacing=5, page_size=30, **kwargs):
+        super().__init__(**kwargs)
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.exhausted = False
+        self._anchor = None
+
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=spacing,
+            default_size=(None, row_height),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        layout.bind(height=self._on_content_height)
+        self.add_widget(layout)
+        # The view class lives on the layout manager, so set it once that exists
+        self.viewclass = viewclass
+        self.bind(scroll_y=self._on_scroll)
+
+    def reset(self):
+        """Drop loaded rows and fetch the first page again"""
+        self.exhausted = False
+        self.data = []
+        self.scroll_y = 1
+        self.load_next_page()
+
+    def load_next_page(self):
+        if self.exhausted:
+            return
+        page = self.fetch_page(len(self.data), self.page_size)
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if page:
+            content_height = self.layout_manager.height
+            if self.data and content_height > self.height:
+                # Distance scrolled from the top, restored once the page is laid out
+                self._anchor = (1 - self.scroll_y) * (content_height - self.height)
+            self.data.extend(page)
+
+    def _on_scroll(self, instance, scroll_y):
+        # scroll_y is 0 at the bottom of the list
+        if scroll_y < 0.2 and self._anchor is None:
+            self.load_next_page()
+
+    def _on_content_height(self, layout, height):
+        if self._anchor is not None:
+            anchor, self._anchor = self._anchor, None
+            self.scroll_y = max(0, 1 - anchor / max(1, height - self.height))
+
+
+class HistoryRow(RecycleDataViewBehavior, BoxLayout):
+    """Reading history row with thumbnails of the first cards.
+
+    The date is formatted only when the row is shown, and the thumbnail
+    widgets are created once and pointed at other cards as rows recycle.
+    """
+    def __init__(self, **kwargs):
+        kwargs.setdefault('spacing', 5)
+        super().__init__(**kwargs)
+        self.label = Label(
+            font_size='14sp',
+            color=(0.9, 0.9, 0.9, 1),
+            halign='left',
+            size_hint_x=0.45
+        )
+        self.label.bind(size=self.label.setter('text_size'))
+        self.add_widget(self.label)
+
+        self.strip = BoxLayout(spacing=3, size_hint_x=0.55)
+        self.thumbnails = [CardThumbnail() for _ in range(ROW_THUMBNAILS)]
+        for thumbnail in self.thumbnails:
+            self.strip.add_widget(thumbnail)
+        self.add_widget(self.strip)
+
+    def refresh_view_attrs(self, rv, index, data):
+        date_str = datetime.fromisoformat(data["date"]).strftime("%B %d, %Y at %I:%M %p")
+        self.label.text = f"🔮 {data['spread']}\n📅 {date_str}\n🃏 {len(data['cards'])} cards drawn"
+
+        cache = App.get_running_app().thumbnails
+        shown = list(zip(data["cards"], data["orientations"]))[:ROW_THUMBNAILS]
+        # Always ROW_THUMBNAILS slots, so thumbnails keep their size in short readings
+        for thumbnail, card in zip(self.thumbnails, shown + [None] * (ROW_THUMBNAILS - len(shown))):
+            if card is None:
+                thumbnail.clear()
+            else:
+                thumbnail.show(cache, *card)
+
+
+class JournalRow(RecycleDataViewBehavior, BoxLayout):
+    """Reusable journal entry row with a persistent background"""
+    def __init__(self, **kwargs):
+        kwargs.setdefault('orientation', 'vertical')
+        kwargs.setdefault('padding', 15)
+        kwargs.setdefault('spacing', 5)
+        super().__init__(**kwargs)
+
+        # Mystical background, created once and only moved afterwards
+        with self.canvas.before:
+            Color(0.15, 0.1, 0.25, 0.5)
+            self.background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_background, size=self._update_background)
+
+        self.date_label = Label(
+            font_size='14sp',
+            bold=True,
+            color=(1, 1, 0.8, 1),
+            size_hint_y=0.3,
+            halign='left'
+        )
+        self.date_label.bind(size=self.date_label.setter('text_size'))
+
+        self.text_label = Label(
+            font_size='13sp',
+            color=(0.9, 0.9, 0.9, 1),
+            size_hint_y=0.7,
+            halign='left',
+            valign='top'
+        )
+        self.text_label.bind(size=self.text_label.setter('text_size'))
+
+        self.add_widget(self.date_label)
+        self.add_widget(self.text_label)
+
+    def _update_background(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+
+    def refresh_view_attrs(self, rv, index, data):
+        date_str = datetime.fromisoformat(data["date"]).strftime("%B %d, %Y")
+        self.date_label.text = f"✨ {date_str}"
+        self.text_label.text = data["text"][:150] + ("..." if len(data["text"]) > 150 else "")
@@ -1,102 +1,31 @@
 import random
 import json
 import os
-from datetime import datetime, date
+from datetime import date
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.core.window import Window
 from kivy.uix.button import Button
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.popup import Popup
-from kivy.uix.textinput import TextInput
-from kivy.uix.slider import Slider
-from kivy.uix.switch import Switch
 from kivy.logger import Logger
 from kivy.graphics import PushMatrix, PopMatrix, Rotate, Color, Rectangle
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.animation import Animation
 from kivy.clock import Clock
-from kivy.core.audio import SoundLoader
+from audio import SoundPool
+from card_assets import MANIFEST_FILE, CardAssetManifest
+from card_codec import share_code
+from history import HISTORY_FILE, ReadingHistoryManager, atomic_write_json
+from persistence import WriteBehindWorker
+from tarot_engine import SPREADS, DrawEngine, spread_info, tarot_cards
+from texture_cache import TextureCache, TexturePrefetcher, default_texture_budget
+import tracing
 
 # Force portrait orientation and set mystical dark background
 Window.clearcolor = (0.05, 0.05, 0.15, 1)  # Deep purple-black
 
-# Enhanced card definitions with meanings
-suits = ["Wands", "Cups", "Swords", "Pentacles"]
-ranks = ["Ace", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine", "Ten", "Page", "Knight", "Queen", "King"]
-major_arcana = ["The Fool", "The Magician", "The High Priestess", "The Empress", "The Emperor", "The Hierophant", "The Lovers",
-                "The Chariot", "Strength", "The Hermit", "Wheel of Fortune", "Justice", "The Hanged Man", "Death",
-                "Temperance", "The Devil", "The Tower", "The Star", "The Moon", "The Sun", "Judgement", "The World"]
-
-# Card meanings database
-CARD_MEANINGS = {
-    # Major Arcana
-    "The Fool": {
-        "upright": "New beginnings, innocence, spontaneity, free spirit",
-        "reversed": "Recklessness, taken advantage of, inconsideration"
-    },
-    "The Magician": {
-        "upright": "Manifestation, resourcefulness, power, inspired action",
-        "reversed": "Manipulation, poor planning, untapped talents"
-    },
-    "Death": {
-        "upright": "Endings, transformation, transition, new beginnings",
-        "reversed": "Resistance to change, personal transformation, inner purging"
-    },
-    "The Star": {
-        "upright": "Hope, faith, purpose, renewal, spirituality",
-        "reversed": "Lack of faith, despair, self-trust, disconnection"
-    },
-    # Add more as needed - this is just a sample
-}
-
-# Spread definitions
-SPREADS = {
-    "Daily Guidance": {
-        "cards": 1,
-        "positions": ["Your guidance for today"],
-        "description": "A single card to guide your day"
-    },
-    "Past-Present-Future": {
-        "cards": 3,
-        "positions": ["Past influences", "Present situation", "Future potential"],
-        "description": "Classic three-card timeline reading"
-    },
-    "Love & Relationships": {
-        "cards": 5,
-        "positions": ["You in love", "Your partner", "The relationship", "Challenges", "Outcome"],
-        "description": "Deep dive into your romantic life"
-    },
-    "Career Path": {
-        "cards": 4,
-        "positions": ["Current career", "Hidden talents", "Obstacles", "Next steps"],
-        "description": "Navigate your professional journey"
-    },
-    "Celtic Cross": {
-        "cards": 10,
-        "positions": ["Present", "Challenge", "Distant Past", "Recent Past", "Possible Outcome", 
-                     "Near Future", "Your Approach", "External Influences", "Hopes & Fears", "Final Outcome"],
-        "description": "The most comprehensive tarot spread"
-    },
-    "Chakra Balance": {
-        "cards": 7,
-        "positions": ["Root Chakra", "Sacral Chakra", "Solar Plexus", "Heart Chakra", 
-                     "Throat Chakra", "Third Eye", "Crown Chakra"],
-        "description": "Align your spiritual energy centers"
-    }
-}
-
-# Create full deck
-tarot_cards = []
-for suit in suits:
-    for rank in ranks:
-        tarot_cards.append(f"{rank} of {suit}")
-tarot_cards.extend(major_arcana)
-
 
 class AnimatedButton(ButtonBehavior, FloatLayout):
     """Animated button with glow effects"""
@@ -117,49 +46,40 @@ class TarotCardImage(AnimatedButton, Image):
     """Enhanced tarot card with animations and sound"""
     def __init__(self, card_name, orientation, app_instance, **kwargs):
         super().__init__(**kwargs)
-        self.card_name = card_name
-        self.orientation = orientation
-        self.is_revealed = False
         self.app_instance = app_instance
-        
-        # Apply rotation immediately if reversed
-        if orientation == "Reversed":
-            self._apply_rotation()
-    
-    def _apply_rotation(self):
-        """Apply 180-degree rotation with smooth animation"""
-        self.canvas.before.clear()
-        self.canvas.after.clear()
-        
+
+        # Rotation instructions are created once; reversed cards only
+        # change the angle, and layout changes only move the origin.
         with self.canvas.before:
             PushMatrix()
-            Rotate(angle=180, origin=(self.center_x, self.center_y))
-            
+            self.rotation = Rotate(angle=0, origin=self.center)
         with self.canvas.after:
             PopMatrix()
-            
         self.bind(pos=self._update_rotation, size=self._update_rotation)
-    
+
+        self.set_card(card_name, orientation)
+
+    def set_card(self, card_name, orientation, source=None):
+        """Show another face-down card, reusing this widget"""
+        self.card_name = card_name
+        self.orientation = orientation
+        self.is_revealed = False
+        self.rotation.angle = 180 if orientation == "Reversed" else 0
+        if source is not None:
+            if source == self.source:
+                # A revealed face may have been assigned as a texture directly
+                self.texture_update()
+            else:
+                self.source = source
+
     def _update_rotation(self, *args):
-        if self.orientation == "Reversed":
-            self.canvas.before.clear()
-            self.canvas.after.clear()
-            
-            with self.canvas.before:
-                PushMatrix()
-                Rotate(angle=180, origin=(self.center_x, self.center_y))
-                
-            with self.canvas.after:
-                PopMatrix()
+        self.rotation.origin = self.center
 
     def on_press(self):
         super().on_press()
         # Play card flip sound if enabled
-        if self.app_instance.sound_enabled and hasattr(self.app_instance, 'flip_sound'):
-            try:
-                self.app_instance.flip_sound.play()
-            except:
-                pass
+        if self.app_instance.sound_enabled:
+            self.app_instance.sounds.play("card_flip")
 
 
 class MysticalButton(Button):
@@ -174,9 +94,11 @@ class MysticalButton(Button):
         super().__init__(text=text, **kwargs)
         
         # Add mystical border effect
+        # Button.border is the background image's 9-patch property, so the
+        # frame rectangle needs a name of its own.
         with self.canvas.before:
             Color(0.4, 0.2, 0.6, 0.8)
-            self.border = Rectangle(pos=self.pos, size=self.size)
+            self.border_rect = Rectangle(pos=self.pos, size=self.size)
         
         with self.canvas.after:
             Color(0.15, 0.05, 0.25, 0.9)
@@ -188,106 +110,130 @@ class MysticalButton(Button):
         self.bind(pos=self._update_graphics, size=self._update_graphics)
     
     def _update_graphics(self, *args):
-        self.border.pos = self.pos
-        self.border.size = self.size
+        self.border_rect.pos = self.pos
+        self.border_rect.size = self.size
         self.inner_rect.pos = (self.x + 2, self.y + 2)
         self.inner_rect.size = (self.width - 4, self.height - 4)
 
 
-class ReadingHistoryManager:
-    """Manages reading history and journal entries"""
-    def __init__(self):
-        self.history_file = "tarot_history.json"
-        self.load_history()
-    
-    def load_history(self):
-        try:
-            with open(self.history_file, 'r') as f:
-                self.history = json.load(f)
-        except:
-            self.history = {"readings": [], "journal": []}
-    
-    def save_history(self):
-        try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
-        except Exception as e:
-            Logger.error(f"Failed to save history: {e}")
-    
-    def add_reading(self, spread_name, cards, orientations, notes=""):
-        reading = {
-            "date": datetime.now().isoformat(),
-            "spread": spread_name,
-            "cards": cards,
-            "orientations": orientations,
-            "notes": notes
-        }
-        self.history["readings"].insert(0, reading)  # Most recent first
-        
-        # Keep only last 50 readings
-        if len(self.history["readings"]) > 50:
-            self.history["readings"] = self.history["readings"][:50]
-        
-        self.save_history()
-    
-    def add_journal_entry(self, entry_text):
-        entry = {
-            "date": datetime.now().isoformat(),
-            "text": entry_text
-        }
-        self.history["journal"].insert(0, entry)
-        
-        # Keep only last 100 entries
-        if len(self.history["journal"]) > 100:
-            self.history["journal"] = self.history["journal"][:100]
-        
-        self.save_history()
+SETTINGS_FILE = "settings.json"
 
 
 class PictureTarotApp(App):
-    def __init__(self, **kwargs):
+    def __init__(self, storage_dir="", **kwargs):
         super().__init__(**kwargs)
         Logger.info("PictureTarotApp: Initializing enhanced app")
-        self.history_manager = ReadingHistoryManager()
+        # Settings, history and caches live here; the working directory by default
+        self.storage_dir = storage_dir
         self.sound_enabled = True
         self.animation_enabled = True
         self.daily_card_drawn = False
+        # None sizes the texture budget to the device
+        self.texture_budget_mb = None
+        self.history_storage = "log"
+        # None follows the system language, resolved when meanings are first shown
+        self.language = None
+        self.trace_enabled = False
         self.load_settings()
-        self.load_sounds()
+        if tracing.enable_from_env(self.storage_path(tracing.DEFAULT_TRACE_FILE)) or self.trace_enabled:
+            self.start_tracing()
+        self.texture_budget = (self.texture_budget_mb * 1024 * 1024 if self.texture_budget_mb
+                               else default_texture_budget())
+        # Cards fill roughly 65% of the screen height; a deck atlas is used
+        # only if all its pages fit in the texture budget
+        self.card_assets = CardAssetManifest.load_or_build(tarot_cards, atlas_height=int(Window.height * 0.65),
+                                                           max_atlas_bytes=self.texture_budget,
+                                                           manifest_file=self.storage_path(MANIFEST_FILE))
+        self.draw_engine = DrawEngine()
+        self.persistence = WriteBehindWorker()
+        self.history_manager = ReadingHistoryManager(self.history_storage, self.storage_path(HISTORY_FILE),
+                                                     persistence=self.persistence)
+        self.texture_cache = TextureCache(self.texture_budget)
+        self.texture_prefetcher = TexturePrefetcher(self.texture_cache)
+        self.sounds = SoundPool()
+        self._thumbnails = None
+
+    def storage_path(self, name):
+        return os.path.join(self.storage_dir, name)
+
+    @property
+    def thumbnails(self):
+        """On-disk card thumbnail cache, created when a screen first shows thumbnails"""
+        if self._thumbnails is None:
+            from thumbnails import THUMBNAIL_DIR, ThumbnailCache
+            self._thumbnails = ThumbnailCache(self.card_assets.base_path,
+                                              directory=self.storage_path(THUMBNAIL_DIR))
+        return self._thumbnails
+
+    @property
+    def card_meanings(self):
+        """The meanings database in the chosen language, opened on first use"""
+        from card_meanings import CARD_MEANINGS, default_language
+        if self.language is None:
+            self.language = default_language(CARD_MEANINGS.languages)
+        CARD_MEANINGS.language = self.language
+        return CARD_MEANINGS
 
     def load_settings(self):
         """Load user settings"""
         try:
-            with open("settings.json", 'r') as f:
+            with open(self.storage_path(SETTINGS_FILE), 'r') as f:
                 settings = json.load(f)
                 self.sound_enabled = settings.get("sound_enabled", True)
                 self.animation_enabled = settings.get("animation_enabled", True)
+                self.texture_budget_mb = settings.get("texture_budget_mb")
+                self.history_storage = settings.get("history_storage", "log")
+                self.language = settings.get("language", self.language)
+                self.trace_enabled = settings.get("trace_enabled", False)
         except:
             pass  # Use defaults
 
     def save_settings(self):
-        """Save user settings"""
+        """Save user settings in the background"""
+        settings = {
+            "sound_enabled": self.sound_enabled,
+            "animation_enabled": self.animation_enabled,
+            "texture_budget_mb": self.texture_budget_mb,
+            "history_storage": self.history_storage,
+            "language": self.language,
+            "trace_enabled": self.trace_enabled
+        }
+        self.persistence.mark_dirty("settings", lambda: self._write_settings(settings))
+
+    def _write_settings(self, settings):
         try:
-            settings = {
-                "sound_enabled": self.sound_enabled,
-                "animation_enabled": self.animation_enabled
-            }
-            with open("settings.json", 'w') as f:
-                json.dump(settings, f)
+            atomic_write_json(self.storage_path(SETTINGS_FILE), settings)
         except Exception as e:
             Logger.error(f"Failed to save settings: {e}")
 
-    def load_sounds(self):
-        """Load sound effects"""
-        try:
-            # Try to load sound files if they exist
-            sound_paths = ['sounds/card_flip.wav', 'sounds/flip.wav', 'card_flip.wav']
-            for path in sound_paths:
-                if os.path.exists(path):
-                    self.flip_sound = SoundLoader.load(path)
-                    break
-        except:
-            self.flip_sound = None
+    def on_pause(self):
+        """Persist pending writes before Android may kill the paused app"""
+        self.persistence.flush()
+        tracing.save()
+        return True
+
+    def on_start(self):
+        # Nothing on the main menu makes a sound, so load them after the first frame
+        Clock.schedule_once(lambda dt: self.sounds.load_async())
+
+    def on_stop(self):
+        self.persistence.stop()
+        self.sounds.stop()
+        self.history_manager.close()
+        tracing.disable()
+
+    def start_tracing(self):
+        """Trace hot paths, plus every frame's duration, until stop_tracing"""
+        tracing.enable(self.storage_path(tracing.DEFAULT_TRACE_FILE))
+        Clock.unschedule(self._trace_frame)
+        Clock.schedule_interval(self._trace_frame, 0)
+
+    def stop_tracing(self):
+        Clock.unschedule(self._trace_frame)
+        return tracing.disable()
+
+    def _trace_frame(self, dt):
+        tracing.counter("frame", ms=dt * 1000.0)
 
     def build(self):
         Logger.info("PictureTarotApp: Building enhanced app")
@@ -305,56 +251,71 @@ class PictureTarotApp(App):
                 break
 
         self.main_layout = FloatLayout()
+        # Mystical background
+        with self.main_layout.canvas.before:
+            Color(0.05, 0.05, 0.15, 1)
+            self.main_layout.background = Rectangle(pos=self.main_layout.pos, size=self.main_layout.size)
+        self.main_layout.bind(pos=self._follow_background, size=self._follow_background)
+
+        # Widget trees of visited screens, built once and reused on re-entry
+        self.screens = {}
         self.show_main_menu()
         return self.main_layout
 
+    def _follow_background(self, widget, *args):
+        """Keep a widget's background Rectangle on top of the widget"""
+        widget.background.pos = widget.pos
+        widget.background.size = widget.size
+
+    def show_screen(self, name, build, update=None):
+        """Show a cached screen, building its widget tree on first visit.
+
+        `build()` returns the screen's root widget; `update(screen)` refreshes
+        its dynamic parts every time the screen is entered.
+        """
+        screen = self.screens.get(name)
+        if screen is None:
+            with tracing.span(f"build {name}", "screen"):
+                screen = self.screens[name] = build()
+        if update is not None:
+            with tracing.span(f"update {name}", "screen"):
+                update(screen)
+        if screen.parent is not self.main_layout:
+            self.main_layout.clear_widgets()
+            self.main_layout.add_widget(screen)
+        return screen
+
     def get_image_base_path(self):
         """Determine the correct base path for images"""
-        possible_paths = ['images/rider-waite-tarot/', 'images/', '']
-        for path in possible_paths:
-            test_files = ['CardBacks.png', 'CardBacks.jpg', 'The_Fool.png']
-            for test_file in test_files:
-                if os.path.exists(f"{path}{test_file}"):
-                    return path
-        return 'images/'
+        return self.card_assets.base_path
 
     def get_card_image_path(self, card_name):
         """Get the correct image path for a card"""
-        base_path = self.get_image_base_path()
-        formatted_name = card_name.replace(" ", "_")
-        
-        if formatted_name == "CardBacks" or card_name == "CardBacks":
-            for ext in ['.png', '.jpg', '.jpeg']:
-                path = f'{base_path}CardBacks{ext}'
-                if os.path.exists(path):
-                    return path
-            return None
-
-        for ext in ['.png', '.jpg', '.jpeg']:
-            image_path = f'{base_path}{formatted_name}{ext}'
-            if os.path.exists(image_path):
-                return image_path
-
-        return self.get_card_back_path()
+        with tracing.span("card_assets.get_path", "assets", card=card_name):
+            if card_name == "CardBacks" or card_name.replace(" ", "_") == "CardBacks":
+                return self.card_assets.card_back_path
+            return self.card_assets.get_path(card_name)
 
     def get_card_back_path(self):
         """Get the path to the card back image"""
-        base_path = self.get_image_base_path()
-        for ext in ['.png', '.jpg', '.jpeg']:
-            path = f'{base_path}CardBacks{ext}'
-            if os.path.exists(path):
-                return path
-        return None
+        return self.card_assets.card_back_path
+
+    def release_reading_textures(self):
+        """Unload a finished reading's card textures, keeping only the card back"""
+        self.texture_prefetcher.cancel()
+        card_widget = getattr(self, 'current_card_widget', None)
+        if card_widget is not None and card_widget.is_revealed:
+            # The cached reading screen would otherwise keep the last face alive
+            card_widget.set_card(card_widget.card_name, card_widget.orientation, self.get_card_back_path())
+        self.texture_cache.clear()
+        Logger.debug(f"TextureCache: {self.texture_cache.footprint()}")
 
     def show_main_menu(self):
         """Enhanced main menu with multiple options"""
-        self.main_layout.clear_widgets()
-        
-        # Mystical background
-        with self.main_layout.canvas.before:
-            Color(0.05, 0.05, 0.15, 1)
-            Rectangle(pos=(0, 0), size=Window.size)
+        self.release_reading_textures()
+        self.show_screen("main_menu", self.build_main_menu, self.update_main_menu)
 
+    def build_main_menu(self):
         container = BoxLayout(
             orientation='vertical',
             padding=20,
@@ -375,30 +336,35 @@ class PictureTarotApp(App):
         )
         container.add_widget(title)
 
-        # Check if daily card was drawn
-        today = date.today().isoformat()
-        daily_drawn = any(r["date"].startswith(today) and r["spread"] == "Daily Guidance" 
-                         for r in self.history_manager.history["readings"])
+        # Menu options; the daily card's state is set by update_main_menu
+        self.daily_button = MysticalButton("🔮 Daily Card", size_hint_y=0.15)
+        self.daily_button.bind(on_press=lambda x: self.daily_available and self.start_daily_reading())
+        container.add_widget(self.daily_button)
 
-        # Menu options
         menu_options = [
-            ("🔮 Daily Card", lambda x: self.start_daily_reading(), not daily_drawn),
-            ("📚 Tarot Spreads", lambda x: self.show_spreads_menu(), True),
-            ("📖 Reading History", lambda x: self.show_history(), True),
-            ("✍️ Tarot Journal", lambda x: self.show_journal(), True),
-            ("⚙️ Settings", lambda x: self.show_settings(), True)
+            ("📚 Tarot Spreads", lambda x: self.show_spreads_menu()),
+            ("📖 Reading History", lambda x: self.show_history()),
+            ("✍️ Tarot Journal", lambda x: self.show_journal()),
+            ("⚙️ Settings", lambda x: self.show_settings())
         ]
 
-        for text, callback, enabled in menu_options:
-            display_text = text if enabled else f"{text} (Done Today)" if "Daily" in text else text
-            btn = MysticalButton(display_text, size_hint_y=0.15)
-            if enabled:
-                btn.bind(on_press=callback)
-            else:
-                btn.color = (0.5, 0.5, 0.5, 1)
+        for text, callback in menu_options:
+            btn = MysticalButton(text, size_hint_y=0.15)
+            btn.bind(on_press=callback)
             container.add_widget(btn)
 
-        self.main_layout.add_widget(container)
+        return container
+
+    def update_main_menu(self, screen):
+        # Check if daily card was drawn
+        today = date.today().isoformat()
+        self.daily_available = not self.history_manager.has_reading_on(today, "Daily Guidance")
+        if self.daily_available:
+            self.daily_button.text = "🔮 Daily Card"
+            self.daily_button.color = (1, 1, 1, 1)
+        else:
+            self.daily_button.text = "🔮 Daily Card (Done Today)"
+            self.daily_button.color = (0.5, 0.5, 0.5, 1)
 
     def start_daily_reading(self):
         """Start daily guidance reading"""
@@ -406,8 +372,10 @@ class PictureTarotApp(App):
 
     def show_spreads_menu(self):
         """Show available tarot spreads"""
-        self.main_layout.clear_widgets()
-        
+        self.release_reading_textures()
+        self.show_screen("spreads", self.build_spreads_menu)
+
+    def build_spreads_menu(self):
         container = BoxLayout(orientation='vertical', padding=20, spacing=10)
         
         # Header
@@ -428,6 +396,7 @@ class PictureTarotApp(App):
         container.add_widget(header)
         
         # Scrollable spread list
+        from kivy.uix.scrollview import ScrollView
         scroll = ScrollView()
         spread_container = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         spread_container.bind(minimum_height=spread_container.setter('height'))
@@ -446,7 +415,8 @@ class PictureTarotApp(App):
             # Add mystical background
             with spread_btn.canvas.before:
                 Color(0.15, 0.1, 0.25, 0.7)
-                Rectangle(pos=spread_btn.pos, size=spread_btn.size)
+                spread_btn.background = Rectangle(pos=spread_btn.pos, size=spread_btn.size)
+            spread_btn.bind(pos=self._follow_background, size=self._follow_background)
             
             name_label = Label(
                 text=f"✨ {spread_name} ({spread_info['cards']} cards)",
@@ -476,30 +446,28 @@ class PictureTarotApp(App):
         
         scroll.add_widget(spread_container)
         container.add_widget(scroll)
-        self.main_layout.add_widget(container)
+        return container
 
     def start_reading(self, num_cards, spread_name, special=False):
         """Start a tarot reading with enhanced features"""
         Logger.info(f"Starting {spread_name} reading with {num_cards} cards")
         
-        self.current_cards = random.sample(tarot_cards, num_cards)
-        self.current_orientations = [random.choice(["Upright", "Reversed"]) for _ in range(num_cards)]
+        self.current_cards, self.current_orientations = self.draw_engine.draw(num_cards)
         self.current_spread_name = spread_name
-        self.current_spread_info = SPREADS.get(spread_name, {"positions": [f"Card {i+1}" for i in range(num_cards)]})
+        self.current_spread_info = spread_info(spread_name, num_cards)
         self.card_index = 0
         self.is_special = special
-        
+
+        # Decode the whole spread in the background so taps find it resident
+        self.texture_prefetcher.prefetch([self.get_card_image_path(card) for card in self.current_cards])
+
         self.show_card_with_position()
 
     def show_card_with_position(self):
         """Display card with position meaning"""
-        self.main_layout.clear_widgets()
-        
-        card_name = self.current_cards[self.card_index]
-        orientation = self.current_orientations[self.card_index]
-        positions = self.current_spread_info["positions"]
-        position = positions[self.card_index] if self.card_index < len(positions) else f"Card {self.card_index + 1}"
-        
+        self.show_screen("reading", self.build_reading, self.update_reading)
+
+    def build_reading(self):
         container = BoxLayout(
             orientation='vertical',
             padding=30,
@@ -509,41 +477,35 @@ class PictureTarotApp(App):
         )
 
         # Progress and position info
-        progress_text = f"✨ {self.current_spread_name} ✨\nCard {self.card_index + 1} of {len(self.current_cards)}"
-        progress_label = Label(
-            text=progress_text,
+        self.progress_label = Label(
             font_size='16sp',
             color=(1, 1, 0.8, 1),
             size_hint_y=0.12,
             halign='center'
         )
-        progress_label.bind(size=progress_label.setter('text_size'))
+        self.progress_label.bind(size=self.progress_label.setter('text_size'))
         
-        position_label = Label(
-            text=f"Position: {position}",
+        self.position_label = Label(
             font_size='18sp',
             bold=True,
             color=(0.9, 0.9, 1, 1),
             size_hint_y=0.08,
             halign='center'
         )
-        position_label.bind(size=position_label.setter('text_size'))
+        self.position_label.bind(size=self.position_label.setter('text_size'))
         
-        container.add_widget(progress_label)
-        container.add_widget(position_label)
+        container.add_widget(self.progress_label)
+        container.add_widget(self.position_label)
 
-        # Card image
-        card_back_path = self.get_card_back_path()
+        # Card image, reused for every card of every reading
         self.current_card_widget = TarotCardImage(
-            card_name=card_name,
-            orientation=orientation,
+            card_name=None,
+            orientation="Upright",
             app_instance=self,
-            source=card_back_path,
             allow_stretch=True,
             keep_ratio=True,
             size_hint=(1, 0.65)
         )
-        
         self.current_card_widget.bind(on_press=self.reveal_card_with_meaning)
         container.add_widget(self.current_card_widget)
 
@@ -557,8 +519,23 @@ class PictureTarotApp(App):
         )
         instruction_label.bind(size=instruction_label.setter('text_size'))
         container.add_widget(instruction_label)
+        return container
+
+    def update_reading(self, screen):
+        card_name = self.current_cards[self.card_index]
+        orientation = self.current_orientations[self.card_index]
+        positions = self.current_spread_info["positions"]
+        position = positions[self.card_index] if self.card_index < len(positions) else f"Card {self.card_index + 1}"
+
+        self.progress_label.text = f"✨ {self.current_spread_name} ✨\nCard {self.card_index + 1} of {len(self.current_cards)}"
+        self.position_label.text = f"Position: {position}"
 
-        self.main_layout.add_widget(container)
+        card_back_path = self.get_card_back_path()
+        self.current_card_widget.set_card(card_name, orientation, card_back_path)
+        if card_back_path and card_back_path not in self.texture_cache and self.current_card_widget.texture:
+            # Shown by every reading: counted in the budget, never evicted
+            self.texture_cache.put(card_back_path, self.current_card_widget.texture)
+            self.texture_cache.pin(card_back_path)
 
     def reveal_card_with_meaning(self, instance):
         """Reveal card with meaning and interpretation"""
@@ -568,19 +545,31 @@ class PictureTarotApp(App):
             
         # Reveal the card
         card_image_path = self.get_card_image_path(instance.card_name)
-        if card_image_path and os.path.exists(card_image_path):
-            instance.source = card_image_path
+        if card_image_path:
+            texture = self.texture_cache.get(card_image_path)
+            if texture is not None:
+                instance.texture = texture
+            else:
+                instance.source = card_image_path
+                if instance.texture:
+                    self.texture_cache.put(card_image_path, instance.texture)
             instance.is_revealed = True
             
             # Show meaning popup
             self.show_card_meaning_popup(instance.card_name, instance.orientation)
 
+    @tracing.traced("popup.card_meaning", "popup")
     def show_card_meaning_popup(self, card_name, orientation):
         """Show card meaning in a popup"""
+        from kivy.uix.popup import Popup
+        from kivy.uix.scrollview import ScrollView
         # Get meaning from database or create generic one
         meaning_key = orientation.lower()
-        meaning = CARD_MEANINGS.get(card_name, {}).get(meaning_key, 
+        record = self.card_meanings.get(card_name, {})
+        meaning = record.get(meaning_key,
                   f"Meditate on the symbolism of {card_name} in {orientation.lower()} position.")
+        if record.get("description"):
+            meaning = f"[b]{meaning}[/b]\n\n{record['description']}"
         
         content = BoxLayout(orientation='vertical', spacing=10, padding=20)
         
@@ -593,20 +582,26 @@ class PictureTarotApp(App):
         )
         title.bind(size=title.setter('text_size'))
         
+        # Long-form descriptions can outgrow the popup, so the text scrolls
+        meaning_scroll = ScrollView(size_hint_y=0.5, do_scroll_x=False)
         meaning_label = Label(
             text=meaning,
+            markup=True,
             font_size='16sp',
-            text_size=(None, None),
-            size_hint_y=0.5,
+            size_hint_y=None,
             halign='center',
             valign='middle'
         )
-        meaning_label.bind(size=meaning_label.setter('text_size'))
+        meaning_label.bind(
+            width=lambda label, width: setattr(label, 'text_size', (width, None)),
+            texture_size=lambda label, size: setattr(label, 'height', max(size[1], meaning_scroll.height))
+        )
+        meaning_scroll.add_widget(meaning_label)
         
         close_btn = MysticalButton("Continue", size_hint_y=0.2)
         
         content.add_widget(title)
-        content.add_widget(meaning_label)
+        content.add_widget(meaning_scroll)
         content.add_widget(close_btn)
         
         popup = Popup(
@@ -630,6 +625,7 @@ class PictureTarotApp(App):
 
     def complete_reading(self):
         """Complete the reading and save to history"""
+        self.release_reading_textures()
         # Save reading to history
         self.history_manager.add_reading(
             self.current_spread_name,
@@ -642,8 +638,9 @@ class PictureTarotApp(App):
 
     def show_reading_complete(self):
         """Show reading completion with options"""
-        self.main_layout.clear_widgets()
-        
+        self.show_screen("reading_complete", self.build_reading_complete, self.update_reading_complete)
+
+    def build_reading_complete(self):
         container = BoxLayout(orientation='vertical', padding=30, spacing=20)
         
         title = Label(
@@ -651,20 +648,22 @@ class PictureTarotApp(App):
             font_size='28sp',
             bold=True,
             color=(1, 1, 0.8, 1),
-            size_hint_y=0.2
+            size_hint_y=0.15
         )
-        
-        message = Label(
-            text=f"Your {self.current_spread_name} reading has been saved.\nTake time to reflect on the messages revealed.",
+
+        # Thumbnails of the reading's cards, filled in on every visit
+        self.complete_preview = BoxLayout(spacing=5, size_hint_y=0.15)
+
+        self.complete_message = Label(
             font_size='16sp',
             color=(0.9, 0.9, 0.9, 1),
-            size_hint_y=0.3,
+            size_hint_y=0.25,
             halign='center'
         )
-        message.bind(size=message.setter('text_size'))
+        self.complete_message.bind(size=self.complete_message.setter('text_size'))
         
         # Options
-        options_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=0.5)
+        options_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=0.45)
         
         journal_btn = MysticalButton("📝 Add to Journal")
         journal_btn.bind(on_press=lambda x: self.quick_journal_entry())
@@ -684,13 +683,33 @@ class PictureTarotApp(App):
         options_layout.add_widget(home_btn)
         
         container.add_widget(title)
-        container.add_widget(message)
+        container.add_widget(self.complete_preview)
+        container.add_widget(self.complete_message)
         container.add_widget(options_layout)
-        
-        self.main_layout.add_widget(container)
+        return container
 
+    def update_reading_complete(self, screen):
+        from thumbnails import CardThumbnail
+        preview = self.complete_preview
+        # Thumbnail widgets are reused; a larger spread adds the missing ones
+        while len(preview.children) < len(self.current_cards):
+            preview.add_widget(CardThumbnail())
+        while len(preview.children) > len(self.current_cards):
+            preview.remove_widget(preview.children[0])
+        for thumbnail, card, orientation in zip(reversed(preview.children), self.current_cards,
+                                                self.current_orientations):
+            thumbnail.show(self.thumbnails, card, orientation)
+
+        code = share_code(self.current_spread_name, self.current_cards, self.current_orientations)
+        self.complete_message.text = (f"Your {self.current_spread_name} reading has been saved.\n"
+                                      "Take time to reflect on the messages revealed.\n\n"
+                                      f"Share code: {code}")
+
+    @tracing.traced("popup.quick_journal", "popup")
     def quick_journal_entry(self):
         """Quick journal entry popup"""
+        from kivy.uix.popup import Popup
+        from kivy.uix.textinput import TextInput
         content = BoxLayout(orientation='vertical', spacing=10, padding=10)
         
         text_input = TextInput(
@@ -727,8 +746,11 @@ class PictureTarotApp(App):
 
     def show_history(self):
         """Show reading history"""
-        self.main_layout.clear_widgets()
-        
+        self.show_screen("history", self.build_history, self.update_history)
+
+    def build_history(self):
+        from kivy.metrics import dp
+        from history_views import HistoryRow, PagedRecycleView
         container = BoxLayout(orientation='vertical', padding=20, spacing=10)
         
         # Header
@@ -748,45 +770,95 @@ class PictureTarotApp(App):
         header.add_widget(title)
         container.add_widget(header)
         
-        # History list
-        scroll = ScrollView()
-        history_container = BoxLayout(orientation='vertical', spacing=5, size_hint_y=None)
-        history_container.bind(minimum_height=history_container.setter('height'))
-        
-        readings = self.history_manager.history["readings"]
-        
-        if not readings:
-            no_history = Label(
-                text="No readings yet. Start your tarot journey!",
-                font_size='16sp',
-                color=(0.7, 0.7, 0.7, 1),
-                size_hint_y=None,
-                height=100
-            )
-            history_container.add_widget(no_history)
+        self.history_query = ""
+        container.add_widget(self.build_search_input(
+            "🔍 Search spreads and cards...", lambda query: self.search_list("history", query)))
+        
+        # History list, fetched page by page as the user scrolls
+        self.history_list = PagedRecycleView(
+            fetch_page=lambda offset, limit: self.fetch_entries("readings", self.history_query, offset, limit),
+            viewclass=HistoryRow,
+            # Tall enough for the row's thumbnails at any screen density
+            row_height=dp(80)
+        )
+
+        self.no_history = BoxLayout(orientation='vertical')
+        self.no_history.add_widget(Label(
+            text="No readings yet. Start your tarot journey!",
+            font_size='16sp',
+            color=(0.7, 0.7, 0.7, 1),
+            size_hint_y=None,
+            height=100
+        ))
+        self.no_history.add_widget(BoxLayout())
+        self.no_history_matches = self.build_no_matches()
+
+        self.history_body = BoxLayout()
+        container.add_widget(self.history_body)
+        return container
+
+    def update_history(self, screen):
+        placeholder = self.no_history_matches if self.history_query else self.no_history
+        self.show_list_or_placeholder(self.history_body, self.history_list, placeholder)
+
+    def show_list_or_placeholder(self, body, paged_list, placeholder):
+        """Reload a paged list and show it, or its placeholder when empty"""
+        paged_list.reset()
+        shown = paged_list if paged_list.data else placeholder
+        if shown.parent is not body:
+            body.clear_widgets()
+            body.add_widget(shown)
+
+    def build_search_input(self, hint_text, on_query):
+        """Search box that calls `on_query` with its text once typing pauses"""
+        from kivy.uix.textinput import TextInput
+        search_input = TextInput(
+            hint_text=hint_text,
+            multiline=False,
+            size_hint_y=None,
+            height=45,
+            background_color=(0.2, 0.15, 0.3, 0.8),
+            foreground_color=(1, 1, 1, 1)
+        )
+        trigger = Clock.create_trigger(lambda dt: on_query(search_input.text.strip()), 0.15)
+        search_input.bind(text=lambda *args: trigger())
+        return search_input
+
+    def build_no_matches(self):
+        placeholder = BoxLayout(orientation='vertical')
+        placeholder.add_widget(Label(
+            text="No matching entries.",
+            font_size='16sp',
+            color=(0.7, 0.7, 0.7, 1),
+            size_hint_y=None,
+            height=100
+        ))
+        placeholder.add_widget(BoxLayout())
+        return placeholder
+
+    def fetch_entries(self, kind, query, offset, limit):
+        """A page of history or journal entries, or of search results when there is a query"""
+        if query:
+            return self.history_manager.search(query, kind, offset, limit)
+        if kind == "readings":
+            return self.history_manager.get_readings(offset, limit)
+        return self.history_manager.get_journal(offset, limit)
+
+    def search_list(self, screen, query):
+        """Show the entries of the history or journal screen matching `query`"""
+        if screen == "history":
+            self.history_query = query
+            self.update_history(None)
         else:
-            for reading in readings:
-                date_str = datetime.fromisoformat(reading["date"]).strftime("%B %d, %Y at %I:%M %p")
-                
-                item = Label(
-                    text=f"🔮 {reading['spread']}\n📅 {date_str}\n🃏 {len(reading['cards'])} cards drawn",
-                    font_size='14sp',
-                    color=(0.9, 0.9, 0.9, 1),
-                    size_hint_y=None,
-                    height=80,
-                    halign='left'
-                )
-                item.bind(size=item.setter('text_size'))
-                history_container.add_widget(item)
-        
-        scroll.add_widget(history_container)
-        container.add_widget(scroll)
-        self.main_layout.add_widget(container)
+            self.journal_query = query
+            self.update_journal(None)
 
     def show_journal(self):
         """Show tarot journal"""
-        self.main_layout.clear_widgets()
-        
+        self.show_screen("journal", self.build_journal, self.update_journal)
+
+    def build_journal(self):
+        from history_views import JournalRow, PagedRecycleView
         container = BoxLayout(orientation='vertical', padding=20, spacing=10)
         
         # Header with back button and add entry button
@@ -810,81 +882,45 @@ class PictureTarotApp(App):
         header.add_widget(add_btn)
         container.add_widget(header)
         
-        # Journal entries
-        scroll = ScrollView()
-        journal_container = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
-        journal_container.bind(minimum_height=journal_container.setter('height'))
-        
-        entries = self.history_manager.history["journal"]
-        
-        if not entries:
-            no_entries = Label(
-                text="📝 No journal entries yet.\nStart documenting your tarot insights!",
-                font_size='16sp',
-                color=(0.7, 0.7, 0.7, 1),
-                size_hint_y=None,
-                height=100,
-                halign='center'
-            )
-            no_entries.bind(size=no_entries.setter('text_size'))
-            journal_container.add_widget(no_entries)
-        else:
-            for entry in entries:
-                date_str = datetime.fromisoformat(entry["date"]).strftime("%B %d, %Y")
-                
-                entry_box = BoxLayout(
-                    orientation='vertical',
-                    size_hint_y=None,
-                    height=120,
-                    padding=15,
-                    spacing=5
-                )
-                
-                # Add mystical background to entry
-                with entry_box.canvas.before:
-                    Color(0.15, 0.1, 0.25, 0.5)
-                    Rectangle(pos=entry_box.pos, size=entry_box.size)
-                
-                entry_box.bind(pos=self._update_entry_bg, size=self._update_entry_bg)
-                
-                date_label = Label(
-                    text=f"✨ {date_str}",
-                    font_size='14sp',
-                    bold=True,
-                    color=(1, 1, 0.8, 1),
-                    size_hint_y=0.3,
-                    halign='left'
-                )
-                date_label.bind(size=date_label.setter('text_size'))
-                
-                text_label = Label(
-                    text=entry["text"][:150] + ("..." if len(entry["text"]) > 150 else ""),
-                    font_size='13sp',
-                    color=(0.9, 0.9, 0.9, 1),
-                    size_hint_y=0.7,
-                    halign='left',
-                    valign='top'
-                )
-                text_label.bind(size=text_label.setter('text_size'))
-                
-                entry_box.add_widget(date_label)
-                entry_box.add_widget(text_label)
-                journal_container.add_widget(entry_box)
+        self.journal_query = ""
+        container.add_widget(self.build_search_input(
+            "🔍 Search your journal...", lambda query: self.search_list("journal", query)))
         
-        scroll.add_widget(journal_container)
-        container.add_widget(scroll)
-        self.main_layout.add_widget(container)
-    
-    def _update_entry_bg(self, instance, *args):
-        """Update journal entry background"""
-        if hasattr(instance, 'canvas') and instance.canvas.before:
-            instance.canvas.before.clear()
-            with instance.canvas.before:
-                Color(0.15, 0.1, 0.25, 0.5)
-                Rectangle(pos=instance.pos, size=instance.size)
+        # Journal entries, fetched page by page as the user scrolls
+        self.journal_list = PagedRecycleView(
+            fetch_page=lambda offset, limit: self.fetch_entries("journal", self.journal_query, offset, limit),
+            viewclass=JournalRow,
+            row_height=120,
+            spacing=10
+        )
+
+        self.no_entries = BoxLayout(orientation='vertical')
+        no_entries_label = Label(
+            text="📝 No journal entries yet.\nStart documenting your tarot insights!",
+            font_size='16sp',
+            color=(0.7, 0.7, 0.7, 1),
+            size_hint_y=None,
+            height=100,
+            halign='center'
+        )
+        no_entries_label.bind(size=no_entries_label.setter('text_size'))
+        self.no_entries.add_widget(no_entries_label)
+        self.no_entries.add_widget(BoxLayout())
+        self.no_journal_matches = self.build_no_matches()
 
+        self.journal_body = BoxLayout()
+        container.add_widget(self.journal_body)
+        return container
+
+    def update_journal(self, screen):
+        placeholder = self.no_journal_matches if self.journal_query else self.no_entries
+        self.show_list_or_placeholder(self.journal_body, self.journal_list, placeholder)
+
+    @tracing.traced("popup.journal_entry", "popup")
     def add_journal_entry(self):
         """Add new journal entry"""
+        from kivy.uix.popup import Popup
+        from kivy.uix.textinput import TextInput
         content = BoxLayout(orientation='vertical', spacing=15, padding=15)
         
         title_label = Label(
@@ -935,8 +971,10 @@ class PictureTarotApp(App):
 
     def show_settings(self):
         """Show app settings"""
-        self.main_layout.clear_widgets()
-        
+        self.show_screen("settings", self.build_settings, self.update_settings)
+
+    def build_settings(self):
+        from kivy.uix.switch import Switch
         container = BoxLayout(orientation='vertical', padding=25, spacing=20)
         
         # Header
@@ -970,14 +1008,14 @@ class PictureTarotApp(App):
         )
         sound_label.bind(size=sound_label.setter('text_size'))
         
-        sound_switch = Switch(
+        self.sound_switch = Switch(
             active=self.sound_enabled,
             size_hint_x=0.3
         )
-        sound_switch.bind(active=self.toggle_sound)
+        self.sound_switch.bind(active=self.toggle_sound)
         
         sound_box.add_widget(sound_label)
-        sound_box.add_widget(sound_switch)
+        sound_box.add_widget(self.sound_switch)
         
         # Animation setting
         anim_box = BoxLayout(size_hint_y=None, height=60, spacing=15)
@@ -990,17 +1028,59 @@ class PictureTarotApp(App):
         )
         anim_label.bind(size=anim_label.setter('text_size'))
         
-        anim_switch = Switch(
+        self.anim_switch = Switch(
             active=self.animation_enabled,
             size_hint_x=0.3
         )
-        anim_switch.bind(active=self.toggle_animations)
+        self.anim_switch.bind(active=self.toggle_animations)
         
         anim_box.add_widget(anim_label)
-        anim_box.add_widget(anim_switch)
+        anim_box.add_widget(self.anim_switch)
+        
+        # Card meanings language
+        language_box = BoxLayout(size_hint_y=None, height=60, spacing=15)
+        language_label = Label(
+            text="🌐 Meanings Language",
+            font_size='18sp',
+            color=(1, 1, 1, 1),
+            size_hint_x=0.7,
+            halign='left'
+        )
+        language_label.bind(size=language_label.setter('text_size'))
+        
+        self.language_button = MysticalButton(
+            self.card_meanings.languages.get(self.language, self.language),
+            size_hint_x=0.3
+        )
+        self.language_button.bind(on_press=self.cycle_language)
+        
+        language_box.add_widget(language_label)
+        language_box.add_widget(self.language_button)
+        
+        # Performance tracing
+        trace_box = BoxLayout(size_hint_y=None, height=60, spacing=15)
+        trace_label = Label(
+            text="🐞 Performance Trace",
+            font_size='18sp',
+            color=(1, 1, 1, 1),
+            size_hint_x=0.7,
+            halign='left'
+        )
+        trace_label.bind(size=trace_label.setter('text_size'))
+        
+        self.trace_switch = Switch(
+            active=tracing.is_enabled(),
+            size_hint_x=0.3
+        )
+        self.trace_switch.bind(active=self.toggle_tracing)
+        
+        trace_box.add_widget(trace_label)
+        trace_box.add_widget(self.trace_switch)
         
         settings_container.add_widget(sound_box)
         settings_container.add_widget(anim_box)
+        settings_container.add_widget(language_box)
+        settings_container.add_widget(trace_box)
         
         # App info
         info_container = BoxLayout(orientation='vertical', spacing=10, size_hint_y=0.18)
@@ -1017,8 +1097,13 @@ class PictureTarotApp(App):
         
         container.add_widget(settings_container)
         container.add_widget(info_container)
-        
-        self.main_layout.add_widget(container)
+        return container
+
+    def update_settings(self, screen):
+        # Only fires the toggle handlers if the state changed elsewhere
+        self.sound_switch.active = self.sound_enabled
+        self.anim_switch.active = self.animation_enabled
+        self.trace_switch.active = tracing.is_enabled()
 
     def toggle_sound(self, instance, value):
         """Toggle sound effects"""
@@ -1032,6 +1117,29 @@ class PictureTarotApp(App):
         self.save_settings()
         Logger.info(f"Animations {'enabled' if value else 'disabled'}")
 
+    def toggle_tracing(self, instance, value):
+        """Start tracing, or stop and write the trace file"""
+        self.trace_enabled = value
+        self.save_settings()
+        if value:
+            self.start_tracing()
+        else:
+            path = self.stop_tracing()
+            if path:
+                Logger.info(f"Trace saved to {os.path.abspath(path)}")
+
+    def cycle_language(self, instance):
+        """Switch card meanings to the next available language"""
+        meanings = self.card_meanings
+        languages = list(meanings.languages)
+        if not languages:
+            return
+        position = languages.index(self.language) if self.language in languages else -1
+        self.language = meanings.language = languages[(position + 1) % len(languages)]
+        instance.text = meanings.languages[self.language]
+        self.save_settings()
+        Logger.info(f"Card meanings language set to {self.language}")
+
     def get_daily_affirmation(self):
         """Get a daily tarot affirmation"""
         affirmations = [
@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+
+class WriteBehindWorker:
+    """Coalesces dirty-state notifications and writes them off the UI thread.
+
+    Callers mark a key dirty together with the function that persists it.
+    The worker waits `window` seconds after the first notification so a
+    burst (say, a settings switch flipped several times) collapses into a
+    single write with the latest state. `flush` writes everything pending
+    synchronously, for on_pause/on_stop.
+    """
+    def __init__(self, window=0.5):
+        self.window = window
+        self._dirty = OrderedDict()
+        self._cond = threading.Condition()
+        # Serializes writes between the worker and explicit flushes
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+
+    def mark_dirty(self, key, write):
+        """Schedule `write()` for `key`, replacing any pending write for it"""
+        with self._cond:
+            self._dirty[key] = write
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="WriteBehind", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """Write everything pending now, on the calling thread"""
+        with self._write_lock:
+            self._write(self._take_batch())
+
+    def stop(self):
+        """Flush and shut the worker down"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _take_batch(self):
+        with self._cond:
+            batch, self._dirty = self._dirty, OrderedDict()
+        return batch
+
+    def _write(self, batch):
+        for key, write in batch.items():
+            try:
+                write()
+            except Exception as e:
+                Logger.error(f"WriteBehind: Failed to write {key}: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            # Let the burst settle, unless we are asked to stop meanwhile
+            deadline = time.monotonic() + self.window
+            with self._cond:
+                while not self._stopped and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                if self._stopped:
+                    return
+            with self._write_lock:
+                self._write(self._take_batch())
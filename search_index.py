@@ -0,0 +1,263 @@
+"""Full-text search over readings and journal entries.
+
+An inverted index maps every word of a journal entry, and every word of a
+reading's spread, card and orientation names and notes, to the entries
+containing it. A query matches the entries that contain all of its words,
+each taken as a prefix, so results narrow as the user types.
+
+The index is persisted next to the history as a snapshot
+(``tarot_history_search.json``) plus an append-only JSON-lines log of the
+entries added since (``tarot_history_search.log``). Adding an entry only
+appends to the log; the snapshot is rewritten every `compact_every`
+additions. Nothing is read until the first search.
+"""
+import bisect
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+
+from card_codec import expand_reading
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lower-case words of a text, with accents removed"""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return WORD.findall("".join(c for c in folded if not unicodedata.combining(c)))
+
+
+def entry_text(kind, entry):
+    """Searchable text of a stored entry"""
+    if kind == "journal":
+        return entry["text"]
+    reading = expand_reading(entry)
+    return " ".join([reading["spread"], *reading["cards"], *reading["orientations"], reading.get("notes", "")])
+
+
+class SearchIndex:
+    """Inverted index over history entries, loaded on first search.
+
+    `max_entries` mirrors the cap of a capped history store ({kind: count}):
+    the oldest entries of a kind are dropped from the index as the store
+    drops them. `source` returns every stored entry of a kind, oldest first,
+    and is used to build the index when there is none on disk yet.
+    """
+    VERSION = 1
+
+    def __init__(self, path, source, max_entries=None, compact_every=500):
+        self.path = path
+        self.log_file = f"{os.path.splitext(path)[0]}.log"
+        self.source = source
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self._loaded = False
+        self._pending = []
+        self._log_entries = 0
+        self._lock = threading.RLock()
+        # Serializes log appends with snapshot writes, which run outside _lock
+        self._write_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.next_id = 0
+        self.docs = {}
+        self.order = {"readings": [], "journal": []}
+        self.postings = {}
+        self._vocabulary = None
+        self._last_query = None
+
+    def add(self, kind, entry):
+        """Index a new entry; only queued for the log until the index is loaded"""
+        with self._lock:
+            self._pending.append((kind, entry))
+            if self._loaded:
+                self._index(kind, entry)
+
+    def _index(self, kind, entry):
+        doc_id = self.next_id
+        self.next_id += 1
+        self.docs[doc_id] = (kind, entry)
+        self.order[kind].append(doc_id)
+        for token in set(tokenize(entry_text(kind, entry))):
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = ids = set()
+                self._vocabulary = None
+            ids.add(doc_id)
+        self._last_query = None
+        if self.max_entries and len(self.order[kind]) > self.max_entries[kind]:
+            self._remove(self.order[kind].pop(0))
+
+    def _remove(self, doc_id):
+        kind, entry = self.docs.pop(doc_id)
+        for token in set(tokenize(entry_text(kind, entry))):
+            ids = self.postings[token]
+            ids.discard(doc_id)
+            if not ids:
+                del self.postings[token]
+                self._vocabulary = None
+
+    def load(self):
+        if self._loaded:
+            # Searches never wait for a snapshot being written
+            return
+        with self._write_lock:
+            snapshot = self._load()
+            if snapshot is not None:
+                self._save_snapshot(snapshot)
+
+    def _load(self):
+        """Load or rebuild the index; returns a snapshot to write after a rebuild"""
+        with self._lock:
+            if self._loaded:
+                return None
+            self._reset()
+            try:
+                with open(self.path, 'r') as f:
+                    snapshot = json.load(f)
+                if snapshot.get("version") != self.VERSION:
+                    raise ValueError(f"version {snapshot.get('version')}")
+                if snapshot.get("max_entries") != self.max_entries:
+                    raise ValueError("built for another history storage")
+            except (OSError, ValueError) as e:
+                if not isinstance(e, FileNotFoundError):
+                    Logger.warning(f"Search: Ignoring unreadable index {self.path}: {e}")
+                self._rebuild()
+                snapshot = self._snapshot()
+            else:
+                self._load_snapshot(snapshot)
+                self._replay()
+                snapshot = None
+            self._loaded = True
+            for kind, entry in self._pending:
+                self._index(kind, entry)
+            return snapshot
+
+    def _load_snapshot(self, snapshot):
+        self.next_id = snapshot["next_id"]
+        for doc_id, kind, entry in snapshot["docs"]:
+            self.docs[doc_id] = (kind, entry)
+            self.order[kind].append(doc_id)
+        self.postings = {token: set(ids) for token, ids in snapshot["postings"].items()}
+
+    def _replay(self):
+        """Index the entries logged since the snapshot, dropping a torn last line"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        for line in data[:data.rfind(b'\n') + 1].splitlines():
+            try:
+                record = json.loads(line)
+                self._index(record["kind"], record["entry"])
+            except (ValueError, KeyError, TypeError):
+                Logger.warning(f"Search: Skipping corrupt record in {self.log_file}")
+                continue
+            self._log_entries += 1
+
+    def _rebuild(self):
+        """Index everything the history holds; queued entries are already in it"""
+        Logger.info("Search: Building search index")
+        self._pending = []
+        # Ids are given in date order across both kinds, as when entries are added
+        entries = heapq.merge(*(self._tagged(kind) for kind in ("readings", "journal")),
+                              key=lambda item: item[1]["date"])
+        for kind, entry in entries:
+            self._index(kind, entry)
+
+    def _tagged(self, kind):
+        for entry in self.source(kind):
+            yield kind, entry
+
+    def flush(self):
+        """Append queued entries to the log, folding it into the snapshot when long"""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if not pending:
+                    return
+                log_entries = self._log_entries
+                snapshot = None
+                if self._loaded and log_entries + len(pending) >= self.compact_every:
+                    # Taken together with `pending`, so later entries go to the next log
+                    snapshot = self._snapshot()
+            try:
+                if snapshot is not None:
+                    self._save_snapshot(snapshot)
+                    return
+                with open(self.log_file, 'a') as f:
+                    f.write("".join(json.dumps({"kind": kind, "entry": entry}, separators=(",", ":")) + "\n"
+                                    for kind, entry in pending))
+            except OSError:
+                with self._lock:
+                    self._pending[:0] = pending
+                    self._log_entries = log_entries
+                raise
+            with self._lock:
+                self._log_entries += len(pending)
+
+    def _snapshot(self):
+        """The index as a snapshot dict, copied so it can be written without _lock"""
+        self._log_entries = 0
+        return {
+            "version": self.VERSION,
+            "max_entries": self.max_entries,
+            "next_id": self.next_id,
+            "docs": [[doc_id, kind, entry] for doc_id, (kind, entry) in self.docs.items()],
+            "postings": {token: sorted(ids) for token, ids in self.postings.items()}
+        }
+
+    def _save_snapshot(self, snapshot):
+        """Write a snapshot and drop the log it replaces; call with _write_lock held"""
+        # history imports this module, so its helper is imported late
+        from history import atomic_write_json
+        atomic_write_json(self.path, snapshot, separators=(",", ":"))
+        try:
+            os.remove(self.log_file)
+        except FileNotFoundError:
+            pass
+
+    def _matching(self, prefix):
+        """Ids of the documents containing a word that starts with `prefix`"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + "\U0010ffff", start)
+        if end - start == 1:
+            return self.postings[vocabulary[start]]
+        ids = set()
+        for token in vocabulary[start:end]:
+            ids |= self.postings[token]
+        return ids
+
+    def search(self, query, kind=None, offset=0, limit=None):
+        """Entries matching every word of `query`, most recent first"""
+        self.load()
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            key = (tuple(terms), kind)
+            if self._last_query is None or self._last_query[0] != key:
+                # Intersect starting from the rarest term
+                matches = sorted((self._matching(term) for term in set(terms)), key=len)
+                ids = set(matches[0]).intersection(*matches[1:])
+                if kind is not None:
+                    ids = [doc_id for doc_id in ids if self.docs[doc_id][0] == kind]
+                # Ids follow insertion order, which is date order
+                self._last_query = (key, sorted(ids, reverse=True))
+            ids = self._last_query[1]
+            page = ids[offset:None if limit is None else offset + limit]
+            results = [self.docs[doc_id] for doc_id in page]
+        return [expand_reading(entry) if doc_kind == "readings" else entry for doc_kind, entry in results]
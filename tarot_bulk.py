@@ -0,0 +1,267 @@
+"""Bulk export of stored readings and generation of synthetic corpora.
+
+Two commands, both streaming to JSON Lines or CSV, gzip-compressed when
+the output name ends in ``.gz`` (``-`` writes to stdout):
+
+- ``generate`` draws N readings per spread with DrawEngine.draw_batch.
+  The work is cut into jobs with seeds spawned from one SeedSequence, as
+  in tarot_simulation.py, and run on a process pool. Each worker formats,
+  and compresses when asked, its own chunk, so the parent only writes
+  bytes. Chunks are written in job order, so a seed gives the same file
+  with any number of workers.
+- ``export`` pages through the readings (or journal) in a history store,
+  opened read-only: exporting never compacts, converts or indexes it.
+
+Neither side ever holds more than a window of chunks: at most
+``2 * workers`` jobs are in flight, and history pages are read one at a
+time. Memory therefore stays the same however large the output grows.
+
+JSON Lines hold one reading per line, the same shape as the history's
+display form:
+
+    {"reading": 0, "spread": "Past-Present-Future", "cards": ["The Star", ...], "orientations": ["Upright", ...]}
+
+CSV is long-format, one row per card: reading, spread, position, card,
+orientation (plus date and notes for exports).
+
+Usage:
+    python tarot_bulk.py generate --readings 10000000 --workers 8 --seed 1 -o corpus.jsonl.gz
+    python tarot_bulk.py generate --spread "Celtic Cross" --readings 100000 -o cross.csv
+    python tarot_bulk.py export --storage sqlite -o readings.csv.gz
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from history import HISTORY_FILE, STORAGE_BACKENDS
+from tarot_engine import ORIENTATIONS, SPREADS, DrawEngine, spread_info, tarot_cards, unpack_orientations
+from tarot_simulation import check_run, plan_jobs
+
+DEFAULT_CHUNK = 20_000
+# zlib's default: level 9 is several times slower for a percent or two
+GZIP_LEVEL = 6
+EXPORT_PAGE = 1000
+FORMATS = ("jsonl", "csv")
+CSV_HEADER = ["reading", "spread", "position", "card", "orientation"]
+EXPORT_CSV_HEADER = ["reading", "date", "spread", "position", "card", "orientation", "notes"]
+
+
+def csv_field(value):
+    """`value` quoted as the csv module would write it"""
+    out = io.StringIO()
+    csv.writer(out).writerow([value])
+    return out.getvalue()[:-2]
+
+
+# Encoded once, so formatting a reading is string joins only
+_JSON_CARDS = [json.dumps(card) for card in tarot_cards]
+_JSON_ORIENTATIONS = [json.dumps(orientation) for orientation in ORIENTATIONS]
+_CSV_CARDS = [csv_field(card) for card in tarot_cards]
+_CSV_ORIENTATIONS = [csv_field(orientation) for orientation in ORIENTATIONS]
+
+
+def output_format(path, requested=None):
+    """jsonl or csv, from --format or the file name"""
+    if requested:
+        return requested
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "jsonl"
+
+
+def open_output(path):
+    """Binary stream for `path`; '-' is stdout"""
+    if path == "-":
+        return sys.stdout.buffer
+    return open(path, 'wb')
+
+
+def _format_chunk(task):
+    """Draw one job and return its readings formatted (and compressed) as bytes"""
+    spread_name, (seed, num_cards, count), first, fmt, compress = task
+    cards, orientations = DrawEngine(seed).draw_batch(count, num_cards)
+    reversed_bits = unpack_orientations(orientations, num_cards)
+    if fmt == "jsonl":
+        spread = json.dumps(spread_name)
+        text = "".join(
+            f'{{"reading":{first + i},"spread":{spread},"cards":[{",".join(_JSON_CARDS[c] for c in row)}],'
+            f'"orientations":[{",".join(_JSON_ORIENTATIONS[b] for b in bits)}]}}\n'
+            for i, (row, bits) in enumerate(zip(cards.tolist(), reversed_bits.tolist())))
+    else:
+        prefixes = [f",{csv_field(spread_name)},{csv_field(position)}," for position in SPREADS[spread_name]["positions"]]
+        text = "".join(
+            f"{first + i}{prefix}{_CSV_CARDS[card]},{_CSV_ORIENTATIONS[bit]}\r\n"
+            for i, (row, bits) in enumerate(zip(cards.tolist(), reversed_bits.tolist()))
+            for prefix, card, bit in zip(prefixes, row, bits))
+    data = text.encode("utf-8")
+    # Concatenated gzip members form one valid gzip file
+    return gzip.compress(data, GZIP_LEVEL) if compress else data
+
+
+def windowed_map(pool, fn, tasks, window):
+    """Like pool.map, in order, but with at most `window` tasks submitted at a time"""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(fn, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def generation_tasks(spreads, readings, seed, chunk_size, fmt, compress):
+    """Lazily yield one task per job; readings are numbered across the run"""
+    first = 0
+    for spread_name, job in plan_jobs(spreads, readings, seed, chunk_size):
+        yield spread_name, job, first, fmt, compress
+        first += job[2]
+
+
+def generate(out, readings, spreads=None, seed=None, workers=1, chunk_size=DEFAULT_CHUNK, fmt="jsonl", compress=False):
+    """Write `readings` readings per spread to the binary stream `out`; returns the count"""
+    check_run(readings, workers, chunk_size)
+    spreads = list(spreads or SPREADS)
+    if seed is None:
+        seed = DrawEngine().seed
+    if fmt == "csv":
+        header = (",".join(CSV_HEADER) + "\r\n").encode("utf-8")
+        out.write(gzip.compress(header, GZIP_LEVEL) if compress else header)
+    tasks = generation_tasks(spreads, readings, seed, chunk_size, fmt, compress)
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            for data in windowed_map(pool, _format_chunk, tasks, 2 * workers):
+                out.write(data)
+    else:
+        for task in tasks:
+            out.write(_format_chunk(task))
+    return seed, readings * len(spreads)
+
+
+def iter_history(store, kind="readings", page_size=EXPORT_PAGE):
+    """Stored entries of a kind, most recent first, read one page at a time"""
+    offset = 0
+    while True:
+        page = store.entries(kind, offset, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def export_rows(entries, kind, fmt):
+    """Formatted lines for stored entries, a CSV header first"""
+    if fmt == "jsonl":
+        for n, entry in enumerate(entries):
+            yield json.dumps({"reading" if kind == "readings" else "entry": n, **entry}, ensure_ascii=False) + "\n"
+        return
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_CSV_HEADER if kind == "readings" else ["entry", "date", "text"])
+    for n, entry in enumerate(entries):
+        if kind == "readings":
+            positions = spread_info(entry["spread"], len(entry["cards"]))["positions"]
+            writer.writerows((n, entry["date"], entry["spread"], position, card, orientation, entry.get("notes", ""))
+                             for position, card, orientation in zip(positions, entry["cards"], entry["orientations"]))
+        else:
+            writer.writerow((n, entry["date"], entry["text"]))
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    yield out.getvalue()
+
+
+def export(out, store, kind="readings", fmt="jsonl", compress=False):
+    """Write every stored entry of a kind to the binary stream `out`; returns the count"""
+    count = 0
+
+    def counted(entries):
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    stream = gzip.GzipFile(fileobj=out, mode='wb', compresslevel=GZIP_LEVEL) if compress else out
+    try:
+        for line in export_rows(counted(iter_history(store, kind)), kind, fmt):
+            stream.write(line.encode("utf-8"))
+    finally:
+        if compress:
+            stream.close()
+    return count
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="draw a synthetic corpus")
+    gen.add_argument("--readings", type=int, default=1_000_000, help="readings per spread")
+    gen.add_argument("--spread", action="append", choices=list(SPREADS), dest="spreads",
+                     help="spread to generate (repeatable; default: all)")
+    gen.add_argument("--seed", type=int, help="seed of the run (default: random, printed)")
+    gen.add_argument("--workers", type=int, default=1, help=f"worker processes (this machine has {os.cpu_count()})")
+    gen.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="readings per job")
+
+    exp = commands.add_parser("export", help="export the stored history")
+    exp.add_argument("--storage", choices=list(STORAGE_BACKENDS), default="log")
+    exp.add_argument("--history-file", default=HISTORY_FILE)
+    exp.add_argument("--kind", choices=["readings", "journal"], default="readings")
+
+    for command in (gen, exp):
+        command.add_argument("-o", "--output", default="-", help="output file, .gz to compress (default: stdout)")
+        command.add_argument("--format", choices=FORMATS, help="default: from the output name, else jsonl")
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        for flag, value in (("--readings", args.readings), ("--workers", args.workers),
+                            ("--chunk-size", args.chunk_size)):
+            if value < 1:
+                gen.error(f"{flag} must be at least 1")
+
+    fmt = output_format(args.output, args.format)
+    compress = args.output.endswith(".gz")
+    started = time.perf_counter()
+    out = open_output(args.output)
+    try:
+        if args.command == "generate":
+            seed, count = generate(out, args.readings, args.spreads, args.seed, args.workers, args.chunk_size,
+                                   fmt, compress)
+            summary = f"seed {seed}, {count} readings"
+        else:
+            # The store alone, without the manager's summary and search sidecars
+            store = STORAGE_BACKENDS[args.storage](args.history_file, read_only=True)
+            try:
+                try:
+                    store.load()
+                except (OSError, ValueError) as e:
+                    raise SystemExit(f"Cannot export {args.history_file}: {e}")
+                count = export(out, store, args.kind, fmt, compress)
+            finally:
+                store.close()
+            summary = f"{count} {'readings' if args.kind == 'readings' else 'journal entries'}"
+        out.flush()
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`); not an error for a stream
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"{summary} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f}/s), peak RSS {peak_rss_mb():.0f} MB",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
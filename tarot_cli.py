@@ -0,0 +1,128 @@
+"""Command-line readings, without Kivy.
+
+Draws readings for batch jobs and scripts from the same deck, spreads and
+meanings as the app, but imports nothing from Kivy, so a run starts in
+tens of milliseconds instead of opening a window. Readings are streamed
+to stdout as JSON Lines, one reading per line:
+
+    {"seed": 42, "index": 0, "spread": "Past-Present-Future", "share_code": "...",
+     "cards": [{"position": "Past influences", "card": "The Star", "orientation": "Upright"}, ...]}
+
+A seed makes the whole stream reproducible: the same seed, spread and
+count always print the same readings. Without one a random seed is
+chosen; every line records it.
+
+Usage:
+    python tarot_cli.py draw --spread "Celtic Cross" --count 1000 --seed 42 > readings.jsonl
+    python tarot_cli.py draw --cards 2 --meanings --language es
+    python tarot_cli.py decode 47sKPRGcemTnrp
+    python tarot_cli.py spreads
+"""
+import argparse
+import json
+import os
+import sys
+
+from card_codec import parse_share_code, share_code
+from tarot_engine import SPREADS, DrawEngine, spread_info, tarot_cards
+
+CUSTOM_SPREAD = "Custom"
+
+
+def reading_record(spread_name, cards, orientations, meanings=None, language=None):
+    """JSON-ready dict of one reading; meanings adds each card's keywords"""
+    positions = spread_info(spread_name, len(cards))["positions"]
+    record = {
+        "spread": spread_name,
+        "share_code": share_code(spread_name, cards, orientations),
+        "cards": [{"position": position, "card": card, "orientation": orientation}
+                  for position, card, orientation in zip(positions, cards, orientations)],
+    }
+    if meanings is not None:
+        for card in record["cards"]:
+            card["meaning"] = meanings.meaning(card["card"], card["orientation"], language)
+    return record
+
+
+def draw_readings(spread_name, count, seed=None, num_cards=None, meanings=None, language=None):
+    """Yield `count` reading records drawn from one seeded engine"""
+    engine = DrawEngine(seed)
+    num_cards = num_cards or SPREADS[spread_name]["cards"]
+    for index in range(count):
+        cards, orientations = engine.draw(num_cards)
+        record = {"seed": engine.seed, "index": index}
+        record.update(reading_record(spread_name, cards, orientations, meanings, language))
+        yield record
+
+
+def write_jsonl(records, out=None):
+    out = out or sys.stdout
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_meanings(language):
+    # Imported only when asked for: it reads the meanings index
+    from card_meanings import CARD_MEANINGS
+    if language is not None and language not in CARD_MEANINGS.languages:
+        raise SystemExit(f"Unknown language {language!r}; available: {', '.join(sorted(CARD_MEANINGS.languages))}")
+    return CARD_MEANINGS
+
+
+def cmd_draw(args):
+    if args.cards is not None and not 0 < args.cards <= len(tarot_cards):
+        raise SystemExit(f"--cards must be between 1 and {len(tarot_cards)}")
+    spread_name = CUSTOM_SPREAD if args.cards else args.spread
+    meanings = load_meanings(args.language) if args.meanings else None
+    write_jsonl(draw_readings(spread_name, args.count, args.seed, args.cards, meanings, args.language))
+
+
+def cmd_decode(args):
+    meanings = load_meanings(args.language) if args.meanings else None
+    records = []
+    for code in args.codes:
+        try:
+            spread_name, cards, orientations = parse_share_code(code)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        records.append(reading_record(spread_name or CUSTOM_SPREAD, cards, orientations, meanings, args.language))
+    write_jsonl(records)
+
+
+def cmd_spreads(args):
+    write_jsonl({"spread": name, **spread} for name, spread in SPREADS.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    draw = commands.add_parser("draw", help="draw readings as JSON Lines")
+    draw.add_argument("--spread", choices=list(SPREADS), default="Past-Present-Future")
+    draw.add_argument("--cards", type=int, help="draw a custom spread of this many cards instead")
+    draw.add_argument("--count", type=int, default=1, help="readings to draw")
+    draw.add_argument("--seed", type=int, help="seed of the run (default: random, recorded on every line)")
+    draw.set_defaults(run=cmd_draw)
+
+    decode = commands.add_parser("decode", help="expand share codes into readings")
+    decode.add_argument("codes", nargs="+")
+    decode.set_defaults(run=cmd_decode)
+
+    for command in (draw, decode):
+        command.add_argument("--meanings", action="store_true", help="add each card's keywords")
+        command.add_argument("--language", help="language of the meanings (default: English)")
+
+    spreads = commands.add_parser("spreads", help="list the spreads")
+    spreads.set_defaults(run=cmd_spreads)
+
+    args = parser.parse_args(argv)
+    try:
+        args.run(args)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader stopped early (e.g. `| head`); not an error for a stream
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+if __name__ == "__main__":
+    main()
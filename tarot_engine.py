@@ -0,0 +1,188 @@
+"""Deck, spreads and card draws, independent of Kivy.
+
+Everything here runs without Kivy, so readings can be generated and
+checked on a server or in a batch job. Single draws use `random.Random`;
+the batch API uses NumPy, which is imported only when a batch is drawn
+and is not needed by the app itself.
+"""
+import random
+
+suits = ["Wands", "Cups", "Swords", "Pentacles"]
+ranks = ["Ace", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine", "Ten", "Page", "Knight", "Queen", "King"]
+major_arcana = ["The Fool", "The Magician", "The High Priestess", "The Empress", "The Emperor", "The Hierophant", "The Lovers",
+                "The Chariot", "Strength", "The Hermit", "Wheel of Fortune", "Justice", "The Hanged Man", "Death",
+                "Temperance", "The Devil", "The Tower", "The Star", "The Moon", "The Sun", "Judgement", "The World"]
+
+# Full deck: minor arcana by suit, then the major arcana. A card's index in
+# this list is its id in batch draws.
+tarot_cards = [f"{rank} of {suit}" for suit in suits for rank in ranks] + major_arcana
+
+ORIENTATIONS = ("Upright", "Reversed")
+
+# Spread definitions
+SPREADS = {
+    "Daily Guidance": {
+        "cards": 1,
+        "positions": ["Your guidance for today"],
+        "description": "A single card to guide your day"
+    },
+    "Past-Present-Future": {
+        "cards": 3,
+        "positions": ["Past influences", "Present situation", "Future potential"],
+        "description": "Classic three-card timeline reading"
+    },
+    "Love & Relationships": {
+        "cards": 5,
+        "positions": ["You in love", "Your partner", "The relationship", "Challenges", "Outcome"],
+        "description": "Deep dive into your romantic life"
+    },
+    "Career Path": {
+        "cards": 4,
+        "positions": ["Current career", "Hidden talents", "Obstacles", "Next steps"],
+        "description": "Navigate your professional journey"
+    },
+    "Celtic Cross": {
+        "cards": 10,
+        "positions": ["Present", "Challenge", "Distant Past", "Recent Past", "Possible Outcome",
+                     "Near Future", "Your Approach", "External Influences", "Hopes & Fears", "Final Outcome"],
+        "description": "The most comprehensive tarot spread"
+    },
+    "Chakra Balance": {
+        "cards": 7,
+        "positions": ["Root Chakra", "Sacral Chakra", "Solar Plexus", "Heart Chakra",
+                     "Throat Chakra", "Third Eye", "Crown Chakra"],
+        "description": "Align your spiritual energy centers"
+    }
+}
+
+
+def spread_info(spread_name, num_cards=None):
+    """SPREADS entry for a spread, or generic positions for an unknown one"""
+    if spread_name in SPREADS:
+        return SPREADS[spread_name]
+    num_cards = num_cards or 1
+    return {"cards": num_cards, "positions": [f"Card {i+1}" for i in range(num_cards)], "description": ""}
+
+
+class DrawEngine:
+    """Draws readings from an explicit, reproducible random stream.
+
+    `seed` may be any int; without one a random 64-bit seed is chosen and
+    kept in `self.seed`, so any reading can be reproduced later by building
+    an engine with the same seed and drawing the same sequence. Single
+    draws and batch draws use separate streams derived from that seed.
+    """
+    def __init__(self, seed=None, deck=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.deck = list(deck if deck is not None else tarot_cards)
+        self.rng = random.Random(seed)
+        self._batch_rng = None
+
+    def draw(self, num_cards):
+        """Draw distinct cards and their orientations for one reading"""
+        if not 0 < num_cards <= len(self.deck):
+            raise ValueError(f"Cannot draw {num_cards} cards from a deck of {len(self.deck)}")
+        cards = self.rng.sample(self.deck, num_cards)
+        orientations = [ORIENTATIONS[self.rng.getrandbits(1)] for _ in range(num_cards)]
+        return cards, orientations
+
+    def draw_spread(self, spread_name):
+        return self.draw(SPREADS[spread_name]["cards"])
+
+    @property
+    def batch_rng(self):
+        """NumPy Generator for batch draws, created on first use"""
+        if self._batch_rng is None:
+            import numpy as np
+            self._batch_rng = np.random.default_rng(self.seed)
+        return self._batch_rng
+
+    def draw_batch(self, count, num_cards):
+        """Draw `count` readings of `num_cards` cards in one call.
+
+        Returns `(cards, orientations)`:
+
+        - `cards`: uint8 array of shape (count, num_cards) holding indices
+          into `self.deck`, in draw order, distinct within each row.
+        - `orientations`: packed bits, uint8 array of shape
+          (count, ceil(num_cards / 8)); bit j of row i (most significant
+          bit first, as `numpy.packbits`) is set when card j is reversed.
+          Unused trailing bits are zero.
+
+        Memory is about `count * (78 + num_cards / 8)` bytes; draw large
+        runs in chunks.
+        """
+        import numpy as np
+        deck_size = len(self.deck)
+        if not 0 < num_cards <= deck_size:
+            raise ValueError(f"Cannot draw {num_cards} cards from a deck of {deck_size}")
+        rng = self.batch_rng
+
+        if num_cards < deck_size // 4:
+            # Partial Fisher-Yates, one vectorized swap per drawn position:
+            # every spread draws far fewer cards than a full shuffle moves.
+            decks = np.tile(np.arange(deck_size, dtype=np.uint8), (count, 1))
+            rows = np.arange(count)
+            for j in range(num_cards):
+                picks = rng.integers(j, deck_size, size=count)
+                chosen = decks[rows, picks]
+                decks[rows, picks] = decks[:, j]
+                decks[:, j] = chosen
+            cards = decks[:, :num_cards]
+        else:
+            # Shuffle every row of the deck independently and keep the top cards
+            decks = np.broadcast_to(np.arange(deck_size, dtype=np.uint8), (count, deck_size))
+            cards = rng.permuted(decks, axis=1)[:, :num_cards]
+
+        orientations = rng.integers(0, 256, size=(count, (num_cards + 7) // 8), dtype=np.uint8)
+        if num_cards % 8:
+            orientations[:, -1] &= (0xFF << (8 - num_cards % 8)) & 0xFF
+        return np.ascontiguousarray(cards), orientations
+
+    def batch_readings(self, cards, orientations):
+        """Turn batch arrays back into (card names, orientation names) pairs"""
+        num_cards = cards.shape[1]
+        reversed_bits = unpack_orientations(orientations, num_cards)
+        for row, bits in zip(cards.tolist(), reversed_bits.tolist()):
+            yield [self.deck[i] for i in row], [ORIENTATIONS[b] for b in bits]
+
+
+def unpack_orientations(orientations, num_cards):
+    """Packed orientation bits to a (count, num_cards) array of 0/1"""
+    import numpy as np
+    return np.unpackbits(orientations, axis=1, count=num_cards)
+
+
+def validate_reading(cards, orientations, spread_name=None, deck=None):
+    """Raise ValueError unless a reading could have come from a fair draw"""
+    deck = set(deck if deck is not None else tarot_cards)
+    if len(cards) != len(orientations):
+        raise ValueError(f"{len(cards)} cards but {len(orientations)} orientations")
+    if spread_name is not None and spread_name in SPREADS and len(cards) != SPREADS[spread_name]["cards"]:
+        raise ValueError(f"{spread_name} takes {SPREADS[spread_name]['cards']} cards, got {len(cards)}")
+    unknown = [card for card in cards if card not in deck]
+    if unknown:
+        raise ValueError(f"Unknown cards: {unknown}")
+    if len(set(cards)) != len(cards):
+        raise ValueError("A card was drawn more than once")
+    invalid = [o for o in orientations if o not in ORIENTATIONS]
+    if invalid:
+        raise ValueError(f"Unknown orientations: {invalid}")
+
+
+def validate_batch(cards, orientations, deck_size=len(tarot_cards)):
+    """Boolean array marking the batch rows that are valid readings.
+
+    A row is valid when all its indices are in the deck, no index repeats
+    and no orientation bit is set past the last card.
+    """
+    import numpy as np
+    num_cards = cards.shape[1]
+    in_deck = (cards < deck_size).all(axis=1)
+    ordered = np.sort(cards, axis=1)
+    distinct = (np.diff(ordered, axis=1) != 0).all(axis=1)
+    padding = np.unpackbits(orientations, axis=1)[:, num_cards:]
+    clean = ~padding.any(axis=1)
+    return in_deck & distinct & clean
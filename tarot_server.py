@@ -0,0 +1,317 @@
+"""Local HTTP service serving readings, meanings and history to several frontends.
+
+A single asyncio process, on the standard library only. Requests are
+HTTP/1.1 with keep-alive; every response is JSON:
+
+    GET  /spreads                                   the spreads and their positions
+    GET  /draw?spread=Celtic+Cross[&seed=42]        draw a reading ([&cards=N] for a custom spread;
+                                                    [&meanings=1&language=es] adds the keywords)
+    POST /draw?spread=...                           draw one and record it in the history
+    GET  /meaning?card=The+Fool[&orientation=Reversed][&language=es]
+    GET  /history?kind=readings|journal[&offset=0&limit=20][&q=words]
+    POST /journal   {"text": "..."}                 add a journal entry
+
+Draws and meanings are answered on the event loop: both are in-memory
+lookups. Everything touching the history goes through `HistoryExecutor`:
+one thread that makes the ReadingHistoryManager calls in turn, as the app
+does from its UI thread, behind a cap on pending calls. A full queue
+answers 503 at once instead of letting requests pile up. As in the app,
+adds are written behind by a WriteBehindWorker, so a burst of journal
+entries costs one write.
+
+Usage:
+    python tarot_server.py --port 8765 --storage sqlite
+"""
+import argparse
+import asyncio
+import json
+import logging
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from history import HISTORY_FILE, STORAGE_BACKENDS, ReadingHistoryManager
+from persistence import WriteBehindWorker
+from tarot_cli import CUSTOM_SPREAD, reading_record
+from tarot_engine import ORIENTATIONS, SPREADS, DrawEngine, tarot_cards
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+DEFAULT_PORT = 8765
+MAX_PENDING = 1024
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+MAX_PAGE = 100
+MAX_JOURNAL_TEXT = 10_000
+KEEP_ALIVE_TIMEOUT = 15.0
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class HistoryExecutor:
+    """Runs ReadingHistoryManager calls off the event loop, one at a time.
+
+    The manager is built on the executor thread too, so even its first
+    history load never blocks the loop. At most `max_pending` calls may be
+    queued or running; past that `run` raises HTTPError(503).
+    """
+    def __init__(self, storage, history_file, max_pending=MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="History")
+        self._slots = asyncio.Semaphore(max_pending)
+        self.persistence = WriteBehindWorker()
+        self.manager = None
+        self._storage = storage
+        self._history_file = history_file
+
+    async def start(self):
+        self.manager = await self._loop_run(ReadingHistoryManager, self._storage, self._history_file,
+                                            self.persistence)
+
+    def _loop_run(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def run(self, fn, *args):
+        if self._slots.locked():
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "History queue is full, retry later")
+        async with self._slots:
+            return await self._loop_run(fn, *args)
+
+    async def close(self):
+        if self.manager is not None:
+            await self._loop_run(self.persistence.stop)
+            await self._loop_run(self.manager.close)
+        self._executor.shutdown()
+
+
+class TarotService:
+    """Routes requests to handlers; each returns (status, JSON-ready body)"""
+    def __init__(self, history):
+        self.history = history
+        self._meanings = None
+        self.routes = {
+            ("GET", "/spreads"): self.get_spreads,
+            ("GET", "/draw"): self.get_draw,
+            ("POST", "/draw"): self.post_draw,
+            ("GET", "/meaning"): self.get_meaning,
+            ("GET", "/history"): self.get_history,
+            ("POST", "/journal"): self.post_journal,
+        }
+
+    @property
+    def meanings(self):
+        if self._meanings is None:
+            from card_meanings import CARD_MEANINGS
+            self._meanings = CARD_MEANINGS
+        return self._meanings
+
+    async def handle(self, method, target, body):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        return await handler(dict(parse_qsl(url.query)), body)
+
+    def _language(self, params):
+        language = params.get("language")
+        if language is not None and language not in self.meanings.languages:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown language {language!r}")
+        return language
+
+    def _draw(self, params):
+        seed = _int_param(params, "seed")
+        num_cards = _int_param(params, "cards")
+        if num_cards is not None:
+            if not 0 < num_cards <= len(tarot_cards):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"cards must be between 1 and {len(tarot_cards)}")
+            spread_name = CUSTOM_SPREAD
+        else:
+            spread_name = params.get("spread", "Daily Guidance")
+            if spread_name not in SPREADS:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown spread {spread_name!r}")
+            num_cards = SPREADS[spread_name]["cards"]
+        engine = DrawEngine(seed)
+        cards, orientations = engine.draw(num_cards)
+        meanings = self.meanings if params.get("meanings") == "1" else None
+        language = self._language(params) if meanings is not None else None
+        record = {"seed": engine.seed}
+        record.update(reading_record(spread_name, cards, orientations, meanings, language))
+        return spread_name, cards, orientations, record
+
+    async def get_spreads(self, params, body):
+        return HTTPStatus.OK, [{"spread": name, **spread} for name, spread in SPREADS.items()]
+
+    async def get_draw(self, params, body):
+        return HTTPStatus.OK, self._draw(params)[3]
+
+    async def post_draw(self, params, body):
+        spread_name, cards, orientations, record = self._draw(params)
+        await self.history.run(self.history.manager.add_reading, spread_name, cards, orientations)
+        return HTTPStatus.CREATED, record
+
+    async def get_meaning(self, params, body):
+        card = params.get("card")
+        orientation = params.get("orientation", "Upright")
+        if orientation not in ORIENTATIONS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"orientation must be one of {', '.join(ORIENTATIONS)}")
+        record = self.meanings.record(card, self._language(params)) if card else None
+        if record is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown card {card!r}")
+        return HTTPStatus.OK, {"card": card, "orientation": orientation,
+                               "meaning": record.get(orientation.lower()), "description": record.get("description")}
+
+    async def get_history(self, params, body):
+        kind = params.get("kind", "readings")
+        if kind not in ("readings", "journal"):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "kind must be readings or journal")
+        offset = max(0, _int_param(params, "offset") or 0)
+        limit = min(MAX_PAGE, max(1, _int_param(params, "limit") or 20))
+        manager = self.history.manager
+        query = params.get("q", "").strip()
+        if query:
+            entries = await self.history.run(manager.search, query, kind, offset, limit)
+            return HTTPStatus.OK, {"kind": kind, "query": query, "offset": offset, "entries": entries}
+        entries, total = await self.history.run(_page, manager, kind, offset, limit)
+        return HTTPStatus.OK, {"kind": kind, "offset": offset, "total": total, "entries": entries}
+
+    async def post_journal(self, params, body):
+        try:
+            text = json.loads(body or b"{}").get("text")
+        except (ValueError, AttributeError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "text is required")
+        if len(text) > MAX_JOURNAL_TEXT:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"text is limited to {MAX_JOURNAL_TEXT} characters")
+        await self.history.run(self.history.manager.add_journal_entry, text.strip())
+        return HTTPStatus.CREATED, {"added": "journal"}
+
+
+def _page(manager, kind, offset, limit):
+    if kind == "readings":
+        return manager.get_readings(offset, limit), manager.count_readings()
+    return manager.get_journal(offset, limit), manager.count_journal()
+
+
+def _int_param(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+
+
+async def read_request(reader):
+    """(method, target, headers, body) of the next request, or None at end of stream"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    headers[":version"] = version
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Bad Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def encode_response(status, body, keep_alive):
+    payload = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + payload
+
+
+async def serve_connection(service, reader, writer):
+    try:
+        while True:
+            # Until a request has been read whole, an error ends the connection
+            keep_alive = False
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (headers[":version"] == "HTTP/1.1" or connection == "keep-alive")
+                status, payload = await service.handle(method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": str(e)}
+            except Exception as e:
+                Logger.exception(f"Server: Failed to handle request: {e}")
+                status, payload, keep_alive = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error"}, False
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_server(host, port, storage, history_file, max_pending=MAX_PENDING):
+    history = HistoryExecutor(storage, history_file, max_pending)
+    await history.start()
+    service = TarotService(history)
+    # Opens (or builds) the meanings index now rather than on the first request
+    service.meanings
+    server = await asyncio.start_server(lambda r, w: serve_connection(service, r, w), host, port,
+                                        limit=MAX_HEADER_BYTES, backlog=4096)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+    Logger.info(f"Server: Serving on http://{host}:{port} ({storage} history in {history_file})")
+    async with server:
+        await stop.wait()
+    Logger.info("Server: Shutting down")
+    await history.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--storage", choices=list(STORAGE_BACKENDS), default="sqlite",
+                        help="history backend (sqlite keeps every entry; the others keep the app's caps)")
+    parser.add_argument("--history-file", default=HISTORY_FILE)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="history calls queued before requests get 503")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(run_server(args.host, args.port, args.storage, args.history_file, args.max_pending))
+
+
+if __name__ == "__main__":
+    main()
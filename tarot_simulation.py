@@ -0,0 +1,234 @@
+"""Monte Carlo fairness audit of the draw engine.
+
+Draws N readings per spread with DrawEngine.draw_batch and tallies, per
+spread, how often every card lands in every position and how often it is
+reversed. Uniformity is checked with Pearson's chi-square test: per
+position and overall across the 78 cards, and for the reversal rate
+against 50%.
+
+The work is cut into fixed-size jobs whose seeds are spawned from one
+numpy SeedSequence, so a run is reproducible from its seed and gives the
+same counts with any number of worker processes.
+
+Usage:
+    python tarot_simulation.py --readings 10000000 --workers 8 --json report.json --csv report.csv
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tarot_engine import ORIENTATIONS, SPREADS, DrawEngine, tarot_cards, unpack_orientations
+
+DEFAULT_CHUNK = 500_000
+
+
+def chi2_sf(statistic, df):
+    """Upper-tail p-value of the chi-square distribution"""
+    return _gammaincc(df / 2.0, statistic / 2.0)
+
+
+def _gammaincc(a, x):
+    # Regularized upper incomplete gamma Q(a, x): power series below a + 1,
+    # Lentz's continued fraction above (Numerical Recipes, 6.2).
+    if x <= 0:
+        return 1.0
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        for _ in range(10000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefactor) * h
+
+
+def chi_square(observed, expected):
+    """Pearson chi-square of observed counts against expected counts"""
+    statistic = float(sum((o - e) ** 2 / e for o, e in zip(observed, expected)))
+    df = len(observed) - 1
+    return {"statistic": statistic, "df": df, "p_value": chi2_sf(statistic, df)}
+
+
+def _tally(job):
+    """Per-position card counts and reversal counts for one job of readings"""
+    import numpy as np
+    seed, num_cards, count = job
+    deck_size = len(tarot_cards)
+    cards, orientations = DrawEngine(seed).draw_batch(count, num_cards)
+    reversed_bits = unpack_orientations(orientations, num_cards).astype(bool)
+
+    # One bincount over (position, card) pairs instead of a loop per position
+    cells = cards + np.arange(num_cards, dtype=np.int64) * deck_size
+    size = num_cards * deck_size
+    counts = np.bincount(cells.ravel(), minlength=size).reshape(num_cards, deck_size)
+    reversed_counts = np.bincount(cells[reversed_bits], minlength=size).reshape(num_cards, deck_size)
+    return counts, reversed_counts
+
+
+def check_run(readings, workers=1, chunk_size=DEFAULT_CHUNK):
+    """Raise ValueError unless every size of a run is at least 1"""
+    for name, value in (("readings", readings), ("workers", workers), ("chunk_size", chunk_size)):
+        if value < 1:
+            raise ValueError(f"{name} must be at least 1, got {value}")
+
+
+def plan_jobs(spreads, readings, seed, chunk_size=DEFAULT_CHUNK):
+    """(spread name, (seed, num_cards, count)) for every job of the run"""
+    import numpy as np
+    work = []
+    for spread_name in spreads:
+        for start in range(0, readings, chunk_size):
+            work.append((spread_name, SPREADS[spread_name]["cards"], min(chunk_size, readings - start)))
+    children = np.random.SeedSequence(seed).spawn(len(work))
+    return [(spread_name, (int(child.generate_state(1, np.uint64)[0]), num_cards, count))
+            for (spread_name, num_cards, count), child in zip(work, children)]
+
+
+def simulate(readings, spreads=None, seed=None, workers=1, chunk_size=DEFAULT_CHUNK):
+    """Run the simulation and return the report as a dict"""
+    import numpy as np
+    check_run(readings, workers, chunk_size)
+    spreads = list(spreads or SPREADS)
+    if seed is None:
+        seed = DrawEngine().seed
+    jobs = plan_jobs(spreads, readings, seed, chunk_size)
+
+    started = time.perf_counter()
+    totals = {name: None for name in spreads}
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_tally, [job for _, job in jobs]))
+    else:
+        results = [_tally(job) for _, job in jobs]
+    for (spread_name, _), (counts, reversed_counts) in zip(jobs, results):
+        if totals[spread_name] is None:
+            totals[spread_name] = [counts, reversed_counts]
+        else:
+            totals[spread_name][0] += counts
+            totals[spread_name][1] += reversed_counts
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "seed": seed,
+        "readings_per_spread": readings,
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "elapsed_s": elapsed,
+        "cards_drawn": int(sum(readings * SPREADS[name]["cards"] for name in spreads)),
+        "deck": tarot_cards,
+        "spreads": {}
+    }
+    for spread_name, (counts, reversed_counts) in totals.items():
+        report["spreads"][spread_name] = spread_report(spread_name, readings, counts, reversed_counts)
+    return report
+
+
+def spread_report(spread_name, readings, counts, reversed_counts):
+    deck_size = len(tarot_cards)
+    num_cards = counts.shape[0]
+    card_counts = counts.sum(axis=0)
+    card_reversed = reversed_counts.sum(axis=0)
+    drawn = readings * num_cards
+    total_reversed = int(card_reversed.sum())
+
+    positions = []
+    for j, position in enumerate(SPREADS[spread_name]["positions"]):
+        position_reversed = int(reversed_counts[j].sum())
+        positions.append({
+            "position": position,
+            "counts": counts[j].tolist(),
+            "chi2": chi_square(counts[j], [readings / deck_size] * deck_size),
+            "reversal_rate": position_reversed / readings,
+        })
+
+    return {
+        "cards": num_cards,
+        "readings": readings,
+        "card_counts": card_counts.tolist(),
+        "card_frequencies": (card_counts / drawn).tolist(),
+        "card_chi2": chi_square(card_counts, [drawn / deck_size] * deck_size),
+        "card_reversal_rates": (card_reversed / card_counts.clip(min=1)).tolist(),
+        "reversal_rate": total_reversed / drawn,
+        "reversal_chi2": chi_square([total_reversed, drawn - total_reversed], [drawn / 2] * len(ORIENTATIONS)),
+        "positions": positions,
+    }
+
+
+def write_csv(report, path):
+    """Long-format frequencies: one row per spread, position and card"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["spread", "position", "card", "count", "expected", "frequency"])
+        deck = report["deck"]
+        for spread_name, spread in report["spreads"].items():
+            readings = spread["readings"]
+            for position in spread["positions"]:
+                for card, count in zip(deck, position["counts"]):
+                    writer.writerow([spread_name, position["position"], card, count,
+                                     readings / len(deck), count / readings])
+            drawn = readings * spread["cards"]
+            for card, count in zip(deck, spread["card_counts"]):
+                writer.writerow([spread_name, "all", card, count, drawn / len(deck), count / drawn])
+
+
+def print_summary(report):
+    print(f"seed {report['seed']}, {report['readings_per_spread']} readings per spread, "
+          f"{report['cards_drawn']} cards in {report['elapsed_s']:.2f}s with {report['workers']} worker(s)")
+    print(f"{'spread':<24} {'card chi2':>10} {'p':>7} {'worst position p':>17} {'reversed':>9} {'p':>7}")
+    for spread_name, spread in report["spreads"].items():
+        worst = min(position["chi2"]["p_value"] for position in spread["positions"])
+        print(f"{spread_name:<24} {spread['card_chi2']['statistic']:>10.2f} {spread['card_chi2']['p_value']:>7.3f} "
+              f"{worst:>17.3f} {spread['reversal_rate']:>9.5f} {spread['reversal_chi2']['p_value']:>7.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readings", type=int, default=1_000_000, help="readings per spread")
+    parser.add_argument("--spread", action="append", choices=list(SPREADS), dest="spreads",
+                        help="spread to simulate (repeatable; default: all)")
+    parser.add_argument("--seed", type=int, help="seed of the run (default: random, printed)")
+    parser.add_argument("--workers", type=int, default=1, help=f"worker processes (this machine has {os.cpu_count()})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="readings per job")
+    parser.add_argument("--json", help="write the full report as JSON")
+    parser.add_argument("--csv", help="write per-card frequencies as CSV")
+    args = parser.parse_args(argv)
+    for flag, value in (("--readings", args.readings), ("--workers", args.workers), ("--chunk-size", args.chunk_size)):
+        if value < 1:
+            parser.error(f"{flag} must be at least 1")
+
+    report = simulate(args.readings, args.spreads, args.seed, args.workers, args.chunk_size)
+    print_summary(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.csv:
+        write_csv(report, args.csv)
+
+
+if __name__ == "__main__":
+    main()
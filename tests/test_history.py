@@ -0,0 +1,46 @@
+from datetime import date, datetime
+
+import pytest
+
+from card_codec import compact_reading
+from history import STORAGE_BACKENDS, HistorySummary, ReadingHistoryManager
+from tarot_engine import tarot_cards
+
+
+def reading(spread):
+    return compact_reading({"date": datetime.now().isoformat(timespec="seconds"), "spread": spread,
+                            "cards": tarot_cards[:3], "orientations": ["Upright"] * 3, "notes": ""})
+
+
+@pytest.mark.parametrize("storage", list(STORAGE_BACKENDS))
+def test_summary_is_reused_while_it_matches_the_store(tmp_path, storage, monkeypatch):
+    history_file = str(tmp_path / "tarot_history.json")
+    manager = ReadingHistoryManager(storage, history_file)
+    manager.add_reading("Daily Card", tarot_cards[:1], ["Upright"])
+    manager.close()
+
+    def rebuild(store):
+        raise AssertionError("summary rebuilt")
+    monkeypatch.setattr(HistorySummary, "from_store", classmethod(lambda cls, store: rebuild(store)))
+    reopened = ReadingHistoryManager(storage, history_file)
+    assert reopened.summary.reading_count == 1
+    reopened.close()
+
+
+@pytest.mark.parametrize("storage", list(STORAGE_BACKENDS))
+def test_summary_is_rebuilt_when_the_store_moved_on(tmp_path, storage):
+    history_file = str(tmp_path / "tarot_history.json")
+    today = date.today().isoformat()
+    manager = ReadingHistoryManager(storage, history_file)
+    manager.add_reading("Daily Card", tarot_cards[:1], ["Upright"])
+    # Crash between the store's flush and the summary's save
+    store = manager.store
+    store.add("readings", reading("Past-Present-Future"))
+    store.flush()
+
+    reopened = ReadingHistoryManager(storage, history_file)
+    assert reopened.summary.reading_count == 2
+    assert reopened.has_reading_on(today, "Past-Present-Future")
+    assert reopened.has_reading_on(today, "Daily Card")
+    reopened.close()
+    store.close()
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+import tarot_bulk
+
+
+@pytest.mark.parametrize("storage", ["json", "log"])
+def test_export_leaves_a_corrupt_history_alone(tmp_path, storage):
+    history_file = tmp_path / "tarot_history.json"
+    history_file.write_bytes(b'{"readings": [{"date": "2024-')
+
+    with pytest.raises(SystemExit) as exit_info:
+        tarot_bulk.main(["export", "--storage", storage, "--history-file", str(history_file),
+                         "-o", str(tmp_path / "out.jsonl")])
+
+    assert exit_info.value.code not in (None, 0)
+    assert "Cannot export" in str(exit_info.value.code)
+    assert history_file.read_bytes() == b'{"readings": [{"date": "2024-'
+    assert not os.path.exists(f"{history_file}.corrupt")
@@ -0,0 +1,24 @@
+import pytest
+
+import tarot_simulation
+
+
+@pytest.mark.parametrize("sizes", [
+    {"readings": 0}, {"readings": -5}, {"readings": 10, "workers": 0}, {"readings": 10, "chunk_size": 0},
+])
+def test_simulate_rejects_empty_runs(sizes):
+    with pytest.raises(ValueError):
+        tarot_simulation.simulate(spreads=["Past-Present-Future"], seed=1, **sizes)
+
+
+@pytest.mark.parametrize("flag", ["--readings", "--workers", "--chunk-size"])
+def test_cli_rejects_sizes_below_one(flag, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        tarot_simulation.main([flag, "0"])
+    assert exit_info.value.code == 2
+    assert f"{flag} must be at least 1" in capsys.readouterr().err
+
+
+def test_simulate_counts_every_card():
+    report = tarot_simulation.simulate(100, ["Past-Present-Future"], seed=1, chunk_size=30)
+    assert sum(report["spreads"]["Past-Present-Future"]["card_counts"]) == 300
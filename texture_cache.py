@@ -0,0 +1,265 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+from queue import Queue
+
+from kivy.atlas import Atlas
+from kivy.cache import Cache
+from kivy.clock import Clock
+from kivy.core.image import ImageLoader
+from kivy.logger import Logger
+
+import tracing
+
+DEFAULT_TEXTURE_BUDGET = 32 * 1024 * 1024
+MIN_TEXTURE_BUDGET = 16 * 1024 * 1024
+MAX_TEXTURE_BUDGET = 128 * 1024 * 1024
+
+
+def default_texture_budget():
+    """A texture budget sized to the device: 1/64 of its RAM, 32 MB on a 2 GB phone"""
+    try:
+        ram = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return DEFAULT_TEXTURE_BUDGET
+    return min(MAX_TEXTURE_BUDGET, max(MIN_TEXTURE_BUDGET, ram // 64))
+
+
+def texture_bytes(texture):
+    """Approximate GPU memory used by an RGBA texture"""
+    width, height = texture.size
+    return width * height * 4
+
+
+def _atlas_name(source):
+    """Kivy's atlas cache key of an atlas:// source, else None"""
+    if source.startswith('atlas://'):
+        return source[8:].rsplit('/', 1)[0]
+    return None
+
+
+class TextureCache:
+    """LRU cache of card textures bounded by a byte budget.
+
+    Memory is accounted per GL texture actually resident: a card loaded
+    from its own image file, or all the pages of an atlas, whose cards are
+    sub-textures sharing them. `resident_bytes` sums the textures used by
+    at least one cached card; `footprint()` breaks it down per texture and
+    per card.
+
+    Once the last cached card of a texture is evicted, the texture is also
+    dropped from Kivy's image, texture and atlas caches, which would
+    otherwise keep it alive, so only widgets still showing it hold it.
+    Pinned sources (the card back) are never evicted.
+    """
+    def __init__(self, budget_bytes=DEFAULT_TEXTURE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.resident_bytes = 0
+        # source -> (texture, card bytes, resource key)
+        self._entries = OrderedDict()
+        # resource key -> [bytes, sources]
+        self._resources = {}
+        self._pinned = set()
+
+    def __contains__(self, source):
+        return source in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, source):
+        """Return the resident texture for a source, marking it recently used"""
+        entry = self._entries.get(source)
+        if entry is None:
+            return None
+        self._entries.move_to_end(source)
+        return entry[0]
+
+    def put(self, source, texture):
+        old = self._entries.pop(source, None)
+        key = old[2] if old else self._resource_for(source, texture)
+        self._entries[source] = (texture, texture_bytes(texture), key)
+        # Never evict the texture that was just added, even if it alone
+        # exceeds the budget.
+        while self.resident_bytes > self.budget_bytes:
+            victim = next((s for s in self._entries if s != source and s not in self._pinned), None)
+            if victim is None:
+                break
+            self.evict(victim)
+        self._report()
+
+    def _report(self):
+        tracing.counter("texture_cache", resident_mb=self.resident_bytes / (1024 * 1024), textures=len(self._entries))
+
+    def _resource_for(self, source, texture):
+        """Register `source` with the GL texture(s) holding it; returns their key"""
+        rfn = _atlas_name(source)
+        key = ('atlas', rfn) if rfn else ('file', source)
+        resource = self._resources.get(key)
+        if resource is None:
+            atlas = Cache.get('kv.atlas', rfn) if rfn else None
+            if atlas is not None:
+                size = sum(texture_bytes(page) for page in atlas.original_textures)
+            else:
+                size = texture_bytes(texture)
+            resource = self._resources[key] = [size, set()]
+            self.resident_bytes += size
+        resource[1].add(source)
+        return key
+
+    def evict(self, source):
+        entry = self._entries.pop(source, None)
+        if entry is None:
+            return
+        self._pinned.discard(source)
+        key = entry[2]
+        resource = self._resources[key]
+        resource[1].discard(source)
+        if not resource[1]:
+            del self._resources[key]
+            self.resident_bytes -= resource[0]
+            _unload(key)
+
+    def pin(self, source):
+        """Keep a cached source resident until it is unpinned"""
+        if source in self._entries:
+            self._pinned.add(source)
+
+    def unpin(self, source):
+        self._pinned.discard(source)
+
+    def clear(self):
+        """Evict every source that is not pinned"""
+        for source in [s for s in self._entries if s not in self._pinned]:
+            self.evict(source)
+        self._report()
+
+    def footprint(self):
+        """Debug snapshot of what is resident, in bytes"""
+        return {
+            "budget_bytes": self.budget_bytes,
+            "resident_bytes": self.resident_bytes,
+            "textures": [{"texture": name, "bytes": size, "cards": sorted(sources)}
+                         for (_, name), (size, sources) in self._resources.items()],
+            "cards": {source: size for source, (_, size, _) in self._entries.items()},
+            "pinned": sorted(self._pinned),
+        }
+
+
+def _unload(key):
+    """Drop a texture from Kivy's caches so it is freed once no widget shows it"""
+    kind, name = key
+    if kind == 'file':
+        Cache.remove('kv.image', f'{name}|0|0')
+        Cache.remove('kv.texture', f'{name}|0|0')
+        return
+    atlas = Cache.get('kv.atlas', name)
+    if atlas is None:
+        return
+    Cache.remove('kv.atlas', name)
+    for uid in atlas.textures:
+        Cache.remove('kv.texture', f'atlas://{name}/{uid}|0|0')
+    # Pages are loaded as images next to the .atlas file, as Atlas does
+    atlas_file = atlas.filename
+    try:
+        with open(atlas_file, 'r') as f:
+            pages = list(json.load(f))
+    except (OSError, ValueError):
+        return
+    for page in pages:
+        page_file = os.path.join(os.path.dirname(atlas_file), page)
+        Cache.remove('kv.image', f'{page_file}|0|0')
+        Cache.remove('kv.texture', f'{page_file}|0|0')
+
+
+class TexturePrefetcher:
+    """Decodes upcoming card images off the main thread into a TextureCache.
+
+    Decoding runs on a worker thread; the GL upload happens on the main
+    thread through the Clock, as GL calls must. Atlas sources decode their
+    pages once and are then served as sub-textures of the shared atlas.
+    """
+    def __init__(self, cache):
+        self.cache = cache
+        self._queue = Queue()
+        self._generation = 0
+        self._thread = None
+
+    def prefetch(self, sources):
+        """Queue sources for loading, replacing any previously queued work"""
+        self.cancel()
+        atlases = OrderedDict()
+        for source in sources:
+            if not source or source in self.cache:
+                continue
+            if source.startswith('atlas://'):
+                rfn, uid = source[8:].rsplit('/', 1)
+                atlas = Cache.get('kv.atlas', rfn)
+                if atlas is not None:
+                    self.cache.put(source, atlas[uid])
+                else:
+                    atlases.setdefault(rfn, []).append(source)
+            else:
+                self._queue.put((self._generation, self._load_file, source))
+
+        for rfn, atlas_sources in atlases.items():
+            self._queue.put((self._generation, self._load_atlas, (rfn, atlas_sources)))
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="TexturePrefetcher", daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        """Drop queued work; textures decoded for older requests are discarded"""
+        self._generation += 1
+
+    def _run(self):
+        while True:
+            generation, load, job = self._queue.get()
+            if generation != self._generation:
+                continue
+            try:
+                load(generation, job)
+            except Exception as e:
+                Logger.warning(f"TexturePrefetcher: Failed to load {job}: {e}")
+
+    def _load_file(self, generation, source):
+        with tracing.span("texture.decode", "texture", source=source):
+            image = ImageLoader.load(source, nocache=True)
+        Clock.schedule_once(partial(self._upload_file, generation, source, image))
+
+    def _upload_file(self, generation, source, image, dt):
+        if generation == self._generation and source not in self.cache:
+            with tracing.span("texture.upload", "texture", source=source):
+                self.cache.put(source, image.texture)
+
+    def _load_atlas(self, generation, job):
+        rfn, sources = job
+        atlas_file = os.path.abspath(f"{rfn}.atlas")
+        with open(atlas_file, 'r') as f:
+            pages = list(json.load(f))
+        directory = os.path.dirname(atlas_file)
+        images = {}
+        for page in pages:
+            if generation != self._generation:
+                return
+            page_file = os.path.join(directory, page)
+            with tracing.span("texture.decode", "texture", source=page_file):
+                images[page_file] = ImageLoader.load(page_file)
+        Clock.schedule_once(partial(self._upload_atlas, generation, rfn, atlas_file, images, sources))
+
+    @tracing.traced("texture.upload_atlas", "texture")
+    def _upload_atlas(self, generation, rfn, atlas_file, images, sources, dt):
+        if generation != self._generation:
+            return
+        if Cache.get('kv.atlas', rfn) is None:
+            # Atlas() loads its pages through CoreImage, which picks up the
+            # already decoded pages from the kv.image cache and only uploads them.
+            for page_file, image in images.items():
+                Cache.append('kv.image', f'{page_file}|0|0', image)
+            Cache.append('kv.atlas', rfn, Atlas(atlas_file))
+        atlas = Cache.get('kv.atlas', rfn)
+        for source in sources:
+            self.cache.put(source, atlas[source.rsplit('/', 1)[1]])
@@ -0,0 +1,268 @@
+"""Small card images for the History screen and reading previews.
+
+Thumbnails are downscaled once from the deck images and kept on disk, so
+showing one later costs the decode of a few kilobytes of PNG. Each file
+name carries the thumbnail height and the size and mtime of its source,
+so replacing a deck image (or moving to a screen of another density)
+makes new thumbnails without any invalidation step. The cache directory
+is capped in bytes; the oldest thumbnails go first.
+
+Scaling is done by the GPU: the deck image is uploaded with mipmaps and
+drawn into an Fbo of the thumbnail's size, whose pixels are written out.
+"""
+import os
+import threading
+from collections import OrderedDict, deque
+from functools import partial
+from queue import Queue
+
+from kivy.clock import Clock
+from kivy.core.image import ImageLoader
+from kivy.graphics import ClearBuffers, ClearColor, Color, Fbo, PopMatrix, PushMatrix, Rectangle, Rotate
+from kivy.logger import Logger
+from kivy.metrics import dp
+from kivy.uix.image import Image
+
+from card_assets import IMAGE_EXTENSIONS
+import tracing
+
+THUMBNAIL_DIR = "thumbnails/"
+THUMBNAIL_DP = 64
+# 64dp thumbnails are about 50 KB on a 3x screen: two full decks
+MAX_CACHE_BYTES = 8 * 1024 * 1024
+
+
+def thumbnail_height(height_dp=THUMBNAIL_DP):
+    """Pixel height of a thumbnail shown `height_dp` tall on this screen"""
+    return max(1, int(round(dp(height_dp))))
+
+
+def thumbnail_name(stem, height, st):
+    """Cache file name of a source's thumbnail, from its stat result"""
+    return f"{stem}-{height}-{st.st_size:x}-{st.st_mtime_ns:x}.png"
+
+
+def render_thumbnail(image, width, height):
+    """RGBA pixels, bottom row first, of a decoded image drawn at width x height (main thread)"""
+    texture = image.texture
+    # Sampling from the mipmaps averages the source pixels each output pixel covers
+    texture.min_filter = 'linear_mipmap_linear'
+    fbo = Fbo(size=(width, height))
+    with fbo:
+        ClearColor(0, 0, 0, 0)
+        ClearBuffers()
+        Color(1, 1, 1, 1)
+        Rectangle(texture=texture, size=(width, height))
+    fbo.draw()
+    return fbo.pixels
+
+
+def save_png(path, width, height, pixels):
+    """Write RGBA pixels, bottom row first, to `path` through the first image provider that saves PNG"""
+    saver = next(loader for loader in ImageLoader.loaders if loader.can_save('png', False))
+    tmp = path + ".tmp"
+    saver.save(tmp, width, height, 'rgba', pixels, True, 'png')
+    os.replace(tmp, path)
+
+
+class ThumbnailCache:
+    """On-disk cache of card thumbnails, generated on first request.
+
+    `request(card, callback)` returns the thumbnail path of a card when it
+    is already known, else queues it and calls `callback(card, path)` on
+    the main thread once it exists (path is None if the card has no
+    image). Finding, decoding and writing run on one worker thread; only
+    the upload and the draw into an Fbo happen on the main thread.
+
+    A callback is registered once per card however often it is requested.
+    With an `owner` (a widget), a new request replaces the owner's earlier
+    one, so a recycled row waits only for the card it shows now.
+    """
+    def __init__(self, base_path, height=None, directory=THUMBNAIL_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.base_path = base_path
+        self.height = height or thumbnail_height()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # card -> thumbnail path, main thread only
+        self._ready = {}
+        # card -> {owner or callback: callback} waiting for it, and owner -> card, main thread only
+        self._pending = {}
+        self._owners = {}
+        # Worker state: cached file name -> bytes, oldest first, and the deck's file names
+        self._files = None
+        self._disk_bytes = 0
+        self._sources = None
+        self._queue = Queue()
+        self._thread = None
+        # Decoded images waiting to be scaled, one per frame on the main thread
+        self._to_render = deque()
+        self._render_trigger = Clock.create_trigger(self._render_next)
+
+    def path(self, card_name):
+        return self._ready.get(card_name)
+
+    def request(self, card_name, callback=None, owner=None):
+        if owner is not None:
+            self.cancel(owner)
+        path = self._ready.get(card_name)
+        if path is not None:
+            return path
+        waiting = self._pending.get(card_name)
+        if waiting is None:
+            waiting = self._pending[card_name] = {}
+            self._queue.put((self._find, card_name, None))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ThumbnailCache", daemon=True)
+                self._thread.start()
+        if callback is not None:
+            waiting[callback if owner is None else owner] = callback
+            if owner is not None:
+                self._owners[owner] = card_name
+        return None
+
+    def cancel(self, owner):
+        """Forget the callback `owner` is waiting with; the thumbnail is still made"""
+        card_name = self._owners.pop(owner, None)
+        if card_name is not None:
+            self._pending.get(card_name, {}).pop(owner, None)
+
+    def _run(self):
+        while True:
+            step, card_name, job = self._queue.get()
+            try:
+                step(card_name, job)
+            except Exception as e:
+                Logger.warning(f"ThumbnailCache: Failed to make a thumbnail of {card_name}: {e}")
+                Clock.schedule_once(partial(self._finish, card_name, None))
+
+    def _finish(self, card_name, path, dt):
+        if path is not None:
+            self._ready[card_name] = path
+        waiting = self._pending.pop(card_name, {})
+        for key in waiting:
+            if self._owners.get(key) == card_name:
+                del self._owners[key]
+        for callback in waiting.values():
+            callback(card_name, path)
+
+    def _scan(self):
+        """Index the cache directory and the deck images, once"""
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                os.remove(entry.path)
+            elif entry.is_file():
+                st = entry.stat()
+                files.append((st.st_mtime_ns, entry.name, st.st_size))
+        self._files = OrderedDict((name, size) for _, name, size in sorted(files))
+        self._disk_bytes = sum(self._files.values())
+        try:
+            self._sources = set(os.listdir(self.base_path or '.'))
+        except OSError:
+            self._sources = set()
+
+    def _find(self, card_name, job):
+        """Worker: reuse a cached thumbnail, else decode the deck image for the main thread to scale"""
+        if self._files is None:
+            self._scan()
+        stem = card_name.replace(" ", "_")
+        source_name = next((f"{stem}{ext}" for ext in IMAGE_EXTENSIONS if f"{stem}{ext}" in self._sources), None)
+        if source_name is None:
+            Clock.schedule_once(partial(self._finish, card_name, None))
+            return
+        source = f"{self.base_path}{source_name}"
+        name = thumbnail_name(stem, self.height, os.stat(source))
+        if name in self._files:
+            self._files.move_to_end(name)
+            Clock.schedule_once(partial(self._finish, card_name, os.path.join(self.directory, name)))
+            return
+
+        with tracing.span("thumbnail.decode", "thumbnail", source=source):
+            image = ImageLoader.load(source, nocache=True, mipmap=True)
+        height = min(self.height, image.height)
+        width = max(1, round(image.width * height / image.height))
+        self._to_render.append((card_name, stem, name, image, width, height))
+        self._render_trigger()
+
+    def _render_next(self, dt):
+        """Main thread: scale a decoded image on the GPU and hand the pixels back to the worker"""
+        card_name, stem, name, image, width, height = self._to_render.popleft()
+        if self._to_render:
+            self._render_trigger()
+        try:
+            with tracing.span("thumbnail.render", "thumbnail", card=card_name):
+                pixels = render_thumbnail(image, width, height)
+        except Exception as e:
+            Logger.warning(f"ThumbnailCache: Failed to make a thumbnail of {card_name}: {e}")
+            self._finish(card_name, None, dt)
+            return
+        self._queue.put((self._save, card_name, (stem, name, width, height, pixels)))
+
+    def _save(self, card_name, job):
+        """Worker: write the thumbnail and keep the directory under its cap"""
+        stem, name, width, height, pixels = job
+        target = os.path.join(self.directory, name)
+        with tracing.span("thumbnail.save", "thumbnail", card=card_name):
+            save_png(target, width, height, pixels)
+        # Thumbnails of an older version of the same image at this size
+        prefix = f"{stem}-{self.height}-"
+        for stale in [n for n in self._files if n.startswith(prefix)]:
+            self._remove(stale)
+        self._files[name] = os.path.getsize(target)
+        self._disk_bytes += self._files[name]
+        while self._disk_bytes > self.max_bytes and len(self._files) > 1:
+            self._remove(next(iter(self._files)))
+        Clock.schedule_once(partial(self._finish, card_name, target))
+
+    def _remove(self, name):
+        self._disk_bytes -= self._files.pop(name)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+        Clock.schedule_once(partial(self._forget, os.path.join(self.directory, name)))
+
+    def _forget(self, path, dt):
+        for card_name in [c for c, p in self._ready.items() if p == path]:
+            del self._ready[card_name]
+
+
+class CardThumbnail(Image):
+    """Thumbnail of a card, reversed cards upside down, filled in once it exists"""
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_stretch', True)
+        super().__init__(**kwargs)
+        self.card_name = None
+        self._cache = None
+        with self.canvas.before:
+            PushMatrix()
+            self.rotation = Rotate(angle=0, origin=self.center)
+        with self.canvas.after:
+            PopMatrix()
+        self.bind(pos=self._update_rotation, size=self._update_rotation)
+
+    def show(self, cache, card_name, orientation):
+        self.card_name = card_name
+        self._cache = cache
+        self.rotation.angle = 180 if orientation == "Reversed" else 0
+        path = cache.request(card_name, self._on_ready, owner=self)
+        # Without a texture an Image draws a blank rectangle
+        self.opacity = 1 if path else 0
+        if path:
+            self.source = path
+
+    def clear(self):
+        if self._cache is not None:
+            self._cache.cancel(self)
+        self.card_name = None
+        self.opacity = 0
+
+    def _on_ready(self, card_name, path):
+        # Recycled rows may show another card by now
+        if card_name == self.card_name and path:
+            self.source = path
+            self.opacity = 1
+
+    def _update_rotation(self, *args):
+        self.rotation.origin = self.center
@@ -0,0 +1,97 @@
+"""Pack the tarot deck into Kivy texture atlases.
+
+Every card image (plus the card back) is scaled to each requested card
+height and packed onto fixed-size pages, producing one
+``images/atlas/deck-<height>.atlas`` file per resolution in Kivy's atlas
+format. The app picks these up automatically and loads card faces through
+``atlas://`` URIs; the card back, which stays resident, is still loaded
+from its own file.
+
+Usage:
+    python tools/build_atlas.py --height 448 --height 896 --size 2048
+
+Requires Pillow (build machine only, not the app).
+"""
+import argparse
+import json
+import os
+import sys
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from card_assets import ATLAS_DIR, CARD_BACK, IMAGE_EXTENSIONS, atlas_file_for  # noqa: E402
+
+
+def collect_images(source_dir):
+    """Return {atlas id: path} for every deck image in source_dir"""
+    images = {}
+    for filename in sorted(os.listdir(source_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext.lower() in IMAGE_EXTENSIONS and name not in images:
+            images[name] = os.path.join(source_dir, filename)
+    if CARD_BACK not in images:
+        raise SystemExit(f"No {CARD_BACK} image found in {source_dir}")
+    return images
+
+
+def build_atlas(images, height, page_size, padding, output_dir):
+    """Scale every image to `height` and pack them onto atlas pages"""
+    with Image.open(images[CARD_BACK]) as back:
+        width = max(1, round(back.width * height / back.height))
+
+    cell_w, cell_h = width + padding * 2, height + padding * 2
+    cols, rows = page_size // cell_w, page_size // cell_h
+    if not cols or not rows:
+        raise SystemExit(f"Cards of height {height} do not fit on a {page_size}px page")
+    per_page = cols * rows
+
+    basename = os.path.splitext(os.path.basename(atlas_file_for(height)))[0]
+    ids = list(images)
+    meta = {}
+    for page_index in range(0, len(ids), per_page):
+        page_ids = ids[page_index:page_index + per_page]
+        page = Image.new("RGBA", (page_size, page_size))
+        page_name = f"{basename}-{page_index // per_page}.png"
+        meta[page_name] = {}
+
+        for slot, uid in enumerate(page_ids):
+            x = (slot % cols) * cell_w + padding
+            y = (slot // cols) * cell_h + padding
+            with Image.open(images[uid]) as im:
+                page.paste(im.convert("RGBA").resize((width, height), Image.LANCZOS), (x, y))
+            # Kivy atlas coordinates have their origin at the bottom-left
+            meta[page_name][uid] = [x, page_size - y - height, width, height]
+
+        page.save(os.path.join(output_dir, page_name), optimize=True)
+
+    atlas_path = os.path.join(output_dir, f"{basename}.atlas")
+    with open(atlas_path, 'w') as f:
+        json.dump(meta, f)
+    return atlas_path, len(meta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=os.path.join(ROOT, "images", "rider-waite-tarot"),
+                        help="directory containing the card images")
+    parser.add_argument("--output", default=os.path.join(ROOT, ATLAS_DIR),
+                        help="directory the atlases are written to")
+    parser.add_argument("--height", type=int, action="append",
+                        help="card height in pixels; repeat for several resolutions (default: 448 and 896)")
+    parser.add_argument("--size", type=int, default=2048,
+                        help="atlas page size in pixels (default: 2048, the GLES2 safe maximum)")
+    parser.add_argument("--padding", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    images = collect_images(args.source)
+    os.makedirs(args.output, exist_ok=True)
+    for height in args.height or [448, 896]:
+        atlas_path, pages = build_atlas(images, height, args.size, args.padding, args.output)
+        print(f"{atlas_path}: {len(images)} images on {pages} page(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compile the card meaning sources into the indexed meanings database.
+
+Reads every ``data/meanings/<language>.json`` and writes
+``data/meanings.dat`` (the records) and ``data/meanings.idx`` (their
+offsets). The app rebuilds these itself when the sources change, but the
+APK ships only the compiled files, so they are built here beforehand.
+
+A language that leaves any field to the English fallback would show
+popups in two languages, so the build fails for it unless
+``--allow-partial`` is given.
+
+Usage:
+    python tools/build_meanings.py
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from card_meanings import DATA_FILE, INDEX_FILE, MEANINGS_DIR, build_index, write_index  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=os.path.join(ROOT, MEANINGS_DIR),
+                        help="directory containing the <language>.json sources")
+    parser.add_argument("--data", default=os.path.join(ROOT, DATA_FILE))
+    parser.add_argument("--index", default=os.path.join(ROOT, INDEX_FILE))
+    parser.add_argument("--allow-partial", action="store_true",
+                        help="build even if a language falls back to English for some fields")
+    args = parser.parse_args(argv)
+
+    index, data = build_index(args.source)
+    partial = [language for language, share in index["coverage"].items() if share < 1]
+    for language, records in index["records"].items():
+        print(f"{language} ({index['languages'][language]}): {len(records)} cards, "
+              f"{index['coverage'][language]:.0%} translated")
+    if partial and not args.allow_partial:
+        print(f"FAIL: partial translations: {', '.join(partial)} (use --allow-partial to build anyway)")
+        return 1
+    write_index(index, data, args.data, args.index)
+    print(f"{args.data}: {len(data)} bytes, {args.index}: {os.path.getsize(args.index)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
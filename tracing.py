@@ -0,0 +1,218 @@
+"""Opt-in tracing of hot paths, exported as Chrome trace-event JSON.
+
+Code is instrumented with spans (timed sections), counters and instant
+events:
+
+    with tracing.span("history.save", kind="readings"):
+        ...
+
+    @tracing.traced("card_assets.get_path")
+    def get_path(...):
+
+Tracing is off by default. While it is off `span` returns a shared no-op
+context manager and `traced` functions call straight through, so the
+instrumentation costs one global lookup per call. It is switched on from
+Settings or with the ``TAROT_TRACE`` environment variable (``1`` for the
+default file, or a path). Events are kept in memory, up to MAX_EVENTS,
+and written by `save`/`disable` as a JSON file that chrome://tracing or
+Perfetto (ui.perfetto.dev) opens directly.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+# Kivy's Logger is the stdlib "kivy" logger, so this module stays importable
+# without pulling in Kivy.
+Logger = logging.getLogger("kivy")
+
+TRACE_ENV = "TAROT_TRACE"
+DEFAULT_TRACE_FILE = "tarot_trace.json"
+MAX_EVENTS = 500_000
+
+_tracer = None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.cat, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **args):
+        """Attach arguments known only once the span is running"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Collects trace events in memory until saved"""
+    def __init__(self, path=DEFAULT_TRACE_FILE, max_events=MAX_EVENTS):
+        self.path = path
+        self.max_events = max_events
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events = []
+        self.dropped = 0
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def _emit(self, event):
+        thread_id = threading.get_ident()
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            if thread_id not in self._threads:
+                self._threads[thread_id] = threading.current_thread().name
+            event["pid"] = self.pid
+            event["tid"] = thread_id
+            self.events.append(event)
+
+    def _timestamp(self, ns):
+        # Trace timestamps are microseconds
+        return (ns - self.origin) / 1000.0
+
+    def complete(self, name, cat, start_ns, end_ns, args):
+        event = {"name": name, "cat": cat, "ph": "X", "ts": self._timestamp(start_ns),
+                 "dur": (end_ns - start_ns) / 1000.0}
+        if args:
+            event["args"] = args
+        self._emit(event)
+
+    def counter(self, name, values):
+        self._emit({"name": name, "ph": "C", "ts": self._timestamp(time.perf_counter_ns()), "args": values})
+
+    def instant(self, name, cat, args):
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._timestamp(time.perf_counter_ns())}
+        if args:
+            event["args"] = args
+        self._emit(event)
+
+    def save(self, path=None):
+        """Write every event so far as a trace-event JSON file; returns its path"""
+        path = path or self.path
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+            dropped = self.dropped
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": "Picture Tarot"}}]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                     for tid, name in threads.items()]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": dropped}}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        return path
+
+
+def span(name, cat="app", **args):
+    """Context manager timing a section; a no-op while tracing is off"""
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def traced(name=None, cat="app"):
+    """Decorator wrapping every call of a function in a span"""
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with _Span(tracer, span_name, cat, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def counter(name, **values):
+    """Record the current value of one or more counters"""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.counter(name, values)
+
+
+def instant(name, cat="app", **args):
+    """Record a point-in-time event"""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.instant(name, cat, args)
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def enable(path=None):
+    """Start collecting events, unless already tracing"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path or DEFAULT_TRACE_FILE)
+        Logger.info(f"Tracing: Enabled, writing to {_tracer.path}")
+    return _tracer
+
+
+def enable_from_env(default_path=None):
+    """Enable tracing when TAROT_TRACE is set (to 1 for `default_path`, or to the output path)"""
+    value = os.environ.get(TRACE_ENV, "")
+    if value and value != "0":
+        enable(default_path if value == "1" else value)
+    return is_enabled()
+
+
+def save():
+    """Write the trace collected so far, if tracing"""
+    tracer = _tracer
+    if tracer is None:
+        return None
+    try:
+        return tracer.save()
+    except OSError as e:
+        Logger.error(f"Tracing: Failed to write {tracer.path}: {e}")
+        return None
+
+
+def disable():
+    """Stop tracing and write the trace; returns its path"""
+    global _tracer
+    path = save()
+    _tracer = None
+    if path:
+        Logger.info(f"Tracing: Trace written to {path}")
+    return path